@@ -0,0 +1,436 @@
+"""
+Aggregations behind the Overview, Case Analysis and Trends & Patterns tabs.
+Keeps small pre-aggregated case count marginals per dataset revision so tab charts
+can be answered by summing a few cells under the current filters, and computes
+client-based problem co-occurrence from a sparse client x problem matrix.
+"""
+
+import threading
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+# Tennessee urban counties (same list as the sidebar and the Urban/Rural analysis)
+URBAN_COUNTIES = {
+    'Davidson', 'Shelby', 'Knox', 'Hamilton', 'Rutherford',
+    'Williamson', 'Montgomery', 'Sumner', 'Wilson', 'Madison',
+    'Washington', 'Carter', 'Sullivan', 'Hawkins'
+}
+
+AGE_GROUP_BINS = [0, 25, 35, 50, 65, float('inf')]
+AGE_GROUP_LABELS = ['18-25', '26-35', '36-50', '51-65', '65+']
+
+FOODSTAMPS_CLOSE_REASONS = ['Counsel and Advice', 'X1-Brief Service']
+
+CUBE_DIMENSIONS = [
+    'source', 'month_opened', 'month_closed', 'county_dispute', 'legal_problem_code',
+    'gender', 'race', 'age_group', 'area_type', 'foodstamps'
+]
+
+MONTH_DIMENSIONS = ('month_opened', 'month_closed')
+
+# Dataset columns the cube dimensions are derived from
+CUBE_SOURCE_COLUMNS = [
+    'source', 'date_opened', 'date_closed', 'county_dispute', 'legal_problem_code',
+    'gender', 'race', 'age_intake', 'close_reason'
+]
+
+# Period ordinal pandas uses for a missing month
+_MISSING_MONTH = np.iinfo(np.int64).min
+
+
+def foodstamps_mask(df):
+    """WTLS Food Stamps cases closed as Counsel and Advice/Brief Service (excluded by the tab toggles)."""
+    return (
+        (df['source'] == 'WTLS') &
+        (df['legal_problem_code'].astype(str).str.contains('73 Food Stamps', case=False, na=False)) &
+        (df['close_reason'].isin(FOODSTAMPS_CLOSE_REASONS))
+    ).to_numpy(dtype=bool)
+
+
+def _month_ordinals(values):
+    """Month period ordinals for a date column (missing dates -> _MISSING_MONTH)."""
+    return pd.to_datetime(values, errors='coerce').dt.to_period('M').array.asi8
+
+
+def _month_ordinal(date_value):
+    return pd.Period(date_value, freq='M').ordinal
+
+
+def _area_type(df):
+    county = df['county_dispute']
+    is_urban = county.astype(str).str.strip().isin(URBAN_COUNTIES) & county.notna()
+    return pd.Categorical(np.where(is_urban, 'Urban', 'Rural'), categories=['Rural', 'Urban'])
+
+
+# How each cube dimension is derived from the dataset columns
+_DIMENSION_BUILDERS = {
+    'source': lambda df: df['source'],
+    'month_opened': lambda df: _month_ordinals(df['date_opened']),
+    'month_closed': lambda df: _month_ordinals(df['date_closed']),
+    'county_dispute': lambda df: df['county_dispute'],
+    'legal_problem_code': lambda df: df['legal_problem_code'],
+    'gender': lambda df: df['gender'],
+    'race': lambda df: df['race'],
+    'age_group': lambda df: pd.cut(df['age_intake'], bins=AGE_GROUP_BINS, labels=AGE_GROUP_LABELS,
+                                   include_lowest=True),
+    'area_type': _area_type,
+    'foodstamps': foodstamps_mask
+}
+
+
+def cube_dimensions(df, dimensions=CUBE_DIMENSIONS):
+    """
+    Derive the given cube dimensions for every row of df.
+
+    Returns:
+    --------
+    pd.DataFrame
+        One row per case with the requested CUBE_DIMENSIONS columns
+    """
+    return pd.DataFrame({name: _DIMENSION_BUILDERS[name](df) for name in dimensions}, index=df.index)
+
+
+def _finish_counts(counts):
+    """Turn month ordinals in a count index back into monthly periods."""
+    if not isinstance(counts.index, pd.MultiIndex):
+        if counts.index.name in MONTH_DIMENSIONS:
+            counts.index = pd.PeriodIndex.from_ordinals(counts.index.to_numpy(), freq='M').rename(counts.index.name)
+        return counts
+
+    levels = [
+        pd.PeriodIndex.from_ordinals(level.to_numpy(), freq='M').rename(level.name)
+        if level.name in MONTH_DIMENSIONS else level
+        for level in counts.index.levels
+    ]
+    counts.index = counts.index.set_levels(levels)
+    return counts
+
+
+def count_rows(df, group_by, exclude_foodstamps=False):
+    """
+    Count cases in df by the given dimensions by scanning the rows.
+    Used when the cube can't answer the current date filters exactly.
+
+    Missing values in any group_by dimension are dropped, like value_counts().
+    """
+    group_by = [group_by] if isinstance(group_by, str) else list(group_by)
+    dims = cube_dimensions(df, group_by + (['foodstamps'] if exclude_foodstamps else []))
+    if exclude_foodstamps:
+        dims = dims[~dims['foodstamps']]
+    for month_column in MONTH_DIMENSIONS:
+        if month_column in group_by:
+            dims = dims[dims[month_column] != _MISSING_MONTH]
+
+    return _finish_counts(dims.groupby(group_by, observed=True).size().rename('count'))
+
+
+class CaseCountCube:
+    """
+    Pre-aggregated case counts for one dataset revision.
+
+    Rather than one cube over every dimension (whose key is close to unique per
+    case), counts are kept as small marginals: each is keyed only on a chart's
+    group-by dimensions plus the filter dimensions the sidebar state actually
+    restricts. Source is always a key; opened/closed months, county and the food
+    stamps flag only join it while they filter anything. Marginals are built from
+    the rows on first use and reused for the life of the revision.
+
+    Dates are kept at month resolution, so the cube can answer exactly whenever
+    the sidebar date ranges cover whole months (or reach past the data at either
+    end, as the default full ranges do). can_answer() tells callers when to fall
+    back to scanning the filtered rows instead.
+    """
+
+    def __init__(self, df):
+        self._df = df
+        self.n_rows = len(df)
+        self._marginals = {}
+        self._groupings = {}
+        self._lock = threading.Lock()
+
+        # Data extent per date column, for deciding whether a range is month-aligned
+        self._date_bounds = {}
+        for column in ('date_opened', 'date_closed'):
+            dates = pd.to_datetime(df[column], errors='coerce').dropna()
+            self._date_bounds[column] = (
+                (dates.min().date(), dates.max().date()) if len(dates) else (None, None)
+            )
+
+    def _range_is_aligned(self, column, date_range):
+        if date_range is None or len(date_range) != 2:
+            return True
+        data_min, data_max = self._date_bounds[column]
+        if data_min is None:
+            return True
+
+        start, end = pd.Timestamp(date_range[0]), pd.Timestamp(date_range[1])
+        start_ok = start.day == 1 or start.date() <= data_min
+        end_ok = end.is_month_end or end.date() >= data_max
+        return start_ok and end_ok
+
+    def _range_filters(self, column, date_range):
+        """True if the date range leaves out any known date of the column."""
+        if date_range is None or len(date_range) != 2:
+            return False
+        data_min, data_max = self._date_bounds[column]
+        if data_min is None:
+            return False
+        return pd.Timestamp(date_range[0]).date() > data_min or pd.Timestamp(date_range[1]).date() < data_max
+
+    def can_answer(self, date_range=None, closed_date_range=None):
+        """True if the cube gives exact counts for these date ranges."""
+        return (self._range_is_aligned('date_opened', date_range) and
+                self._range_is_aligned('date_closed', closed_date_range))
+
+    def marginal(self, dimensions):
+        """
+        Case counts over exactly these dimensions (built on first use).
+
+        Returns:
+        --------
+        pd.DataFrame
+            One row per observed combination (missing values included) with a 'count' column
+        """
+        key = tuple(dimensions)
+        with self._lock:
+            cells = self._marginals.get(key)
+        if cells is not None:
+            return cells
+
+        cells = (
+            cube_dimensions(self._df, list(key))
+            .groupby(list(key), observed=True, dropna=False, sort=False)
+            .size()
+            .rename('count')
+            .reset_index()
+        )
+        if 'age_group' in cells:
+            cells['age_group'] = cells['age_group'].cat.as_ordered()
+
+        with self._lock:
+            return self._marginals.setdefault(key, cells)
+
+    def _grouping(self, dimensions, group_by):
+        """Group number of every cell of a marginal under group_by, and the group labels."""
+        key = (tuple(dimensions), tuple(group_by))
+        with self._lock:
+            grouping = self._groupings.get(key)
+        if grouping is not None:
+            return grouping
+
+        grouped = self.marginal(dimensions).groupby(group_by, observed=True)
+        # Cells with a missing group_by value get -1, like groupby drops them
+        grouping = (grouped.ngroup().fillna(-1).to_numpy(dtype=np.int64), grouped.size().index)
+        with self._lock:
+            return self._groupings.setdefault(key, grouping)
+
+    @staticmethod
+    def _month_mask(months, date_range):
+        start, end = _month_ordinal(date_range[0]), _month_ordinal(date_range[1])
+        # Unknown dates are kept, like the sidebar filter does for rows
+        return (months == _MISSING_MONTH) | ((months >= start) & (months <= end))
+
+    def query(self, group_by, selected_sources, date_range=None, closed_date_range=None,
+              selected_counties=None, exclude_foodstamps=False):
+        """
+        Sum marginal cells under the sidebar filters.
+
+        Parameters:
+        -----------
+        group_by : str or list of str
+            Cube dimensions to group the counts by
+        selected_sources, date_range, closed_date_range, selected_counties
+            Same meaning as the sidebar filters
+        exclude_foodstamps : bool
+            Drop WTLS Food Stamps Counsel and Advice/Brief Service cases
+
+        Returns:
+        --------
+        pd.Series
+            Case counts indexed by group_by (months as monthly periods); groups with a
+            missing value in any group_by dimension are dropped, like value_counts()
+        """
+        group_by = [group_by] if isinstance(group_by, str) else list(group_by)
+
+        # Only the filters that restrict something become marginal keys
+        month_filters = [
+            (month_column, selected_range)
+            for month_column, column, selected_range in [('month_opened', 'date_opened', date_range),
+                                                         ('month_closed', 'date_closed', closed_date_range)]
+            if self._range_filters(column, selected_range)
+        ]
+        filter_dims = ['source'] + [month_column for month_column, _ in month_filters]
+        if selected_counties:
+            filter_dims.append('county_dispute')
+        if exclude_foodstamps:
+            filter_dims.append('foodstamps')
+        dimensions = list(dict.fromkeys(filter_dims + group_by))
+        cells = self.marginal(dimensions)
+        group_ids, groups = self._grouping(dimensions, group_by)
+
+        mask = cells['source'].isin(list(selected_sources)).to_numpy(copy=True)
+        if selected_counties:
+            mask &= cells['county_dispute'].isin(list(selected_counties)).to_numpy()
+        for month_column, selected_range in month_filters:
+            mask &= self._month_mask(cells[month_column].to_numpy(), selected_range)
+        if exclude_foodstamps:
+            mask &= ~cells['foodstamps'].to_numpy()
+        for month_column in MONTH_DIMENSIONS:
+            if month_column in group_by:
+                mask &= cells[month_column].to_numpy() != _MISSING_MONTH
+        mask &= group_ids >= 0
+
+        # The marginals are small, so one bincount over the selected cells does the grouping
+        totals = np.bincount(group_ids[mask], weights=cells['count'].to_numpy()[mask], minlength=len(groups))
+        counts = pd.Series(totals.astype(np.int64), index=groups, name='count')
+        counts = counts[counts > 0]
+        return _finish_counts(counts)
+
+
+def cooccurrence_matrix(df):
+    """
+    Client-based co-occurrence of legal problem codes.
+
+    Builds a sparse binary client x problem matrix from factorized codes (each
+    client counted once per problem, however many cases they had) and multiplies
+    it by its transpose, so the dense client crosstab is never materialized.
+
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        Cases with 'client_id' and 'legal_problem_code' columns
+
+    Returns:
+    --------
+    tuple of (pd.DataFrame, pd.Series)
+        Problem x problem matrix of clients having both problems, and the number
+        of unique clients per problem (the matrix diagonal)
+    """
+    problem_values = df['legal_problem_code']
+    valid = (df['client_id'].notna() & problem_values.notna() &
+             (problem_values.astype(str).str.strip() != '')).to_numpy()
+
+    client_codes, clients = pd.factorize(df['client_id'][valid])
+    problem_codes, problems = pd.factorize(problem_values[valid], sort=True)
+    problems = pd.Index(np.asarray(problems), name='legal_problem_code')
+
+    incidence = sparse.csr_matrix(
+        (np.ones(len(client_codes), dtype=np.int64), (client_codes, problem_codes)),
+        shape=(len(clients), len(problems))
+    )
+    # Duplicate client/problem pairs were summed on construction - count them once
+    incidence.data[:] = 1
+
+    cooccurrence = pd.DataFrame((incidence.T @ incidence).toarray(), index=problems, columns=problems)
+    problem_frequencies = pd.Series(np.diag(cooccurrence.to_numpy()).copy(), index=problems)
+    return cooccurrence, problem_frequencies
+
+
+# --- Repeat Clients ---
+
+SERVICE_LEVEL_BRIEF_REASONS = ['Counsel and Advice', 'Brief Service', 'Referred', 'X1-Brief Service']
+SERVICE_LEVEL_LIMITED_REASONS = ['Limited Action', 'Negotiated Settlement', 'Administrative Decision']
+SERVICE_LEVELS = [
+    'Brief Service (<3 hrs)', 'Moderate Service (3-10 hrs)', 'Intensive Service (10+ hrs)',
+    'Brief Service', 'Moderate Service', 'Unknown Service Level'
+]
+
+
+def _close_reason_service_level(close_reason):
+    """Fallback service level for one close reason (case-insensitive substring match)."""
+    close_reason = str(close_reason).lower()
+    if any(reason.lower() in close_reason for reason in SERVICE_LEVEL_BRIEF_REASONS):
+        return 'Brief Service'
+    if any(reason.lower() in close_reason for reason in SERVICE_LEVEL_LIMITED_REASONS):
+        return 'Moderate Service'
+    return 'Unknown Service Level'
+
+
+def service_levels(df):
+    """
+    Service level of every case from case_time, falling back to close_reason.
+
+    Close reasons are matched once per distinct value and broadcast back through
+    the factorized codes, so the substring checks don't run per row.
+
+    Returns:
+    --------
+    pd.Series
+        Categorical service level aligned with df
+    """
+    reason_codes, reasons = pd.factorize(df['close_reason'])
+    # Trailing slot covers missing close reasons (code -1), which str() turns into 'nan'
+    reason_levels = np.array(
+        [_close_reason_service_level(reason) for reason in reasons] + ['Unknown Service Level'],
+        dtype=object
+    )
+
+    case_time = pd.to_numeric(df['case_time'], errors='coerce').to_numpy(dtype=float)
+    has_time = case_time > 0  # NaN compares False
+    levels = np.select(
+        [has_time & (case_time < 3), has_time & (case_time < 10), has_time],
+        ['Brief Service (<3 hrs)', 'Moderate Service (3-10 hrs)', 'Intensive Service (10+ hrs)'],
+        default=reason_levels[reason_codes]
+    )
+    return pd.Series(pd.Categorical(levels, categories=SERVICE_LEVELS), index=df.index, name='service_level')
+
+
+def _joined_counts(df, keys, column, keep_empty=False):
+    """
+    Per group of keys, 'value (count)' strings joined most frequent first, like value_counts().
+    With keep_empty, the unused categories of a categorical column are listed too as
+    'value (0)' and ties keep category order, as Categorical.value_counts() does;
+    otherwise ties keep the order values first appear in, as value_counts() does for strings.
+    """
+    if keep_empty and isinstance(df[column].dtype, pd.CategoricalDtype):
+        counts = df.groupby(keys + [column], observed=True).size().reset_index(name='n')
+        # Every group x every category, in category order, zero where a group has none
+        categories = pd.DataFrame({column: pd.Categorical(df[column].cat.categories,
+                                                          categories=df[column].cat.categories)})
+        full = df[keys].drop_duplicates().merge(categories, how='cross')
+        counts = full.merge(counts, on=keys + [column], how='left')
+        counts['n'] = counts['n'].fillna(0).astype(int)
+        counts = counts.sort_values(keys + ['n'], ascending=[True] * len(keys) + [False], kind='stable')
+    else:
+        positions = df[keys + [column]].assign(_position=np.arange(len(df)))
+        counts = positions.groupby(keys + [column], observed=True)['_position'].agg(['size', 'min'])
+        counts = counts.reset_index().rename(columns={'size': 'n', 'min': 'first'})
+        counts = counts.sort_values(keys + ['n', 'first'], ascending=[True] * len(keys) + [False, True])
+    labels = counts[column].astype(str) + ' (' + counts['n'].astype(str) + ')'
+    return labels.groupby([counts[key] for key in keys]).agg(', '.join)
+
+
+def repeat_client_summary(repeat_df):
+    """
+    Detail table of clients with 2+ cases opened in the same year.
+
+    Parameters:
+    -----------
+    repeat_df : pd.DataFrame
+        Cases with 'client_id', 'year_opened', 'close_reason' and 'service_level'
+
+    Returns:
+    --------
+    pd.DataFrame
+        One row per repeat client and year with the case count and the close
+        reasons / service levels with their counts, newest year and busiest clients first
+    """
+    keys = ['client_id', 'year_opened']
+    case_counts = repeat_df.groupby(keys).size()
+    repeat_keys = case_counts[case_counts >= 2]
+
+    group_sizes = repeat_df.groupby(keys)['client_id'].transform('size')
+    repeat_cases = repeat_df[(group_sizes >= 2).to_numpy()]
+
+    summary = pd.DataFrame({
+        'Total Cases': repeat_keys.astype(int),
+        'Close Reasons': _joined_counts(repeat_cases, keys, 'close_reason', keep_empty=True),
+        'Service Levels': _joined_counts(repeat_cases, keys, 'service_level')
+    }, index=repeat_keys.index).fillna({'Close Reasons': '', 'Service Levels': ''})
+
+    summary = summary.reset_index().rename(columns={'client_id': 'Client ID', 'year_opened': 'Year'})
+    summary['Year'] = summary['Year'].astype(int)
+    summary = summary[['Client ID', 'Year', 'Total Cases', 'Close Reasons', 'Service Levels']]
+    return summary.sort_values(['Year', 'Total Cases'], ascending=[False, False])
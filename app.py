@@ -5,6 +5,7 @@ import plotly.express as px
 import plotly.graph_objects as go
 import io
 from functools import partial
+from concurrent.futures import ThreadPoolExecutor
 from sklearn.linear_model import LinearRegression
 from contextlib import contextmanager
 import pickle
@@ -14,12 +15,33 @@ import re
 import joblib
 import shap
 from streamlit_shap import st_shap
-from preprocessing import preprocess_client_data, interpret_risk_score, predict_case_time_with_model, predict_case_time
-import gspread
-from google.oauth2.service_account import Credentials
+from preprocessing import (
+    preprocess_client_data, interpret_risk_score, predict_case_time_with_model, predict_case_time,
+    predict_dv_risk_batch, predict_case_time_batch, group_legal_code, LEGAL_GROUP_LABELS
+)
+from snapshot_cache import load_snapshot, save_snapshot
+from sheets_io import append_dataframe, rewrite_dataframe
+from dataset_loader import read_dataset
+from filters import FilterIndex, FilterResultCache, FilteredRows, dataset_revision, filter_key
+from analytics import (
+    CUBE_SOURCE_COLUMNS, CaseCountCube, count_rows, cooccurrence_matrix, repeat_client_summary, service_levels
+)
+from prediction_cache import PredictionCache, prediction_key
+from model_cache import fetch_model_file, local_model_path, load_model
+from ingestion import process_single_file, process_files
+from standardization import (
+    standardize_race, standardize_gender, add_demographic_viz_columns, DEMOGRAPHIC_VIZ_COLUMNS
+)
+from google_clients import GoogleClientPool
+from backups import BACKUP_MODE, DEFAULT_BACKUP_HISTORY, create_backup_copy, list_backups, overwrite_backup_sheet
 import json
 import requests
 import hashlib
+import time
+
+# load_data() hands every session the same DataFrame object, so derived frames and
+# column edits must never write through to it - copy-on-write makes shallow copies safe
+pd.set_option('mode.copy_on_write', True)
 
 def hash_password(password):
     """Hash a password for storing."""
@@ -87,770 +109,6 @@ st.session_state.setdefault('processed_data', None)
 st.session_state.setdefault('upload_success', False)
 st.session_state.setdefault('saving_in_progress', False)
 
-# Standardization mappings
-@st.cache_data
-def get_standard_mappings():
-    # Column mapping
-    column_mapping = {
-        'Client ID': 'client_id',
-        'Matter/Case ID': 'case_id',
-        'Case # ID': 'case_id',
-        
-        'Date Opened': 'date_opened',
-        'Opened': 'date_opened',
-        'Date Closed': 'date_closed',
-        'Closed': 'date_closed',
-        'Number of Days Open': 'days_open',
-        '# Days Open': 'days_open',
-        
-        'Percentage of Poverty': 'poverty_pct',
-        'Poverty %': 'poverty_pct',
-        'Adjusted Percentage of Poverty': 'adj_poverty_pct',
-        'Adj. Poverty %': 'adj_poverty_pct',
-        'Income Eligible': 'income_eligible',
-        'Financial Eligibility Override Reason': 'income_override_reason',
-        'Financial Override Reason': 'income_override_reason',
-        'Income Waiver Request Status': 'income_waiver_status',
-        'Asset Eligible': 'asset_eligible',
-        'Asset Override Reason': 'asset_override_reason',
-        'Asset Waiver Request Status': 'asset_waiver_status',
-        
-        'Gender': 'gender',
-        'Race': 'race',
-        'HUD 9902 Ethnicity': 'ethnicity',
-        'Ethnicity': 'ethnicity',
-        'Age at Intake': 'age_intake',
-        'Intake Age': 'age_intake',
-        'Disabled': 'disabled',
-        'Living Arrangement': 'living_arrangement',
-        'Veteran': 'veteran',
-        'Language': 'language',
-        'Identifies as LGBT?': 'lgbt',
-        'LGBTQ': 'lgbt',
-        'Citizenship Status': 'citizenship',
-        'Citizenship': 'citizenship',
-        
-        'Total Household Size': 'household_total',
-        'Total Household': 'household_total',
-        'Number of People 18 and Over': 'household_adults',
-        'People > 18': 'household_adults',
-        'Number of People under 18': 'household_children',
-        'People < 18': 'household_children',
-        
-        'County of Residence': 'county_residence',
-        'Zip Code': 'zip_code',
-        'County of Dispute': 'county_dispute',
-        
-        'Legal Problem Code': 'legal_problem_code',
-        'Close Reason': 'close_reason',
-        'Funding Source': 'funding_source',
-        'PAI Case?': 'pai_case',
-        'PAI Case': 'pai_case',
-        
-        'How did Applicant hear about LAET?': 'referral_source',
-        'How did Applicant hear about LAS?': 'referral_source',
-        'How did Applicant hear about WTLS?': 'referral_source',
-        'Outcome': 'outcome',
-        'Outcome Value Category': 'outcome_category',
-        'Outcome value category': 'outcome_category',
-        'Outcome Amount': 'outcome_amount',
-        'Total Time For Case': 'case_time',
-        'Domestic Violence Present': 'domestic_violence',
-        'Is the caller a victim of domestic violence?': 'domestic_violence'
-    }
-    
-    # Race mapping
-    race_mapping = {
-        # White categories
-        'White': 'White',
-        'White (Not Hispanic)': 'White',
-        'Caucasian/White': 'White',
-        'Caucasian': 'White',
-        'White - Not Hispanic': 'White',
-        'white': 'White',
-        
-        # Black categories
-        'Black': 'Black',
-        'Black (Not Hispanic)': 'Black',
-        'African American/Black': 'Black',
-        'Black or African American': 'Black',
-        'Black - Not Hispanic': 'Black',
-        'African-American': 'Black',
-        'African American': 'Black',
-        'AA': 'Black',
-        'black': 'Black',
-        
-        # Native American categories
-        'Native American': 'Native American',
-        'Native American or Alaska Native': 'Native American',
-        'American Indian or Alaska Native': 'Native American',
-        'American Indian or Alaska Native and White': 'Native American',
-        'American Indian or Alaska Native anc': 'Native American',  # Your truncated version
-        
-        # Asian and Pacific Islander categories
-        'Asian': 'Asian/Pacific Islander',
-        'Asian or Pacific Islander': 'Asian/Pacific Islander',
-        'Asian/Pacific Islander': 'Asian/Pacific Islander',
-        'Native Hawaiian or Other Pacific Islander': 'Asian/Pacific Islander',
-        
-        # Hispanic
-        'Hispanic': 'Hispanic',
-        'hispanic': 'Hispanic',
-        
-        # Multiracial categories
-        'Multiracial': 'Multiracial',
-        'Mulitracial': 'Multiracial',
-        'Multi-Racial': 'Multiracial',
-        'Black or African American and White': 'Multiracial',
-        'Asian and White': 'Multiracial',
-        
-        # Other categories
-        'Other': 'Other/Unknown',
-        'Other/Unknown': 'Other/Unknown',
-        'Other Ethnic Group': 'Other/Unknown',
-        'No Response': 'Other/Unknown',
-        'Organization/Group': 'Other/Unknown',
-        '': 'Other/Unknown',
-        'nan': 'Other/Unknown',
-        None: 'Other/Unknown'
-    }
-    
-    # Gender mapping
-    gender_mapping = {
-        # Female
-        'Female': 'Female',
-        'female': 'Female',
-        'F': 'Female',
-        'Woman': 'Female',
-        
-        # Male
-        'Male': 'Male',
-        'male': 'Male',
-        'M': 'Male',
-        'Man': 'Male',
-        
-        # Transgender
-        'Transgender Female to Male': 'Transgender',
-        'Transgender Male to Female': 'Transgender',
-        'Trans man': 'Transgender',
-        'Trans woman': 'Transgender',
-        'Transgender': 'Transgender',
-        'Trans': 'Transgender',
-        
-        # Non-binary
-        'Non-binary': 'Non-binary',
-        'Non-Binary': 'Non-binary',
-        'Nonbinary': 'Non-binary',
-        'Gender Non-Conforming': 'Non-binary',
-        'Genderqueer': 'Non-binary',
-        
-        # Other/Unknown
-        "Don't Know": 'Other/Unknown',
-        'Other': 'Other/Unknown',
-        'Prefer not to say': 'Other/Unknown',
-        'Decline to state': 'Other/Unknown',
-        'G': 'Other/Unknown',
-        '7': 'Other/Unknown',
-        'nan': 'Other/Unknown',
-        '': 'Other/Unknown',
-        None: 'Other/Unknown'
-    }
-    
-    # legal problem code mapping
-    legal_problem_mapping = {
-    # Consumer/Finance (01-09)
-    r'(?i)^\s*0?1\s*[-: ]?\s*.*?(?:bankrupt|debtor)': '01 Bankruptcy/Debtor Relief',
-    r'(?i)^\s*0?2\s*[-: ]?\s*.*?(?:collect|repo|def|garn)': '02 Collection (including Repo/Def/Garnish)',
-    r'(?i)^\s*0?3\s*[-: ]?\s*.*?(?:contract|warrant)': '03 Contracts/Warranties',
-    r'(?i)^\s*0?4\s*[-: ]?\s*.*?(?:collect.*?practi|creditor|harass)': '04 Collection Practices/Creditor Harassment',
-    r'(?i)^\s*0?5\s*[-: ]?\s*.*?(?:predat.*?lend|lend.*?practice)(?!.*mortgage)': '05 Predatory Lending Practices (not mortgages)',
-    r'(?i)^\s*0?6\s*[-: ]?\s*.*?(?:loan|install.*?purch)': '06 Loans/Installment Purch.',
-    r'(?i)^\s*0?7\s*[-: ]?\s*.*?(?:public.*?util|utilit)': '07 Public Utilities',
-    r'(?i)^\s*0?8\s*[-: ]?\s*.*?(?:unfair|decept).*?(?:sales|practice)(?!.*real.*prop)': '08 Unfair and Deceptive Sales and Practices (not real property)',
-    r'(?i)^\s*0?9\s*[-: ]?\s*.*?(?:consumer|finance)': '09 Other Consumer/Finance',
-
-    # Education (12-19)
-    r'(?i)^\s*1?2\s*[-: ]?\s*.*?(?:discipl|expul|suspen)': '12 Discipline (including expulsion and suspension)',
-    r'(?i)^\s*1?3\s*[-: ]?\s*.*?(?:special.*?ed|learn.*?disab)': '13 Special Education/Learning Disabilities',
-    r'(?i)^\s*1?4\s*[-: ]?\s*.*?(?:access|biling|resid|test)': '14 Access (Including Bilingual, Residency, Testing)',
-    r'(?i)^\s*1?5\s*[-: ]?\s*.*?(?:vocat.*?ed)': '15 Vocational Education',
-    r'(?i)^\s*1?6\s*[-: ]?\s*.*?(?:student|financ.*?aid)': '16 Student Financial Aid',
-    r'(?i)^\s*1?9\s*[-: ]?\s*.*?(?:educ)': '19 Other Education',
-
-    # Employment (21-29)
-    r'(?i)^\s*2?1\s*[-: ]?\s*.*?(?:employ.*?discrim)': '21 Employment Discrimination',
-    r'(?i)^\s*2?2\s*[-: ]?\s*.*?(?:wage|flsa)': '22 Wage Claim and other FLSA Issues',
-    r'(?i)^\s*2?3\s*[-: ]?\s*.*?(?:eitc|earn.*?income.*?tax)': '23 EITC (Earned Income Tax Credit)',
-    r'(?i)^\s*2?4\s*[-: ]?\s*.*?(?:tax)(?!.*eitc)': '24 Taxes (not EITC)',
-    r'(?i)^\s*2?5\s*[-: ]?\s*.*?(?:employ.*?right)': '25 Employee Rights',
-    r'(?i)^\s*2?9\s*[-: ]?\s*.*?(?:employ|ceta)': '29 Other Employment',
-
-    # Family (30-39)
-    r'(?i)^\s*3?0\s*[-: ]?\s*.*?(?:adopt)': '30 Adoption',
-    r'(?i)^\s*3?1\s*[-: ]?\s*.*?(?:custody|visit)': '31 Custody/Visitation',
-    r'(?i)^\s*3?2\s*[-: ]?\s*.*?(?:divorce|sep|annul)': '32 Divorce/Sep./Annul.',
-    r'(?i)^\s*3?3\s*[-: ]?\s*.*?(?:adult.*?guard|conserv)': '33 Adult Guardianship/Conserv.',
-    r'(?i)^\s*3?4\s*[-: ]?\s*.*?(?:name.*?change)': '34 Name Change',
-    r'(?i)^\s*3?5\s*[-: ]?\s*.*?(?:parent.*?right.*?term)': '35 Parental Rights Termin.',
-    r'(?i)^\s*3?6\s*[-: ]?\s*.*?(?:patern)': '36 Paternity',
-    r'(?i)^\s*3?7\s*[-: ]?\s*.*?(?:dom.*?abuse)': '37 Domestic Abuse',
-    r'(?i)^\s*3?8\s*[-: ]?\s*.*?(?:support)': '38 Support',
-    r'(?i)^\s*3?9\s*[-: ]?\s*.*?(?:family)': '39 Other Family',
-
-    # Juvenile (41-49)
-    r'(?i)^\s*4?1\s*[-: ]?\s*.*?(?:delinq)': '41 Delinquent',
-    r'(?i)^\s*4?2\s*[-: ]?\s*.*?(?:neglect|abuse|depend)': '42 Neglected/Abused/Depend.',
-    r'(?i)^\s*4?3\s*[-: ]?\s*.*?(?:emancip)': '43 Emancipation',
-    r'(?i)^\s*4?4\s*[-: ]?\s*.*?(?:minor.*?guard|conserv)': '44 Minor Guardian/Conservatorship',
-    r'(?i)^\s*4?9\s*[-: ]?\s*.*?(?:juvenile)': '49 Other Juvenile',
-
-    # Health (51-59)
-    r'(?i)^\s*5?1\s*[-: ]?\s*.*?(?:medicaid|tenncare)': '51 Medicaid',
-    r'(?i)^\s*5?2\s*[-: ]?\s*.*?(?:medicare)': '52 Medicare',
-    r'(?i)^\s*5?3\s*[-: ]?\s*.*?(?:govern.*?child.*?health|insur.*?program)': "53 Government Children's Health Insurance Programs",
-    r'(?i)^\s*5?4\s*[-: ]?\s*.*?(?:home.*?comm.*?base|care)': '54 Home and Community Based Care',
-    r'(?i)^\s*5?5\s*[-: ]?\s*.*?(?:private.*?health.*?insur)': '55 Private Health Insurance',
-    r'(?i)^\s*5?6\s*[-: ]?\s*.*?(?:long.*?term.*?health|care.*?facil)': '56 Long Term Health Care Facilities',
-    r'(?i)^\s*5?7\s*[-: ]?\s*.*?(?:state.*?local.*?health)': '57 State and Local Health',
-    r'(?i)^\s*5?9\s*[-: ]?\s*.*?(?:health)': '59 Other Health',
-
-    # Housing (61-69)
-    r'(?i)^\s*6?1\s*[-: ]?\s*.*?(?:fed.*?subsid.*?hous|subsid.*?hous)': '61 Fed. Subsidized Housing',
-    r'(?i)^\s*6?2\s*[-: ]?\s*.*?(?:homeown|real.*?prop)(?!.*foreclos)': '62 Homeownership/Real Prop. (not foreclosure)',
-    r'(?i)^\s*6?3\s*[-: ]?\s*.*?(?:private.*?land|tenant)': '63 Private Landlord/Tenant',
-    r'(?i)^\s*6?4\s*[-: ]?\s*.*?(?:public.*?hous)': '64 Public Housing',
-    r'(?i)^\s*6?5\s*[-: ]?\s*.*?(?:mobile.*?home)': '65 Mobile Homes',
-    r'(?i)^\s*6?6\s*[-: ]?\s*.*?(?:hous.*?discrim)': '66 Housing Discrimination',
-    r'(?i)^\s*6?7\s*[-: ]?\s*.*?(?:mortgage.*?forecl)(?!.*predat)': '67 Mortgage Foreclosures (not predatory Lending/practices)',
-    r'(?i)^\s*6?8\s*[-: ]?\s*.*?(?:mortgage.*?predat|predat.*?lend)': '68 Mortgage Predatory Lending/Practices',
-    r'(?i)^\s*6?9\s*[-: ]?\s*.*?(?:hous)': '69 Other Housing',
-
-    # Income Maintenance (71-79)
-    r'(?i)^\s*7?1\s*[-: ]?\s*.*?(?:tanf|famil.*?first)': '71 TANF',
-    r'(?i)^\s*7?2\s*[-: ]?\s*.*?(?:social.*?secur)(?!.*ssdi)': '72 Social Security (not SSDI)',
-    r'(?i)^\s*7?3\s*[-: ]?\s*.*?(?:food.*?stamp)': '73 Food Stamps',
-    r'(?i)^\s*7?4\s*[-: ]?\s*.*?(?:ssdi)': '74 SSDI',
-    r'(?i)^\s*7?5\s*[-: ]?\s*.*?(?:ssi)': '75 SSI',
-    r'(?i)^\s*7?6\s*[-: ]?\s*.*?(?:unemploy.*?comp)': '76 Unemployment Compensation',
-    r'(?i)^\s*7?7\s*[-: ]?\s*.*?(?:veteran.*?bene)': '77 Veterans Benefits',
-    r'(?i)^\s*7?8\s*[-: ]?\s*.*?(?:state.*?local.*?income)': '78 State and Local Income Maintenance',
-    r'(?i)^\s*7?9\s*[-: ]?\s*.*?(?:income|mainten)': '79 Other Income Maintenance',
-
-    # Rights and Other (81-89)
-    r'(?i)^\s*8?1\s*[-: ]?\s*.*?(?:immigr|natural)': '81 Immigration/Naturalization',
-    r'(?i)^\s*8?2\s*[-: ]?\s*.*?(?:mental.*?health)': '82 Mental Health',
-    r'(?i)^\s*8?4\s*[-: ]?\s*.*?(?:disab.*?right)': '84 Disability Rights',
-    r'(?i)^\s*8?5\s*[-: ]?\s*.*?(?:civil.*?right)': '85 Civil Rights',
-    r'(?i)^\s*8?6\s*[-: ]?\s*.*?(?:human.*?traffic)': '86 Human Trafficking',
-    r'(?i)^\s*8?7\s*[-: ]?\s*.*?(?:expung)': '87 Expungement',
-    r'(?i)^\s*8?9\s*[-: ]?\s*.*?(?:other.*?individ.*?right|individual.*?right)': '89 Other Individual Rights',
-
-    # Miscellaneous (93-99)
-    r'(?i)^\s*9?3\s*[-: ]?\s*.*?(?:licens)': '93 Licenses (Auto and Other)',
-    r'(?i)^\s*9?4\s*[-: ]?\s*.*?(?:tort)': '94 Torts',
-    r'(?i)^\s*9?5\s*[-: ]?\s*.*?(?:will|estat)': '95 Wills/Estates',
-    r'(?i)^\s*9?6\s*[-: ]?\s*.*?(?:advan.*?direct|power.*?attorney)': '96 Advance Directives/Powers of Attorney',
-    r'(?i)^\s*9?7\s*[-: ]?\s*.*?(?:munic.*?legal)': '97 Municipal Legal Needs',
-    r'(?i)^\s*9?9\s*[-: ]?\s*.*?(?:misc|other)': '99 Other Miscellaneous'
-}
-    return column_mapping, race_mapping, gender_mapping, legal_problem_mapping
-
-# Function to apply regex-based legal problem mapping
-def map_legal_problem_with_regex(problem_code, legal_problem_patterns):
-    """
-    Map legal problem codes to standardized format using multi-tiered approach:
-    1. Direct mapping (fastest)
-    2. Regex patterns (flexible)
-    3. Numeric code fallback (catches unknown variations)
-    """
-    if pd.isna(problem_code):
-        return None
-    
-    # Convert to string and strip whitespace
-    problem_str = str(problem_code).strip()
-    
-    # Extract numeric code at start (e.g., "05", "62") for fallback matching
-    code_match = re.match(r'^\s*0*(\d+)', problem_str)
-    numeric_code = code_match.group(1).zfill(2) if code_match else None
-    
-    # Normalize for case-insensitive matching
-    normalized = problem_str.lower()
-    
-    # Direct standardization mapping - MOST EFFICIENT, TRIES FIRST
-    standardization_map = {
-        # Consumer/Finance (01-09)
-        '01 bankruptcy/debtor relief': '01 Bankruptcy/Debtor Relief',
-        '02 collection (including repo/def/garnish)': '02 Collection (including Repo/Def/Garnish)',
-        '02 collect/repo/def/garnsh': '02 Collection (including Repo/Def/Garnish)',
-        '02 - collections (repo, def., garn)': '02 Collection (including Repo/Def/Garnish)',
-        '03 contracts / warranties': '03 Contracts/Warranties',
-        '03 contracts/warranties': '03 Contracts/Warranties',
-        '03 contract/warranties': '03 Contracts/Warranties',
-        '04 collection practices/creditor harassment': '04 Collection Practices/Creditor Harassment',
-        '04 collection practices / creditor harassment': '04 Collection Practices/Creditor Harassment',
-        '05 predatory lending practices (not mortgages)': '05 Predatory Lending Practices (not mortgages)',
-        '06 loans/installment purch.': '06 Loans/Installment Purch.',
-        '06 loans/installment purchases (not collections)': '06 Loans/Installment Purch.',
-        '07 public utilities': '07 Public Utilities',
-        '08 unfair and deceptive sales and practices (not real property)': '08 Unfair and Deceptive Sales and Practices (not real property)',
-        '08 unfair and deceptive sales practices (not real property)': '08 Unfair and Deceptive Sales and Practices (not real property)',
-        '09 other consumer/finance': '09 Other Consumer/Finance',
-        '09 other consumer / finance.': '09 Other Consumer/Finance',
-
-        # Education (12-19)
-        '12 discipline (including expulsion and suspension)': '12 Discipline (including expulsion and suspension)',
-        '13 special education/learning disabilities': '13 Special Education/Learning Disabilities',
-        '14 access (including bilingual, residency, testing)': '14 Access (Including Bilingual, Residency, Testing)',
-        '15 vocational education': '15 Vocational Education',
-        '16 student financial aid': '16 Student Financial Aid',
-        '19 other education': '19 Other Education',
-
-        # Employment (21-29)
-        '21 employment discrimination': '21 Employment Discrimination',
-        '22 wage claim and other flsa issues': '22 Wage Claim and other FLSA Issues',
-        '22 wage claims and other flsa issues': '22 Wage Claim and other FLSA Issues',
-        '23 eitc (earned income tax credit)': '23 EITC (Earned Income Tax Credit)',
-        '24 taxes (not eitc)': '24 Taxes (not EITC)',
-        '25 employee rights': '25 Employee Rights',
-        '29 other employment & ceta': '29 Other Employment',
-        '29 other employment': '29 Other Employment',
-
-        # Family (30-39)
-        '30 adoption': '30 Adoption',
-        '31 custody/visitation': '31 Custody/Visitation',
-        '31 custody / visitation': '31 Custody/Visitation',
-        '32 divorce/sep./annul.': '32 Divorce/Sep./Annul.',
-        '32 divorce / sep. / annul.': '32 Divorce/Sep./Annul.',
-        '33 adult guardianship / conserv.': '33 Adult Guardianship/Conserv.',
-        '33 adult guardianship/conserv.': '33 Adult Guardianship/Conserv.',
-        '33 adult guardianship / conservatorship': '33 Adult Guardianship/Conserv.',
-        '34 name change': '34 Name Change',
-        '35 parental rights termin.': '35 Parental Rights Termin.',
-        '35 parental rights termination': '35 Parental Rights Termin.',
-        '36 paternity': '36 Paternity',
-        '37 domestic abuse': '37 Domestic Abuse',
-        '37 - domestic abuse': '37 Domestic Abuse',
-        '38 support': '38 Support',
-        '39 other family': '39 Other Family',
-
-        # Juvenile (41-49)
-        '41 delinquent': '41 Delinquent',
-        '42 neglected/abused/depend.': '42 Neglected/Abused/Depend.',
-        '42 neglected/abused/dependent': '42 Neglected/Abused/Depend.',
-        '43 emancipation': '43 Emancipation',
-        '44 minor guardian/conservatorship': '44 Minor Guardian/Conservatorship',
-        '44 minor guardianship / conservatorship': '44 Minor Guardian/Conservatorship',
-        '49 other juvenile': '49 Other Juvenile',
-
-        # Health (51-59)
-        '51 medicaid': '51 Medicaid',
-        '51 - medicaid (tenncare)': '51 Medicaid',
-        '52 medicare': '52 Medicare',
-        "53 government children's health insurance programs": "53 Government Children's Health Insurance Programs",
-        "53 goverment children's health insurance programs": "53 Government Children's Health Insurance Programs",
-        '54 home and community based care': '54 Home and Community Based Care',
-        '55 private health insurance': '55 Private Health Insurance',
-        '56 long term health care facilities': '56 Long Term Health Care Facilities',
-        '57 state and local health': '57 State and Local Health',
-        '59 other health': '59 Other Health',
-
-        # Housing (61-69)
-        '61 fed. subsidized housing': '61 Fed. Subsidized Housing',
-        '61 federally subsidized housing': '61 Fed. Subsidized Housing',
-        '61 - federally subsidized housing': '61 Fed. Subsidized Housing',
-        '62 homeownership/real prop. (not foreclosure)': '62 Homeownership/Real Prop. (not foreclosure)',
-        '62 homeownership/real property (not foreclosure)': '62 Homeownership/Real Prop. (not foreclosure)',
-        '63 private landlord / tenant': '63 Private Landlord/Tenant',
-        '63 private landlord/tenant': '63 Private Landlord/Tenant',
-        '63 - private landlord/tenant': '63 Private Landlord/Tenant',
-        '64 public housing': '64 Public Housing',
-        '65 mobile homes': '65 Mobile Homes',
-        '66 housing discrimination': '66 Housing Discrimination',
-        '67 mortgage foreclosures (not predatory lending/practices)': '67 Mortgage Foreclosures (not predatory Lending/practices)',
-        '68 mortgage predatory lending/practices': '68 Mortgage Predatory Lending/Practices',
-        '69 other housing': '69 Other Housing',
-
-        # Income Maintenance (71-79)
-        '71 tanf': '71 TANF',
-        '71 - tanf (families first)': '71 TANF',
-        '72 social security (not ssdi)': '72 Social Security (not SSDI)',
-        '73 food stamps': '73 Food Stamps',
-        '73 food stamps / commodities': '73 Food Stamps',
-        '74 ssdi': '74 SSDI',
-        '75 ssi': '75 SSI',
-        '76 unemployment compensation': '76 Unemployment Compensation',
-        '77 veterans benefits': '77 Veterans Benefits',
-        '78 state and local income maintenance': '78 State and Local Income Maintenance',
-        '79 other income maintenance': '79 Other Income Maintenance',
-        '79 other income maintenence': '79 Other Income Maintenance',
-
-        # Rights and Other (81-89)
-        '81 immigration/naturalization': '81 Immigration/Naturalization',
-        '81 immigration / naturalization': '81 Immigration/Naturalization',
-        '82 mental health': '82 Mental Health',
-        '84 disability rights': '84 Disability Rights',
-        '85 civil rights': '85 Civil Rights',
-        '86 human trafficking': '86 Human Trafficking',
-        '87 expungement': '87 Expungement',
-        '87 - expungement': '87 Expungement',
-        '87 criminal record expungement': '87 Expungement',
-        '89 other individual rights': '89 Other Individual Rights',
-
-        # Miscellaneous (93-99)
-        '93 licenses (auto and other)': '93 Licenses (Auto and Other)',
-        '93 licenses (drivers, occupational, and others)': '93 Licenses (Auto and Other)',
-        '94 torts': '94 Torts',
-        '95 wills / estates': '95 Wills/Estates',
-        '95 wills/estates': '95 Wills/Estates',
-        '95 wills and estates': '95 Wills/Estates',
-        '96 advance directives/powers of attorney': '96 Advance Directives/Powers of Attorney',
-        '96 advanced directives/powers of attorney': '96 Advance Directives/Powers of Attorney',
-        '97 municipal legal needs': '97 Municipal Legal Needs',
-        '99 other miscellaneous': '99 Other Miscellaneous'
-    }
-    
-    # Try direct mapping first (most efficient)
-    if normalized in standardization_map:
-        return standardization_map[normalized]
-    
-    # Try regex patterns as fallback for unknown variations
-    for pattern, standardized_code in legal_problem_patterns.items():
-        if re.search(pattern, problem_str, re.IGNORECASE):
-            return standardized_code
-    
-    # Final fallback: match by numeric code alone (catches completely unknown variations)
-    if numeric_code:
-        code_lookup = {
-            '01': '01 Bankruptcy/Debtor Relief',
-            '02': '02 Collection (including Repo/Def/Garnish)',
-            '03': '03 Contracts/Warranties',
-            '04': '04 Collection Practices/Creditor Harassment',
-            '05': '05 Predatory Lending Practices (not mortgages)',
-            '06': '06 Loans/Installment Purch.',
-            '07': '07 Public Utilities',
-            '08': '08 Unfair and Deceptive Sales and Practices (not real property)',
-            '09': '09 Other Consumer/Finance',
-            '12': '12 Discipline (including expulsion and suspension)',
-            '13': '13 Special Education/Learning Disabilities',
-            '14': '14 Access (Including Bilingual, Residency, Testing)',
-            '15': '15 Vocational Education',
-            '16': '16 Student Financial Aid',
-            '19': '19 Other Education',
-            '21': '21 Employment Discrimination',
-            '22': '22 Wage Claim and other FLSA Issues',
-            '23': '23 EITC (Earned Income Tax Credit)',
-            '24': '24 Taxes (not EITC)',
-            '25': '25 Employee Rights',
-            '29': '29 Other Employment',
-            '30': '30 Adoption',
-            '31': '31 Custody/Visitation',
-            '32': '32 Divorce/Sep./Annul.',
-            '33': '33 Adult Guardianship/Conserv.',
-            '34': '34 Name Change',
-            '35': '35 Parental Rights Termin.',
-            '36': '36 Paternity',
-            '37': '37 Domestic Abuse',
-            '38': '38 Support',
-            '39': '39 Other Family',
-            '41': '41 Delinquent',
-            '42': '42 Neglected/Abused/Depend.',
-            '43': '43 Emancipation',
-            '44': '44 Minor Guardian/Conservatorship',
-            '49': '49 Other Juvenile',
-            '51': '51 Medicaid',
-            '52': '52 Medicare',
-            '53': "53 Government Children's Health Insurance Programs",
-            '54': '54 Home and Community Based Care',
-            '55': '55 Private Health Insurance',
-            '56': '56 Long Term Health Care Facilities',
-            '57': '57 State and Local Health',
-            '59': '59 Other Health',
-            '61': '61 Fed. Subsidized Housing',
-            '62': '62 Homeownership/Real Prop. (not foreclosure)',
-            '63': '63 Private Landlord/Tenant',
-            '64': '64 Public Housing',
-            '65': '65 Mobile Homes',
-            '66': '66 Housing Discrimination',
-            '67': '67 Mortgage Foreclosures (not predatory Lending/practices)',
-            '68': '68 Mortgage Predatory Lending/Practices',
-            '69': '69 Other Housing',
-            '71': '71 TANF',
-            '72': '72 Social Security (not SSDI)',
-            '73': '73 Food Stamps',
-            '74': '74 SSDI',
-            '75': '75 SSI',
-            '76': '76 Unemployment Compensation',
-            '77': '77 Veterans Benefits',
-            '78': '78 State and Local Income Maintenance',
-            '79': '79 Other Income Maintenance',
-            '81': '81 Immigration/Naturalization',
-            '82': '82 Mental Health',
-            '84': '84 Disability Rights',
-            '85': '85 Civil Rights',
-            '86': '86 Human Trafficking',
-            '87': '87 Expungement',
-            '89': '89 Other Individual Rights',
-            '93': '93 Licenses (Auto and Other)',
-            '94': '94 Torts',
-            '95': '95 Wills/Estates',
-            '96': '96 Advance Directives/Powers of Attorney',
-            '97': '97 Municipal Legal Needs',
-            '99': '99 Other Miscellaneous'
-        }
-        
-        if numeric_code in code_lookup:
-            return code_lookup[numeric_code]
-    
-    # If no match found, return original
-    return problem_code
-
-def clean_race_with_regex(race_value):
-    """
-    Clean race values using regex for flexible matching
-    """
-    if pd.isna(race_value) or str(race_value).strip() == '':
-        return 'Other/Unknown'
-    
-    race_str = str(race_value).strip().lower()
-    
-    # White patterns
-    if re.search(r'\b(white|caucasian)\b', race_str):
-        return 'White'
-    
-    # Black patterns
-    if re.search(r'\b(black|african.?american|aa)\b', race_str):
-        return 'Black'
-    
-    # Native American patterns
-    if re.search(r'\b(native|american.?indian|alaska.?native)\b', race_str):
-        return 'Native American'
-    
-    # Asian/Pacific Islander patterns
-    if re.search(r'\b(asian|pacific.?islander|hawaiian)\b', race_str):
-        return 'Asian/Pacific Islander'
-    
-    # Hispanic patterns
-    if re.search(r'\b(hispanic|latino|latina|latinx)\b', race_str):
-        return 'Hispanic'
-    
-    # Multiracial patterns
-    if re.search(r'\b(multi.?racial|multiracial|two.?or.?more)\b', race_str):
-        return 'Multiracial'
-    
-    # Check for "and" which often indicates multiracial
-    if ' and ' in race_str:
-        return 'Multiracial'
-    
-    # Organization/Group
-    if re.search(r'\b(organization|group)\b', race_str):
-        return 'Other/Unknown'
-    
-    return 'Other/Unknown'
-
-def clean_gender_with_regex(gender_value):
-    """
-    Clean gender values using regex for flexible matching
-    """
-    if pd.isna(gender_value) or str(gender_value).strip() == '':
-        return 'Other/Unknown'
-    
-    gender_str = str(gender_value).strip().lower()
-    
-    # Female patterns
-    if re.search(r'^(f|female|woman)$', gender_str):
-        return 'Female'
-    
-    # Male patterns
-    if re.search(r'^(m|male|man)$', gender_str):
-        return 'Male'
-    
-    # Transgender patterns
-    if re.search(r'\b(trans|transgender)\b', gender_str):
-        return 'Transgender'
-    
-    # Non-binary patterns
-    if re.search(r'\b(non.?binary|nonbinary|genderqueer|gender.?non.?conforming)\b', gender_str):
-        return 'Non-binary'
-    
-    # Unknown/Other patterns
-    if re.search(r'\b(don.?t.?know|unknown|prefer.?not|decline|other)\b', gender_str):
-        return 'Other/Unknown'
-    
-    # Single letters or numbers that aren't F or M
-    if re.match(r'^[a-eg-z0-9]$', gender_str):
-        return 'Other/Unknown'
-    
-    return 'Other/Unknown'
-
-# Standardization function
-def standardize_new_data(df, upload_source):  
-    column_mapping, race_mapping, gender_mapping, legal_problem_mapping = get_standard_mappings()
-    
-    # First standardize the column names
-    df = df.rename(columns=column_mapping)
-    
-    # Define the expected column order 
-    column_order = [
-        # Identifying Information
-        'client_id',
-        'case_id',
-        'source',  
-        
-        # Dates and Duration
-        'date_opened',
-        'date_closed',
-        'days_open',
-        'case_time',
-        
-        # Financial Eligibility
-        'poverty_pct',
-        'adj_poverty_pct',
-        'income_eligible',
-        'income_override_reason',
-        'income_waiver_status',
-        'asset_eligible',
-        'asset_override_reason',
-        'asset_waiver_status',
-        
-        # Demographics
-        'age_intake',
-        'gender',
-        'race',
-        'ethnicity',
-        'disabled',
-        'veteran',
-        'language',
-        'lgbt',
-        'citizenship',
-        
-        # Household Information
-        'household_total',
-        'household_adults',
-        'household_children',
-        'living_arrangement',
-        
-        # Location
-        'county_residence',
-        'zip_code',
-        'county_dispute',
-        
-        # Case Details
-        'legal_problem_code',
-        'funding_source',
-        'pai_case',
-        'referral_source',
-        'domestic_violence',
-        
-        # Outcome Information
-        'close_reason',
-        'outcome_category',
-        'outcome_amount',
-        'outcome'
-    ]
-
-    # Standardize race categories if present
-    if 'race' in df.columns:
-        # Step 1: Direct mapping
-        df['race'] = df['race'].replace(race_mapping)
-        # Step 2: Regex-based cleaning for anything not mapped
-        df['race'] = df['race'].apply(
-            lambda x: clean_race_with_regex(x) if x not in race_mapping.values() else x
-        )
-
-    # Standardize gender categories 
-    if 'gender' in df.columns:
-        # Step 1: Direct mapping
-        df['gender'] = df['gender'].replace(gender_mapping)
-        # Step 2: Regex-based cleaning for anything not mapped
-        df['gender'] = df['gender'].apply(
-            lambda x: clean_gender_with_regex(x) if x not in gender_mapping.values() else x
-        )
-        
-    # Standardize legal problem codes
-    if 'legal_problem_code' in df.columns:
-        # Step 1: Clean whitespace
-        df['legal_problem_code'] = df['legal_problem_code'].astype(str).str.strip()
-        
-        # Step 2: Apply mapping function
-        df['legal_problem_code'] = df['legal_problem_code'].apply(
-            lambda x: map_legal_problem_with_regex(x, legal_problem_mapping)
-        )
-        
-        # Step 3: Final cleanup for any edge cases that slipped through
-        final_cleanup = {
-            '62 Homeownership/Real Property (not Foreclosure)': '62 Homeownership/Real Prop. (not foreclosure)',
-            '62 Homeownership/Real Property (Not Foreclosure)': '62 Homeownership/Real Prop. (not foreclosure)',
-            '08 Unfair and Deceptive Sales Practices (Not Real Property)': '08 Unfair and Deceptive Sales and Practices (not real property)',
-            '67 Mortgage Foreclosures (Not Predatory Lending/Practices)': '67 Mortgage Foreclosures (not predatory Lending/practices)',
-            '67 Mortgage Foreclosures (not Predatory Lending/Practices)': '67 Mortgage Foreclosures (not predatory Lending/practices)',
-            '05 Predatory Lending Practices (Not Mortgages)': '05 Predatory Lending Practices (not mortgages)',
-            '05 Predatory Lending Practices (not Mortgages)': '05 Predatory Lending Practices (not mortgages)',
-        }
-        df['legal_problem_code'] = df['legal_problem_code'].replace(final_cleanup)
-
-    # Clean and normalize 'domestic_violence'
-    if 'domestic_violence' in df.columns:
-        # Strip leading/trailing whitespace and ensure string type
-        df['domestic_violence'] = df['domestic_violence'].astype(str).str.strip()
-
-        # Replace known valid entries; everything else becomes NaN
-        df['domestic_violence'] = df['domestic_violence'].apply(
-            lambda x: x if x in ['Yes', 'No'] else np.nan
-        )
-
-    # Normalize income_eligible 
-    if 'income_eligible' in df.columns:
-        df['income_eligible'] = df['income_eligible'].astype(str).str.strip().str.capitalize()
-        # Only convert Yes/No, leave everything else as-is (blanks will stay as empty strings)
-        df['income_eligible'] = df['income_eligible'].apply(
-            lambda x: x if x in ['Yes', 'No'] else ''
-        )
-    
-    # Normalize asset_eligible 
-    if 'asset_eligible' in df.columns:
-        df['asset_eligible'] = df['asset_eligible'].astype(str).str.strip().str.capitalize()
-        df['asset_eligible'] = df['asset_eligible'].apply(
-            lambda x: x if x in ['Yes', 'No'] else ''
-        )
-
-    # Add missing columns with nan
-    for col in column_order:
-        if col not in df.columns:
-            if col == 'source':
-                df[col] = upload_source  # Use the provided organization source
-            else:
-                df[col] = np.nan
-    
-    # Convert household columns to numeric
-    household_cols = ['household_total', 'household_adults', 'household_children']
-    for col in household_cols:
-        if col in df.columns:
-            df[col] = pd.to_numeric(df[col], errors='coerce')
-    
-    # Convert numeric columns with special handling for outcome_amount
-    numeric_cols = ['poverty_pct', 'adj_poverty_pct', 'age_intake', 'outcome_amount', 'case_time']
-    for col in numeric_cols:
-        if col in df.columns:
-            if col == 'outcome_amount':
-                # Special handling for currency format - remove $ and commas
-                df[col] = df[col].astype(str).str.replace('$', '', regex=False).str.replace(',', '', regex=False)
-                df[col] = pd.to_numeric(df[col], errors='coerce')
-            else:
-                df[col] = pd.to_numeric(df[col], errors='coerce')
-    
-    # Handle date columns
-    date_cols = ['date_opened', 'date_closed']
-    for col in date_cols:
-        if col in df.columns:
-            # Convert to datetime and normalize to remove time component
-            df[col] = pd.to_datetime(df[col], errors='coerce').dt.normalize()
-        
-    # Ensure all columns are in the same order
-    df = df[column_order]
-    
-    return df
-
-
 def get_google_credentials():
     """
     Get Google credentials from Streamlit secrets
@@ -865,89 +123,75 @@ def get_google_credentials():
         st.error(f"Error loading credentials: {str(e)}")
         return None
 
-@st.cache_data(ttl=3600)
+@st.cache_resource
+def create_google_clients(creds_dict):
+    """Build the authorized Sheets/Drive client pool once per process (per set of credentials)"""
+    return GoogleClientPool(creds_dict)
+
+def get_google_clients():
+    """
+    Return the shared pool of authorized Google clients, or None if credentials are missing
+
+    Reuses the same token, gspread client and keep-alive connections across calls and sessions.
+    """
+    creds_dict = get_google_credentials()
+    if creds_dict is None:
+        return None
+    return create_google_clients(creds_dict)
+
+@st.cache_resource(ttl=3600)
 def load_data():
     """
     Load data from Google Drive using service account credentials
+
+    Cached as a shared resource: every session reads the same read-only DataFrame
+    instead of unpickling its own copy. Use load_data.clear() to force a reload.
     """
     try:
-        # Get credentials from Streamlit secrets
-        creds_dict = get_google_credentials()
-        if creds_dict is None:
+        # Shared authorized client (credentials from Streamlit secrets)
+        clients = get_google_clients()
+        if clients is None:
             st.error("Cannot load data: Missing credentials")
             st.stop()
-        
-        # Set up credentials and authorize
-        scopes = ['https://www.googleapis.com/auth/drive']
-        credentials = Credentials.from_service_account_info(creds_dict, scopes=scopes)
-        gc = gspread.authorize(credentials)
+        gc = clients.sheets()
         
         # Your Google Drive file ID
         FILE_ID = "1Rj3Cwwc54vmqWk-TC4yie9i9fY6Vdphtphk11P5jj9o"
         
-        # Open the file and get the first worksheet
+        # Open the file and check its revision before pulling every cell
         file = gc.open_by_key(FILE_ID)
-        worksheet = file.get_worksheet(0)
+        try:
+            revision = file.get_lastUpdateTime()
+        except Exception:
+            revision = None
         
-        # Get all values and convert to DataFrame
-        data = worksheet.get_all_values()
-        headers = data[0]
-        rows = data[1:]
+        # Reuse the local snapshot when the sheet hasn't changed since it was taken
+        cached_df = load_snapshot(FILE_ID, revision)
+        if cached_df is not None:
+            cached_df.attrs['revision'] = revision
+            return cached_df
         
-        df = pd.DataFrame(rows, columns=headers)
+        worksheet = file.get_worksheet(0)
         
-        # Convert date columns 
-        date_columns = ['date_opened', 'date_closed']
-        for col in date_columns:
-            if col in df.columns:
-                df[col] = pd.to_datetime(df[col], errors='coerce', cache=False).dt.normalize()
+        # Fetch the sheet in row-range blocks on a thread pool; numeric columns are parsed
+        # per block as it arrives, then dates and categoricals once on the combined data
+        df = read_dataset(worksheet)
         
-        # Convert numeric columns 
-        numeric_columns = [
-            'poverty_pct', 'adj_poverty_pct', 'age_intake', 'outcome_amount', 'case_time',
-            'household_total', 'household_adults', 'household_children', 'days_open'
-        ]
+        # Apply standardization to loaded data (results stay categorical)
+        if 'race' in df.columns:
+            df['race'] = standardize_race(df['race'])
         
-        for col in numeric_columns:
-            if col in df.columns:
-                if col == 'outcome_amount':
-                    # Special handling for currency format
-                    df[col] = df[col].astype(str).str.replace('$', '').str.replace(',', '')
-                    df[col] = pd.to_numeric(df[col], errors='coerce')
-                else:
-                    df[col] = pd.to_numeric(df[col], errors='coerce')
+        if 'gender' in df.columns:
+            df['gender'] = standardize_gender(df['gender'])
         
-        # Optimize categorical columns
-        categorical_columns = [
-            'source', 'gender', 'race', 'ethnicity', 'county_residence',
-            'county_dispute', 'legal_problem_code', 'close_reason',
-            'funding_source', 'outcome_category'
-        ]
+        # Precompute the cleaned demographic columns once per load, not per rerun
+        add_demographic_viz_columns(df)
         
-        for col in categorical_columns:
-            if col in df.columns:
-                df[col] = pd.Categorical(df[col])
-                
-        # Apply standardization to loaded data
-        _, race_mapping, gender_mapping, _ = get_standard_mappings()
+        # Keep a typed copy on disk for the next cold start
+        save_snapshot(df, FILE_ID, revision)
         
-        # Clean race
-        if 'race' in df.columns:
-            df['race'] = df['race'].astype(str)  # Convert from categorical back to string temporarily
-            df['race'] = df['race'].replace(race_mapping)
-            df['race'] = df['race'].apply(
-                lambda x: clean_race_with_regex(x) if pd.notna(x) and x not in race_mapping.values() else x
-            )
-            df['race'] = pd.Categorical(df['race'])  # Convert back to categorical for optimization
-        
-        # Clean gender
-        if 'gender' in df.columns:
-            df['gender'] = df['gender'].astype(str)  # Convert from categorical back to string temporarily
-            df['gender'] = df['gender'].replace(gender_mapping)
-            df['gender'] = df['gender'].apply(
-                lambda x: clean_gender_with_regex(x) if pd.notna(x) and x not in gender_mapping.values() else x
-            )
-            df['gender'] = pd.Categorical(df['gender'])  # Convert back to categorical for optimization
+        # Tag the dataset so per-revision caches (filters etc.) know when it changes
+        df.attrs['revision'] = revision or f"unversioned-{time.time_ns()}"
             
         return df
         
@@ -956,36 +200,45 @@ def load_data():
         st.stop()
 
 # functions for data upload 
-def save_to_google_drive(combined_df):
+def save_to_google_drive(df, mode='rewrite'):
     """
-    Save updated dataframe back to Google Drive
+    Save dataframe back to Google Drive
+    
+    mode='append' only sends the rows in df (e.g. a new upload) to the end of the sheet,
+    mode='rewrite' clears the sheet and replaces it with df (used by dataset rebuilds)
     """
     try:
-        # Get credentials from Streamlit secrets
-        creds_dict = get_google_credentials()
-        if creds_dict is None:
+        # Shared authorized client (credentials from Streamlit secrets)
+        clients = get_google_clients()
+        if clients is None:
             st.error("Cannot save to Google Drive: Missing credentials")
             return False
-        
-        # Set up credentials and authorize
-        scopes = ['https://www.googleapis.com/auth/drive']
-        credentials = Credentials.from_service_account_info(creds_dict, scopes=scopes)
-        gc = gspread.authorize(credentials)
+        gc = clients.sheets()
         
         # Your Google Drive file ID (same as in load_data)
         FILE_ID = "1Rj3Cwwc54vmqWk-TC4yie9i9fY6Vdphtphk11P5jj9o"
         
-        # Open the file and clear existing data
         file = gc.open_by_key(FILE_ID)
         worksheet = file.get_worksheet(0)
-        worksheet.clear()
         
-        # Prepare data for upload - convert all to strings to avoid formatting issues
-        data_to_upload = [combined_df.columns.tolist()]  # Headers first
-        data_to_upload.extend(combined_df.astype(str).values.tolist())  # Then data rows
+        # Derived display columns are rebuilt on load and never stored in the sheet
+        df = df.drop(columns=DEMOGRAPHIC_VIZ_COLUMNS, errors='ignore')
         
-        # Upload data to Google Sheets
-        worksheet.update(data_to_upload)
+        if mode == 'append':
+            # Only send the new rows, in batches with retry
+            append_dataframe(worksheet, df)
+        elif mode == 'rewrite':
+            # Clear existing data and upload everything as strings, in ranged blocks
+            progress_bar = st.progress(0.0, text="Writing dataset to Google Sheets...")
+            
+            def report_progress(rows_done, total_rows):
+                progress_bar.progress(rows_done / total_rows,
+                                      text=f"Written {rows_done:,} of {total_rows:,} rows to Google Sheets")
+            
+            rewrite_dataframe(worksheet, df, on_progress=report_progress)
+            progress_bar.empty()
+        else:
+            raise ValueError(f"Unknown save mode: {mode}")
         
         return True
         
@@ -994,18 +247,18 @@ def save_to_google_drive(combined_df):
         return False
 
 # create back up audit log
-def create_backup_and_audit_log(username, upload_info):
+def create_backup_and_audit_log(username, upload_info, backup_mode=BACKUP_MODE):
     """
     Create a backup of current data and log the upload activity
+    
+    backup_mode='copy' makes a timestamped Drive-side copy of the main sheet (keeping the
+    last DEFAULT_BACKUP_HISTORY copies), backup_mode='overwrite' rewrites the single backup sheet
     """
     try:
-        creds_dict = get_google_credentials()
-        if creds_dict is None:
+        clients = get_google_clients()
+        if clients is None:
             return False
-        
-        scopes = ['https://www.googleapis.com/auth/drive', 'https://www.googleapis.com/auth/spreadsheets']
-        credentials = Credentials.from_service_account_info(creds_dict, scopes=scopes)
-        gc = gspread.authorize(credentials)
+        gc = clients.sheets()
         
         # Main data file ID
         MAIN_FILE_ID = "1Rj3Cwwc54vmqWk-TC4yie9i9fY6Vdphtphk11P5jj9o"
@@ -1017,13 +270,18 @@ def create_backup_and_audit_log(username, upload_info):
         AUDIT_LOG_FILE_ID = "1AzE8uz5hUzKoFE97xKzuSdIF9yDN4Y8kG54o5AenaxU"
         
         # 1. Create backup of current data
-        main_file = gc.open_by_key(MAIN_FILE_ID)
-        main_data = main_file.get_worksheet(0).get_all_values()
-        
-        backup_file = gc.open_by_key(BACKUP_FILE_ID)
-        backup_worksheet = backup_file.get_worksheet(0)
-        backup_worksheet.clear()
-        backup_worksheet.update(main_data)
+        if backup_mode == 'copy':
+            try:
+                # Server-side copy - no cells pass through the app (pruning old copies never raises)
+                create_backup_copy(clients.drive(), MAIN_FILE_ID, keep=DEFAULT_BACKUP_HISTORY)
+            except Exception as e:
+                # e.g. no Drive storage for new files - keep the previous single-sheet backup
+                print(f"Drive backup copy failed, overwriting the backup sheet instead: {e}")
+                overwrite_backup_sheet(gc, MAIN_FILE_ID, BACKUP_FILE_ID)
+        elif backup_mode == 'overwrite':
+            overwrite_backup_sheet(gc, MAIN_FILE_ID, BACKUP_FILE_ID)
+        else:
+            raise ValueError(f"Unknown backup mode: {backup_mode}")
         
         # 2. Update audit log
         audit_file = gc.open_by_key(AUDIT_LOG_FILE_ID)
@@ -1063,18 +321,35 @@ def create_backup_and_audit_log(username, upload_info):
         st.error(f"Error creating backup/audit log: {str(e)}")
         return False
 
+def load_backup_history():
+    """
+    List the timestamped backup copies of the main data file, newest first
+    """
+    try:
+        clients = get_google_clients()
+        if clients is None:
+            return None
+        
+        MAIN_FILE_ID = "1Rj3Cwwc54vmqWk-TC4yie9i9fY6Vdphtphk11P5jj9o"
+        
+        backups = list_backups(clients.drive(), MAIN_FILE_ID)
+        df = pd.DataFrame(backups, columns=['name', 'createdTime', 'id'])
+        df['createdTime'] = pd.to_datetime(df['createdTime'], errors='coerce')
+        return df
+        
+    except Exception as e:
+        st.error(f"Error loading backup history: {str(e)}")
+        return None
+
 def load_audit_log():
     """
     Load and display audit log
     """
     try:
-        creds_dict = get_google_credentials()
-        if creds_dict is None:
+        clients = get_google_clients()
+        if clients is None:
             return None
-        
-        scopes = ['https://www.googleapis.com/auth/drive']
-        credentials = Credentials.from_service_account_info(creds_dict, scopes=scopes)
-        gc = gspread.authorize(credentials)
+        gc = clients.sheets()
         
         AUDIT_LOG_FILE_ID = "1AzE8uz5hUzKoFE97xKzuSdIF9yDN4Y8kG54o5AenaxU"
         
@@ -1104,48 +379,6 @@ def load_audit_log():
         st.error(f"Error loading audit log: {str(e)}")
         return None
 
-def process_single_file(uploaded_file, source):
-    """
-    Process a single uploaded file with standardization and validation
-    Returns: (processed_df, success, error_message)
-    """
-    try:
-        # Read the uploaded file
-        df_new = pd.read_excel(uploaded_file, header=0)
-
-        # Clean MALS case IDs by removing the "E" from the 3rd position
-        if source == 'MALS':
-            if 'Matter/Case ID' in df_new.columns:
-                df_new['Matter/Case ID'] = df_new['Matter/Case ID'].astype(str).apply(
-                    lambda x: x[:2] + x[3:] if len(x) > 3 and x[2] == 'E' else x
-                )
-            elif 'Case # ID' in df_new.columns:
-                df_new['Case # ID'] = df_new['Case # ID'].astype(str).apply(
-                    lambda x: x[:2] + x[3:] if len(x) > 3 and x[2] == 'E' else x
-                )
-
-        # Header validation check
-        first_row_headers = df_new.columns.astype(str).str.strip()
-        known_headers = get_standard_mappings()[0].keys()
-
-        has_title_row = (
-            (len(first_row_headers) <= 3 and any(first_row_headers.str.len() > 30)) or
-            (first_row_headers.isin(known_headers).sum() < 3)
-        )
-
-        no_valid_columns = first_row_headers.isin(known_headers).sum() == 0
-
-        if has_title_row or no_valid_columns:
-            return None, False, "File appears to have header issues or missing column names"
-
-        # Process data using existing standardization
-        df_processed = standardize_new_data(df_new, source)
-        
-        return df_processed, True, None
-        
-    except Exception as e:
-        return None, False, str(e)
-
 def rebuild_dataset_from_files(uploaded_files, file_sources):
     """
     Rebuild the entire dataset from uploaded raw files
@@ -1157,10 +390,20 @@ def rebuild_dataset_from_files(uploaded_files, file_sources):
             combined_data = []
             processing_log = []
             
-            # Process each uploaded file using shared logic
-            for file in uploaded_files:
+            # Parse and standardize the files in parallel worker processes
+            progress_bar = st.progress(0.0)
+            progress_text = st.empty()
+            
+            def report_progress(files_done, total_files, file_name, result):
+                progress_bar.progress(files_done / total_files)
+                progress_text.text(f"Processed {files_done} of {total_files} files (last finished: {file_name})")
+            
+            files = [(file.name, file.getvalue(), file_sources[file.name]) for file in uploaded_files]
+            results = process_files(files, on_progress=report_progress)
+            
+            # Log and combine in upload order, whatever order the workers finished in
+            for file, (df_processed, success, error_msg) in zip(uploaded_files, results):
                 source = file_sources[file.name]
-                df_processed, success, error_msg = process_single_file(file, source)
                 
                 if success:
                     combined_data.append(df_processed)
@@ -1184,7 +427,8 @@ def rebuild_dataset_from_files(uploaded_files, file_sources):
                 
                 if backup_success:
                     # Save the new dataset
-                    if save_to_google_drive(final_dataset):
+                    if save_to_google_drive(final_dataset, mode='rewrite'):
+                        load_data.clear()
                         st.cache_data.clear()
                         
                         # Store results in session state instead of displaying immediately
@@ -1294,14 +538,11 @@ def handle_file_upload():
                 current_user = get_current_username()
                 
                 with st.spinner('Creating backup and saving data...'):
-                    # Combine datasets
-                    combined_df = pd.concat([existing_df, df_processed], ignore_index=True)
-                    
                     # Prepare upload info for audit
                     upload_info = {
                         'records_added': len(df_processed),
                         'organization': df_processed['source'].iloc[0] if len(df_processed) > 0 else 'Unknown',
-                        'total_records_after': len(combined_df)
+                        'total_records_after': len(existing_df) + len(df_processed)
                     }
                     
                     # Create backup and audit entry BEFORE saving new data
@@ -1310,18 +551,20 @@ def handle_file_upload():
                     if not backup_success:
                         st.error("Failed to create backup. Upload cancelled for data safety.")
                     else:
-                        del existing_df, df_processed
+                        del existing_df
+                        new_rows_df = df_processed.copy()
             
                         # Make sure date columns are normalized before saving
                         date_columns = ['date_opened', 'date_closed']
                         for col in date_columns:
-                            if col in combined_df.columns:
-                                combined_df[col] = pd.to_datetime(combined_df[col], errors='coerce').dt.normalize()
+                            if col in new_rows_df.columns:
+                                new_rows_df[col] = pd.to_datetime(new_rows_df[col], errors='coerce').dt.normalize()
             
-                        # Save combined data to Google Drive
-                        if save_to_google_drive(combined_df):
+                        # Append only the new rows to Google Drive
+                        if save_to_google_drive(new_rows_df, mode='append'):
                             # Clear the cache
-                            del combined_df
+                            del new_rows_df
+                            load_data.clear()
                             st.cache_data.clear()
                             
                             # Update session state
@@ -1344,56 +587,111 @@ def handle_file_upload():
                 st.session_state.processed_data = None
                 st.rerun()
 
-def download_model_from_drive(file_id, model_name):
+# Drive file IDs of the prediction models
+PREDICTION_MODELS = {
+    'dv': ("1whcxDUhNFd0tg28RaMwE0FL07LIYpILC", "DV prediction"),
+    'case_time': ("1yRLO0QaWtv2EI3BQgG1G__lKDf-6QrjZ", "case time prediction")
+}
+
+def download_model_from_drive(file_id, clients):
     """
-    Download model from Google Drive using file ID
+    Load a model from Google Drive using file ID
+    
+    The joblib file is kept in a local cache and only downloaded again when its
+    Drive version changes. If TALS_MODEL_DIR is set, <file_id>.joblib is loaded
+    from that directory instead (offline stand-in).
+    
+    Makes no Streamlit calls (errors are raised) so it can run in the warm-up threads.
     """
-    try:
-        # Get credentials from Streamlit secrets
-        creds_dict = get_google_credentials()
-        if creds_dict is None:
-            st.error(f"Cannot load {model_name} model: Missing credentials")
-            return None
-        
-        # Set up credentials
-        scopes = ['https://www.googleapis.com/auth/drive']
-        credentials = Credentials.from_service_account_info(creds_dict, scopes=scopes)
-        
-        # Download model using Google Drive API
-        import googleapiclient.discovery
-        service = googleapiclient.discovery.build('drive', 'v3', credentials=credentials)
-        
-        request = service.files().get_media(fileId=file_id)
-        file_content = io.BytesIO()
-        
-        import googleapiclient.http
-        downloader = googleapiclient.http.MediaIoBaseDownload(file_content, request)
-        done = False
-        while done is False:
-            status, done = downloader.next_chunk()
-        
-        file_content.seek(0)
-        model = joblib.load(file_content)
-        
-        return model
+    local_model = local_model_path(file_id)
+    if local_model is not None:
+        model_path, version = local_model
+    else:
+        if clients is None:
+            raise ValueError("Missing credentials")
         
+        # Check the Drive version and download only if the local copy is stale
+        # (each warm-up thread gets its own Drive service from the pool)
+        model_path, version = fetch_model_file(clients.drive(), file_id)
+    
+    # Memory-mapped so worker processes share the model arrays through the page cache
+    model = load_model(model_path)
+    
+    # Version tag for prediction cache keys
+    model.tals_version = f"{file_id}:{version}"
+    
+    return model
+
+@st.cache_resource
+def start_model_warmup():
+    """
+    Start loading both prediction models in background threads, once per process,
+    so the dashboard tabs never wait on the model downloads.
+    Returns the futures keyed like PREDICTION_MODELS.
+    """
+    # Secrets are read here on the script thread; the workers only get the client pool
+    clients = get_google_clients()
+    
+    executor = ThreadPoolExecutor(max_workers=len(PREDICTION_MODELS), thread_name_prefix="model-warmup")
+    futures = {
+        key: executor.submit(download_model_from_drive, file_id, clients)
+        for key, (file_id, _) in PREDICTION_MODELS.items()
+    }
+    executor.shutdown(wait=False)
+    return futures
+
+def restart_model_load(key):
+    """Replace a failed background load of a prediction model with a fresh one"""
+    file_id, _ = PREDICTION_MODELS[key]
+    clients = get_google_clients()
+    
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="model-warmup")
+    start_model_warmup()[key] = executor.submit(download_model_from_drive, file_id, clients)
+    executor.shutdown(wait=False)
+
+def model_is_ready(key):
+    """True once the background load of a prediction model has finished (successfully or not)"""
+    return start_model_warmup()[key].done()
+
+def wait_for_model(key):
+    """
+    Wait for the background load of a prediction model and return it (None if it failed).
+    A failed load is not kept: it is restarted, so the next run tries the download again.
+    """
+    file_id, model_name = PREDICTION_MODELS[key]
+    try:
+        return start_model_warmup()[key].result()
     except Exception as e:
         st.error(f"Error loading {model_name} model from Google Drive: {str(e)}")
+        restart_model_load(key)
         return None
 
-@st.cache_resource
+# Not st.cache_resource: the loaded model is already held by the cached warm-up future,
+# and caching here would also keep the None of a failed load for the life of the process
 def load_dv_model():
     """Load DV prediction model from Google Drive"""
-    DV_MODEL_FILE_ID = "1whcxDUhNFd0tg28RaMwE0FL07LIYpILC"
-    model = download_model_from_drive(DV_MODEL_FILE_ID, "DV prediction")
-    return model
+    return wait_for_model('dv')
 
-@st.cache_resource  
 def load_case_time_model():
     """Load case time prediction model from Google Drive"""
-    CASE_TIME_MODEL_FILE_ID = "1yRLO0QaWtv2EI3BQgG1G__lKDf-6QrjZ"
-    model = download_model_from_drive(CASE_TIME_MODEL_FILE_ID, "case time prediction")
-    return model
+    return wait_for_model('case_time')
+
+@st.cache_resource
+def get_prediction_cache():
+    """LRU cache of predictor results for repeated intake profiles (shared across sessions)"""
+    return PredictionCache(maxsize=512)
+
+def show_prediction_cache_stats():
+    """Show the prediction cache counters to admins"""
+    if is_admin_user():
+        stats = get_prediction_cache().stats()
+        st.caption(
+            f"🛠️ Prediction cache: {stats['hits']:,} hits / {stats['misses']:,} misses "
+            f"({stats['hit_rate']:.0%} hit rate, {stats['entries']:,} cached results)"
+        )
+
+# Kick off the model downloads in the background while the data loads
+start_model_warmup()
 
 # Load the data
 if 'data_loaded' not in st.session_state:
@@ -1408,7 +706,8 @@ else:
 
 # Add refresh button in sidebar
 if st.sidebar.button('Refresh Data', key="refresh_data_btn"):
-    # Clear Streamlit's cache
+    # Clear Streamlit's cache (the shared dataset is a cached resource)
+    load_data.clear()
     st.cache_data.clear()
     st.session_state.data_loaded = False
     st.rerun()
@@ -1434,14 +733,16 @@ selected_sources = st.sidebar.multiselect(
     default=get_sorted_sources(df)
 )
 
-# Apply the filters
-filtered_df = df.copy()
+# Precomputed filter columns for this dataset revision
+@st.cache_resource(max_entries=4)
+def get_filter_index(_df, revision):
+    """Build the filter engine's int64 date and category code columns once per revision"""
+    return FilterIndex(_df)
 
-filtered_df = filtered_df[filtered_df['source'].isin(selected_sources)]
+filter_index = get_filter_index(df, dataset_revision(df))
 
 # Calculate date range based on actual data values - simply use normalized dates
-date_opened_min = pd.to_datetime(df['date_opened']).min().date()
-date_opened_max = pd.to_datetime(df['date_opened']).max().date()
+date_opened_min, date_opened_max = filter_index.date_bounds('date_opened')
 
 # Create the date picker in sidebar
 date_range = st.sidebar.date_input(
@@ -1452,8 +753,7 @@ date_range = st.sidebar.date_input(
 )
 
 # Calculate closed date range 
-date_closed_min = pd.to_datetime(df['date_closed']).min().date()
-date_closed_max = pd.to_datetime(df['date_closed']).max().date()
+date_closed_min, date_closed_max = filter_index.date_bounds('date_closed')
 
 # Create the date picker in sidebar
 closed_date_range = st.sidebar.date_input(
@@ -1496,75 +796,82 @@ rural_counties_selected = st.sidebar.multiselect(
 # Combine the selections
 selected_counties = urban_counties_selected + rural_counties_selected
 
-# Apply county filter if counties are selected
-if selected_counties:
-    filtered_df = filtered_df[filtered_df['county_dispute'].isin(selected_counties)]
+# Filtered row positions are shared across reruns and sessions, keyed on the filter state
+@st.cache_resource
+def get_filter_result_cache():
+    """Process-wide LRU cache of filtered row positions"""
+    return FilterResultCache(maxsize=64)
 
-# Handle date filtering
-# Create a mask for valid dates (not null)
-date_mask = filtered_df['date_opened'].notna()
+filter_state_key = filter_key(
+    dataset_revision(df), selected_sources, date_range, closed_date_range, selected_counties
+)
 
-# Split the dataframe into rows with valid dates and rows with unknown/null dates
-date_df = filtered_df[date_mask].copy()
-unknown_df = filtered_df[~date_mask].copy()
+# Apply all filters in a single pass: source, county (if selected), and the opened/closed
+# date ranges. Rows with unknown dates are kept, as before. Reruns that don't change the
+# filters (e.g. clicking inside a tab) reuse the cached positions and skip filtering.
+filtered_positions = get_filter_result_cache().get_positions(
+    filter_state_key,
+    lambda: filter_index.positions(
+        selected_sources,
+        date_range=date_range,
+        closed_date_range=closed_date_range,
+        selected_counties=selected_counties
+    )
+)
+# Rows are copied out of the shared dataset lazily: counts come from the cube, each tab
+# takes only the columns it reads, and the full frame is built only for batch scoring
+# and downloads (with no filters applied, the shared columns are reused as they are)
+filtered_rows = FilteredRows(df, filtered_positions)
 
-# Apply date filter only to rows with valid dates
-if not date_df.empty:
-    # Apply date range filter using the date_range from the sidebar
-    date_filtered = date_df[
-        (date_df['date_opened'].dt.date >= date_range[0]) &
-        (date_df['date_opened'].dt.date <= date_range[1])
-    ]
-    
-    # Combine filtered date rows with unknown date rows
-    filtered_df = pd.concat([date_filtered, unknown_df])
-
-# Create a mask for valid closed dates (not null)
-closed_date_mask = filtered_df['date_closed'].notna()
-
-# Split the dataframe into rows with valid closed dates and rows with unknown/null closed dates
-closed_date_df = filtered_df[closed_date_mask].copy()
-closed_unknown_df = filtered_df[~closed_date_mask].copy()
-
-# Apply date filter only to rows with valid closed dates
-if not closed_date_df.empty:
-    # Apply date range filter using the closed_date_range from the sidebar
-    closed_date_filtered = closed_date_df[
-        (closed_date_df['date_closed'].dt.date >= closed_date_range[0]) &
-        (closed_date_df['date_closed'].dt.date <= closed_date_range[1])
-    ]
-    
-    # Update filtered_df to include the filtered closed date rows and unknown closed date rows
-    filtered_df = pd.concat([closed_date_filtered, closed_unknown_df])
+# Pre-aggregated case counts for the Overview / Case Analysis / Trends charts
+@st.cache_resource(max_entries=4)
+def get_count_cube(_df, revision):
+    """Build the case count cube once per dataset revision"""
+    return CaseCountCube(_df)
 
-# Apply county filter if counties are selected
-if selected_counties:
-    filtered_df = filtered_df[filtered_df['county_dispute'].isin(selected_counties)]
+count_cube = get_count_cube(df, dataset_revision(df))
 
-# Data Cleaning Function for cleaner display
-def clean_demographics_for_viz(df):
-    """Clean demographic data specifically for visualizations"""
-    df_clean = df.copy()
-    
-    # Fix age = 0 (treat as null/missing)
-    df_clean['age_intake_clean'] = df_clean['age_intake'].replace(0, pd.NA)
-    
-    # Use the same standardization logic
-    _, race_mapping, gender_mapping, _ = get_standard_mappings()
-    
-    # Standardize race
-    df_clean['race_clean'] = df_clean['race'].replace(race_mapping)
-    df_clean['race_clean'] = df_clean['race_clean'].apply(
-        lambda x: clean_race_with_regex(x) if pd.notna(x) and x not in race_mapping.values() else x
+def count_cases(group_by, exclude_foodstamps=False):
+    """
+    Case counts under the current sidebar filters, grouped by cube dimensions.
+    Sums cube cells when the date ranges are month-aligned, otherwise scans the filtered rows.
+    """
+    if count_cube.can_answer(date_range, closed_date_range):
+        return count_cube.query(group_by, selected_sources, date_range, closed_date_range,
+                                selected_counties, exclude_foodstamps)
+    return count_rows(filtered_rows.columns(CUBE_SOURCE_COLUMNS), group_by, exclude_foodstamps)
+
+# Caseload input for the batch prediction tools
+def read_caseload_file(uploaded_file):
+    """Read an uploaded CSV/XLSX caseload that uses the dataset's column names"""
+    if uploaded_file.name.lower().endswith('.csv'):
+        return pd.read_csv(uploaded_file)
+    return pd.read_excel(uploaded_file)
+
+def select_batch_caseload(key_prefix, label):
+    """
+    Let the user pick the caseload to score: the current filtered data or an uploaded file.
+    Returns the caseload DataFrame, or None until a file is uploaded.
+    """
+    batch_source = st.radio(
+        label,
+        options=["Current filtered data", "Upload a file"],
+        horizontal=True,
+        key=f"{key_prefix}_source"
     )
     
-    # Standardize gender
-    df_clean['gender_clean'] = df_clean['gender'].replace(gender_mapping)
-    df_clean['gender_clean'] = df_clean['gender_clean'].apply(
-        lambda x: clean_gender_with_regex(x) if pd.notna(x) and x not in gender_mapping.values() else x
-    )
+    if batch_source == "Current filtered data":
+        return filtered_rows.frame().drop(columns=DEMOGRAPHIC_VIZ_COLUMNS, errors='ignore')
     
-    return df_clean
+    uploaded_file = st.file_uploader(
+        "Upload an intake export (CSV or XLSX)",
+        type=["csv", "xlsx"],
+        help="Columns should use the dataset's names (e.g. age_intake, household_adults, county_dispute), like the Download Filtered Data export",
+        key=f"{key_prefix}_file"
+    )
+    if uploaded_file is None:
+        return None
+    return read_caseload_file(uploaded_file)
 
 # Main content area with tabs
 tab1, tab2, tab3, tab4, tab5, tab6, tab7, tab8 = st.tabs(["Overview", "Demographic Analysis", "Case Analysis", "Trends & Patterns", "Custom Visualization", "DV Risk Predictor", "Case Time Predictor", "Data Upload"])
@@ -1573,24 +880,23 @@ with tab1:
     st.header("Overview Statistics")
     
     # Key metrics in columns
+    overview_df = filtered_rows.columns(['case_id', 'days_open', 'county_dispute', 'client_id'])
     col1, col2, col3, col4 = st.columns(4)
     with col1:
-        st.metric("Total Cases", filtered_df['case_id'].nunique())
+        st.metric("Total Cases", overview_df['case_id'].nunique())
     with col2:
-        st.metric("Average Days Open", round(filtered_df['days_open'].mean(), 1))
+        st.metric("Average Days Open", round(overview_df['days_open'].mean(), 1))
     with col3:
-        st.metric("Unique Counties", filtered_df['county_dispute'].nunique())
+        st.metric("Unique Counties", overview_df['county_dispute'].nunique())
     with col4:
-        st.metric("Total Clients", filtered_df['client_id'].nunique())
+        st.metric("Total Clients", overview_df['client_id'].nunique())
     
     # Cases over time
     st.subheader("Cases Over Time")
-    # Filter out unknown dates for the time series
-    valid_dates_df = filtered_df[filtered_df['date_opened'].notna()].copy()
-    if not valid_dates_df.empty:
-        cases_over_time = valid_dates_df.groupby(
-            pd.to_datetime(valid_dates_df['date_opened']).dt.to_period('M')
-        ).size().reset_index(name='count')
+    # Monthly counts (unknown dates are left out of the time series)
+    cases_over_time = count_cases('month_opened')
+    if not cases_over_time.empty:
+        cases_over_time = cases_over_time.rename_axis('date_opened').reset_index(name='count')
         cases_over_time['date_opened'] = cases_over_time['date_opened'].astype(str)
         
         fig = px.line(cases_over_time, x='date_opened', y='count',
@@ -1603,15 +909,16 @@ with tab1:
 with tab2:
     st.header("Demographic Analysis")
 
-    # Clean the data for visualization
-    viz_df = clean_demographics_for_viz(filtered_df)
-
+    # age_intake_clean / race_clean / gender_clean are precomputed by load_data()
+    client_df = filtered_rows.columns(
+        ['client_id', 'age_intake_clean', 'gender_clean', 'race_clean', 'household_total']
+    )
     col1, col2 = st.columns(2)
     
     with col1:
         # Age distribution
         st.subheader("Age Distribution")
-        unique_age_dist = viz_df.groupby('client_id')['age_intake_clean'].first().dropna()
+        unique_age_dist = client_df.groupby('client_id')['age_intake_clean'].first().dropna()
         fig = px.histogram(unique_age_dist, 
                   title="Age Distribution at Intake (Unique Clients)",
                   labels={'age_intake': 'Age at Intake', 'count': 'Number of Clients'})
@@ -1619,7 +926,7 @@ with tab2:
         
         # Gender distribution
         st.subheader("Gender Distribution")
-        gender_counts = viz_df.groupby('client_id')['gender_clean'].first().value_counts()
+        gender_counts = client_df.groupby('client_id')['gender_clean'].first().value_counts()
         fig = px.pie(values=gender_counts.values, names=gender_counts.index,
             title="Gender Distribution (Unique Clients)",
             labels={'names': 'Gender', 'values': 'Number of Clients'})
@@ -1628,7 +935,7 @@ with tab2:
     with col2:
         # Race distribution
         st.subheader("Race Distribution")
-        race_counts = viz_df.groupby('client_id')['race_clean'].first().value_counts()
+        race_counts = client_df.groupby('client_id')['race_clean'].first().value_counts()
         fig = px.bar(x=race_counts.index, y=race_counts.values,
             title="Race Distribution (Unique Clients)",
             labels={'x': 'Race', 'y': 'Number of Clients'})
@@ -1636,7 +943,7 @@ with tab2:
         
         # Household size distribution
         st.subheader("Household Size Distribution")
-        unique_household_dist = filtered_df.groupby('client_id')['household_total'].first()
+        unique_household_dist = client_df.groupby('client_id')['household_total'].first()
         fig = px.histogram(unique_household_dist,
                   title="Household Size Distribution (Unique Clients)",
                   labels={'household_total': 'Household Total Size', 'count': 'Number of Clients'})
@@ -1649,7 +956,8 @@ with tab3:
     exclude_foodstamps = st.checkbox("Exclude Food Stamps Cases (WTLS Counsel and Advice/Brief Service)", value=False, key="tab3_foodstamps_toggle")
     
     # Create filtered dataframe based on food stamps toggle
-    display_df = filtered_df.copy()
+    # Row-level charts here read only these columns
+    display_df = filtered_rows.columns(['source', 'legal_problem_code', 'close_reason', 'date_opened', 'date_closed'])
     if exclude_foodstamps:
         display_df = display_df[~(
             (display_df['source'] == 'WTLS') & 
@@ -1662,7 +970,7 @@ with tab3:
     st.subheader("Top Legal Problems")
     
     # Get problem counts
-    problem_counts = display_df['legal_problem_code'].value_counts().head(20)
+    problem_counts = count_cases('legal_problem_code', exclude_foodstamps).sort_values(ascending=False).head(20)
     
     fig = px.bar(x=problem_counts.index, y=problem_counts.values,
             title=f"Top 20 Legal Problems {'(Excluding Food Stamps)' if exclude_foodstamps else '(Including Food Stamps)'}",
@@ -1689,7 +997,7 @@ with tab3:
     ], horizontal=True)
 
     # Calculate county counts from filtered data
-    county_counts = display_df['county_dispute'].value_counts()
+    county_counts = count_cases('county_dispute', exclude_foodstamps).sort_values(ascending=False)
     
     # Filter to Tennessee counties if requested
     if tn_only:
@@ -1730,7 +1038,7 @@ with tab3:
     st.subheader("Case Duration Analysis")
 
     # Create time-to-resolution analysis
-    temporal_df = display_df.copy()
+    temporal_df = display_df.copy(deep=False)
     temporal_df['date_opened'] = pd.to_datetime(temporal_df['date_opened'])
     temporal_df['date_closed'] = pd.to_datetime(temporal_df['date_closed'])
     temporal_df['resolution_time'] = (temporal_df['date_closed'] - temporal_df['date_opened']).dt.days
@@ -1880,7 +1188,10 @@ with tab4:
     exclude_foodstamps = st.checkbox("Exclude Food Stamps Cases (WTLS Counsel and Advice/Brief Service)", value=False)
     
     # Apply food stamps filter
-    display_df = filtered_df.copy()
+    # Co-occurrence and repeat client analysis read only these columns
+    display_df = filtered_rows.columns(
+        ['source', 'legal_problem_code', 'close_reason', 'client_id', 'date_opened', 'case_time']
+    )
     if exclude_foodstamps:
         display_df = display_df[~(
             (display_df['source'] == 'WTLS') & 
@@ -1891,25 +1202,14 @@ with tab4:
     # Urban/Rural Analysis
     st.subheader("Urban/Rural Analysis")
     
-    # Define Tennessee urban counties 
-    urban_counties = {
-        'Davidson', 'Shelby', 'Knox', 'Hamilton', 'Rutherford', 
-        'Williamson', 'Montgomery', 'Sumner', 'Wilson', 'Madison', 
-        'Washington', 'Carter', 'Sullivan','Hawkins'
-    }
-    
-    # Create urban/rural classification 
-    display_df['area_type'] = display_df['county_dispute'].apply(
-        lambda x: 'Urban' if pd.notna(x) and str(x).strip() in urban_counties else 'Rural'
-    )
-    
-    # Create problem distribution by area type
-    area_problems = display_df.groupby(['area_type', 'legal_problem_code']).size().reset_index(name='count')
-    area_problems['percentage'] = area_problems.groupby('area_type')['count'].transform(
+    # Create problem distribution by area type (urban/rural classification of county_dispute)
+    area_problems = count_cases(['area_type', 'legal_problem_code'], exclude_foodstamps).reset_index(name='count')
+    area_problems['percentage'] = area_problems.groupby('area_type', observed=True)['count'].transform(
     lambda x: (x / x.sum()) * 100)
 
     # Display percentage distribution
-    area_distribution = display_df['area_type'].value_counts(normalize=True).mul(100).round(1)
+    area_counts = count_cases('area_type', exclude_foodstamps)
+    area_distribution = (area_counts / area_counts.sum()).mul(100).round(1)
     st.write(f"Urban: {area_distribution.get('Urban', 0)}% | Rural: {area_distribution.get('Rural', 0)}%")
 
     
@@ -1938,21 +1238,8 @@ with tab4:
     # Age Group Analysis
     st.subheader("Age Group Analysis")
     
-    # Create age groups
-    bins = [0, 25, 35, 50, 65, float('inf')]
-    labels = ['18-25', '26-35', '36-50', '51-65', '65+']
-    display_df['age_group'] = pd.cut(display_df['age_intake'], 
-                                    bins=bins, 
-                                    labels=labels,
-                                    include_lowest=True)
-    
-    # Create a categorical type with specified order
-    display_df['age_group'] = pd.Categorical(display_df['age_group'], 
-                                        categories=['18-25', '26-35', '36-50', '51-65', '65+'],
-                                        ordered=True)
-    
-    # Analyze problems by age group
-    age_problems = display_df.groupby(['age_group', 'legal_problem_code']).size().reset_index(name='count')
+    # Analyze problems by age group (18-25, 26-35, 36-50, 51-65, 65+)
+    age_problems = count_cases(['age_group', 'legal_problem_code'], exclude_foodstamps).reset_index(name='count')
     top_problems_by_age = age_problems.sort_values('count', ascending=False).groupby('age_group').head(5)
     
     fig = px.bar(top_problems_by_age,
@@ -1977,7 +1264,7 @@ with tab4:
     st.plotly_chart(fig, use_container_width=True)
 
     # Analyze problems by gender
-    gender_problems = display_df.groupby(['gender', 'legal_problem_code']).size().reset_index(name='count')
+    gender_problems = count_cases(['gender', 'legal_problem_code'], exclude_foodstamps).reset_index(name='count')
     top_problems_by_gender = gender_problems.sort_values('count', ascending=False).groupby('gender').head(5)
 
     # Create a subheader for the new section
@@ -2008,37 +1295,16 @@ with tab4:
     st.plotly_chart(fig_gender, use_container_width=True)
 
     # Co-occurrence Analysis
-    @st.cache_data
-    def calculate_cooccurrence_matrix(df):
+    @st.cache_data(max_entries=32)
+    def calculate_cooccurrence_matrix(_df, cache_key):
         """
-        Calculate co-occurrence matrix using vectorized operations
-        Returns both the matrix and a DataFrame of problem frequencies
+        Calculate the client-based co-occurrence matrix from a sparse client x problem matrix.
+        Returns both the matrix and a Series of problem frequencies.
+        Cached by cache_key (filter state + food stamps toggle) instead of hashing the frame.
         """
-        # First get unique client-problem combinations AND remove any blank/null legal problem codes
-        unique_client_problems = df.dropna(subset=['client_id', 'legal_problem_code'])
-        
-        # Also filter out empty strings and whitespace-only entries
-        unique_client_problems = unique_client_problems[
-            (unique_client_problems['legal_problem_code'].str.strip() != '') &
-            (unique_client_problems['legal_problem_code'].notna())
-        ]
-        
-        # Remove duplicates
-        unique_client_problems = unique_client_problems.drop_duplicates(['client_id', 'legal_problem_code'])
-        
-        # Create pivot table of client-problem relationships
-        pivot = pd.crosstab(unique_client_problems['client_id'], 
-                            unique_client_problems['legal_problem_code'])
-        
-        # Calculate co-occurrence matrix using matrix multiplication
-        cooccurrence = pivot.T @ pivot
-        
-        # Get problem frequencies (number of unique clients with each problem)
-        problem_frequencies = pivot.sum()
-        
-        return cooccurrence, problem_frequencies
+        return cooccurrence_matrix(_df)
     
-    def display_cooccurrence_analysis(display_df):
+    def display_cooccurrence_analysis(display_df, cache_key):
         """Display co-occurrence analysis with optimized computations"""
         st.subheader("Legal Problem Co-occurrence Analysis")
         st.info("📊 This analysis shows how often clients have multiple legal issues simultaneously (client-based analysis)")
@@ -2066,7 +1332,7 @@ with tab4:
         
         try:
             # Calculate co-occurrence matrix
-            cooccurrence_matrix, problem_frequencies = calculate_cooccurrence_matrix(analysis_df)
+            cooccurrence_matrix, problem_frequencies = calculate_cooccurrence_matrix(analysis_df, cache_key)
             
             if len(problem_frequencies) == 0:
                 st.warning("No valid legal problem codes found for co-occurrence analysis.")
@@ -2156,7 +1422,7 @@ with tab4:
             st.info("This might be due to insufficient data or data formatting issues.")
     
     # Call the function
-    display_cooccurrence_analysis(display_df)
+    display_cooccurrence_analysis(display_df, (filter_state_key, exclude_foodstamps))
 
     # === Repeat Clients Analysis ===
     st.markdown("---")
@@ -2164,10 +1430,10 @@ with tab4:
     st.info("📊 Analyzing clients who had multiple cases opened in the same calendar year")
     
     # Prepare data for repeat client analysis
-    repeat_df = display_df.copy()
+    repeat_df = display_df.copy(deep=False)
     
     # Filter out cases without valid open dates
-    repeat_df = repeat_df[repeat_df['date_opened'].notna()].copy()
+    repeat_df = repeat_df[repeat_df['date_opened'].notna()]
     
     if len(repeat_df) < 2:
         st.warning("Not enough data with valid open dates for repeat client analysis.")
@@ -2175,33 +1441,8 @@ with tab4:
         # Extract year from date_opened
         repeat_df['year_opened'] = pd.to_datetime(repeat_df['date_opened']).dt.year
         
-        # Create service level categories based on case_time
-        def categorize_service_level(row):
-            """Categorize service level based on case_time and close_reason"""
-            case_time = row['case_time']
-            close_reason = str(row['close_reason'])
-            
-            # If case_time is available, use it primarily
-            if pd.notna(case_time) and case_time > 0:
-                if case_time < 3:
-                    return 'Brief Service (<3 hrs)'
-                elif case_time < 10:
-                    return 'Moderate Service (3-10 hrs)'
-                else:
-                    return 'Intensive Service (10+ hrs)'
-            
-            # Fallback to close_reason categorization
-            brief_reasons = ['Counsel and Advice', 'Brief Service', 'Referred', 'X1-Brief Service']
-            limited_reasons = ['Limited Action', 'Negotiated Settlement', 'Administrative Decision']
-            
-            if any(reason.lower() in close_reason.lower() for reason in brief_reasons):
-                return 'Brief Service'
-            elif any(reason.lower() in close_reason.lower() for reason in limited_reasons):
-                return 'Moderate Service'
-            else:
-                return 'Unknown Service Level'
-        
-        repeat_df['service_level'] = repeat_df.apply(categorize_service_level, axis=1)
+        # Service level from case_time, falling back to close_reason
+        repeat_df['service_level'] = service_levels(repeat_df)
         
         # Count cases per client per year
         client_year_counts = repeat_df.groupby(['client_id', 'year_opened']).size().reset_index(name='case_count')
@@ -2278,7 +1519,7 @@ with tab4:
             with viz_tab2:
                 # Get all cases for repeat clients
                 repeat_client_ids = repeat_clients['client_id'].unique()
-                repeat_cases = repeat_df[repeat_df['client_id'].isin(repeat_client_ids)].copy()
+                repeat_cases = repeat_df[repeat_df['client_id'].isin(repeat_client_ids)]
                 
                 # Compare close reasons: repeat vs non-repeat clients
                 non_repeat_client_ids = repeat_df[~repeat_df['client_id'].isin(repeat_client_ids)]['client_id'].unique()
@@ -2335,33 +1576,8 @@ with tab4:
             
             # Detailed table
             with st.expander("📋 View Detailed Repeat Client Data"):
-                # Create summary table
-                detailed_summary = []
-                
-                for _, row in repeat_clients.iterrows():
-                    client_id = row['client_id']
-                    year = row['year_opened']
-                    case_count = row['case_count']
-                    
-                    # Get all cases for this client in this year
-                    client_cases = repeat_df[
-                        (repeat_df['client_id'] == client_id) & 
-                        (repeat_df['year_opened'] == year)
-                    ]
-                    
-                    close_reasons = client_cases['close_reason'].value_counts().to_dict()
-                    service_levels = client_cases['service_level'].value_counts().to_dict()
-                    
-                    detailed_summary.append({
-                        'Client ID': client_id,
-                        'Year': int(year),
-                        'Total Cases': int(case_count),
-                        'Close Reasons': ', '.join([f"{k} ({v})" for k, v in close_reasons.items()]),
-                        'Service Levels': ', '.join([f"{k} ({v})" for k, v in service_levels.items()])
-                    })
-                
-                summary_df = pd.DataFrame(detailed_summary)
-                summary_df = summary_df.sort_values(['Year', 'Total Cases'], ascending=[False, False])
+                # Create summary table (one groupby over all repeat clients)
+                summary_df = repeat_client_summary(repeat_df)
                 
                 st.dataframe(
                     summary_df,
@@ -2399,7 +1615,30 @@ with tab5:
         key="viz_tab_foodstamps"
     )
 
-    display_df = filtered_df.copy()
+    safe_numeric_columns = [
+        'age_intake', 
+        'poverty_pct',
+        'adj_poverty_pct',
+        'household_total',
+        'days_open',
+        'case_time',
+        'outcome_amount'
+    ]
+
+    safe_categorical_columns = [
+        'county_dispute',
+        'legal_problem_code',
+        'race',
+        'gender',
+        'source',
+        'domestic_violence',
+        'income_eligible',
+        'income_waiver_status',
+        'asset_eligible'
+    ]
+
+    # The plot builders below read only these columns
+    display_df = filtered_rows.columns(safe_numeric_columns + safe_categorical_columns + ['date_opened', 'close_reason'])
     if exclude_foodstamps:
         display_df = display_df[~(
             (display_df['source'] == 'WTLS') & 
@@ -2436,28 +1675,6 @@ with tab5:
         "Box Plot"
     ])
 
-    safe_numeric_columns = [
-        'age_intake', 
-        'poverty_pct',
-        'adj_poverty_pct',
-        'household_total',
-        'days_open',
-        'case_time',
-        'outcome_amount'
-    ]
-
-    safe_categorical_columns = [
-        'county_dispute',
-        'legal_problem_code',
-        'race',
-        'gender',
-        'source',
-        'domestic_violence',
-        'income_eligible',
-        'income_waiver_status',
-        'asset_eligible'
-    ]
-
     try:
         # Create a helper function for data cleaning 
         def clean_categorical_data(series, column_name=None):
@@ -2526,7 +1743,7 @@ with tab5:
                 labels={'names': category_col.replace('_', ' ').title(), 'values': 'Count'}
             )
         elif basic_plot_type == "Line Chart":
-            valid_dates_df = display_df[display_df['date_opened'].notna()].copy()
+            valid_dates_df = display_df[display_df['date_opened'].notna()]
             valid_dates_df['month_year'] = pd.to_datetime(valid_dates_df['date_opened']).dt.to_period('M')
             cases_by_month = valid_dates_df.groupby('month_year').size().reset_index()
             cases_by_month['month_year'] = cases_by_month['month_year'].astype(str)
@@ -2586,7 +1803,7 @@ with tab5:
         # Let users optionally remove zero-outcome cases
         exclude_zeros = st.checkbox("Exclude Outcome Amount = 0", value=True)
 
-        df_plot = display_df.copy()
+        df_plot = display_df.copy(deep=False)
         
         if exclude_zeros:
             df_plot = df_plot[df_plot["outcome_amount"] > 0]
@@ -2650,7 +1867,7 @@ with tab5:
 
             try:
                 # Clean both columns before grouping
-                clean_df = display_df.copy()
+                clean_df = display_df.copy(deep=False)
                 
                 # Clean the category column
                 clean_df[category] = clean_df[category].replace(['', ' ', 'nan', 'NaN', 'null', 'NULL', 'None'], pd.NA)
@@ -2680,7 +1897,7 @@ with tab5:
                 "outcome_amount", "case_time", "age_intake", "poverty_pct", "adj_poverty_pct"
             ])
 
-            df_plot = display_df.copy()
+            df_plot = display_df.copy(deep=False)
             # Handle currency data type for outcome_amount
             if numeric_col == 'outcome_amount':
                 df_plot[numeric_col] = df_plot[numeric_col].astype(str).str.replace('$', '').str.replace(',', '').str.replace('nan', '')
@@ -2701,22 +1918,22 @@ with tab6:
     # Import preprocessing functions
     from preprocessing import preprocess_client_data, interpret_risk_score
 
-    # Load the model (use st.cache_resource to load it only once)
-    try:
-        model = load_dv_model()  # This now uses the Google Drive function
-        model_loaded = True if model is not None else False
-    except Exception as e:
-        st.error(f"Error loading model: {str(e)}")
-        model_loaded = False
+    # The model loads in the background at startup - only wait for it when predicting
+    if not model_is_ready('dv'):
+        st.info("⏳ The DV model is still loading in the background. You can fill in the form; predictions will start once it's ready.")
 
     # Get unique values from dataset for dropdown options
+    # Cached per dataset revision - hashing the shared dataset on every call would cost a full pass
     @st.cache_data
-    def get_unique_options(df, column):
-        if column in df.columns:
-            options = df[column].dropna().unique()
+    def _unique_options(_df, column, revision):
+        if column in _df.columns:
+            options = _df[column].dropna().unique()
             return sorted(options)
         return []
 
+    def get_unique_options(df, column):
+        return _unique_options(df, column, dataset_revision(df))
+
     with st.form("dv_form"):
         st.subheader("Client & Case Info")
         st.markdown("*All fields are required for accurate prediction*")
@@ -2773,6 +1990,10 @@ with tab6:
         submitted = st.form_submit_button("Predict Risk", type="primary")
 
     if submitted:
+        with st.spinner('Waiting for the DV model to finish loading...'):
+            model = load_dv_model()
+        model_loaded = model is not None
+        
         if not model_loaded:
             st.error("Cannot generate prediction: Model not loaded")
         else:
@@ -2797,15 +2018,15 @@ with tab6:
                 'language': language
             }
             
-            # Use preprocessing function from imported module
-            processed_data = preprocess_client_data(client_data)
-            
-            # Try to make prediction
+            # Try to make prediction (identical profiles are answered from the prediction cache)
             try:
-                risk_score = model.predict_proba(processed_data)[0, 1]
-                
-                # Use interpret_risk_score function from preprocessing module
-                result = interpret_risk_score(risk_score)
+                cache_key = prediction_key('dv_risk', client_data, model)
+                risk_score = get_prediction_cache().get(cache_key)
+                if risk_score is None:
+                    # Use preprocessing function from imported module
+                    processed_data = preprocess_client_data(client_data)
+                    risk_score = model.predict_proba(processed_data)[0, 1]
+                    get_prediction_cache().put(cache_key, risk_score)
                 
                 # Use interpret_risk_score function from preprocessing module
                 result = interpret_risk_score(risk_score)
@@ -2917,6 +2138,8 @@ with tab6:
                 The model prioritizes identifying potential DV cases, which may result in false positives.
                 """)
                 
+                show_prediction_cache_stats()
+                
             except Exception as e:
                 st.error(f"❌ Error making prediction: {str(e)}")
                 
@@ -2938,10 +2161,65 @@ with tab6:
                     st.write(f"- Scikit-learn: {sklearn.__version__}")
                     st.write(f"- Model loaded: {model is not None}")
 
+    # Batch scoring for a whole intake export
+    st.markdown("---")
+    st.subheader("Batch Risk Scoring")
+    st.write("Score every case in an intake export (or the current filtered data) at once and download the results.")
+    
+    batch_df = select_batch_caseload("dv_batch", "Cases to score")
+    
+    if batch_df is not None:
+        st.caption(f"{len(batch_df):,} cases ready to score")
+        
+        if st.button("Score Cases", type="primary", key="dv_batch_score_btn"):
+            with st.spinner('Waiting for the DV model to finish loading...'):
+                model = load_dv_model()
+            
+            if model is None:
+                st.error("Cannot generate predictions: Model not loaded")
+            elif batch_df.empty:
+                st.warning("No cases to score.")
+            else:
+                try:
+                    with st.spinner('Scoring cases...'):
+                        start_time = time.perf_counter()
+                        batch_scores = predict_dv_risk_batch(batch_df, model)
+                        elapsed = time.perf_counter() - start_time
+                    
+                    scored_df = pd.concat([batch_df, batch_scores], axis=1)
+                    rows_per_sec = len(scored_df) / elapsed if elapsed > 0 else float('inf')
+                    
+                    col1, col2, col3 = st.columns(3)
+                    with col1:
+                        st.metric("Cases Scored", f"{len(scored_df):,}")
+                    with col2:
+                        st.metric("Throughput", f"{rows_per_sec:,.0f} rows/sec")
+                    with col3:
+                        st.metric("High Risk Cases", f"{(batch_scores['risk_level'] == 'High').sum():,}")
+                    
+                    level_counts = batch_scores['risk_level'].value_counts().reindex(["Low", "Medium", "High"], fill_value=0)
+                    st.write(" | ".join(f"{level}: {count:,}" for level, count in level_counts.items()))
+                    
+                    st.dataframe(scored_df.head(100))
+                    
+                    st.download_button(
+                        "Download Scored Cases",
+                        scored_df.to_csv(index=False).encode('utf-8'),
+                        file_name="dv_risk_scores.csv",
+                        mime="text/csv",
+                        key="dv_batch_download"
+                    )
+                except Exception as e:
+                    st.error(f"❌ Error scoring cases: {str(e)}")
+
 with tab7:  # Case Time Prediction tab
     st.header("Case Time Prediction")
     st.write("Estimate the expected duration of a case to help with planning.")
 
+    # The model loads in the background at startup - only wait for it when predicting
+    if not model_is_ready('case_time'):
+        st.info("⏳ The case time model is still loading in the background. You can fill in the form; predictions will start once it's ready.")
+
     # Import the prediction function from preprocessing.py
     from preprocessing import predict_case_time
 
@@ -3026,7 +2304,8 @@ with tab7:  # Case Time Prediction tab
         }
         
         # Load model and get prediction
-        case_time_model = load_case_time_model()
+        with st.spinner('Waiting for the case time model to finish loading...'):
+            case_time_model = load_case_time_model()
         if case_time_model is None:
             result = {
                 'predicted_hours': None,
@@ -3034,8 +2313,14 @@ with tab7:  # Case Time Prediction tab
                 'resource_allocation': "Could not load prediction model"
             }
         else:
-            # Pass the model directly to avoid import issues
-            result = predict_case_time_with_model(client_data, case_time_model)
+            # Identical profiles are answered from the prediction cache
+            cache_key = prediction_key('case_time', client_data, case_time_model)
+            result = get_prediction_cache().get(cache_key)
+            if result is None:
+                # Pass the model directly to avoid import issues
+                result = predict_case_time_with_model(client_data, case_time_model)
+                if result['predicted_hours'] is not None:
+                    get_prediction_cache().put(cache_key, result)
         
         if result['predicted_hours'] is not None:
             # Display results
@@ -3049,31 +2334,8 @@ with tab7:  # Case Time Prediction tab
                 st.markdown(f"**Complexity:** {result['complexity_category']}")
                 st.markdown(f"**Resource Consideration:** {result['resource_allocation']}")
                 
-                # Show which legal problem category this falls into
-                # Determine legal problem group (same logic as in preprocessing)
-                code_str = str(legal_problem_code).strip()
-                if code_str.startswith('0') or code_str.startswith('1'):
-                    legal_group = 'Consumer/Finance'
-                elif code_str.startswith('12') or code_str.startswith('13') or code_str.startswith('14') or code_str.startswith('16') or code_str.startswith('19'):
-                    legal_group = 'Education'
-                elif code_str.startswith('2'):
-                    legal_group = 'Employment'
-                elif code_str.startswith('3'):
-                    legal_group = 'Family Law'
-                elif code_str.startswith('4'):
-                    legal_group = 'Juvenile'
-                elif code_str.startswith('5'):
-                    legal_group = 'Health'
-                elif code_str.startswith('6'):
-                    legal_group = 'Housing'
-                elif code_str.startswith('7'):
-                    legal_group = 'Income/Benefits'
-                elif code_str.startswith('8'):
-                    legal_group = 'Civil Rights'
-                elif code_str.startswith('9'):
-                    legal_group = 'Miscellaneous'
-                else:
-                    legal_group = 'Other'
+                # Show which legal problem category this falls into (same grouping as the model features)
+                legal_group = LEGAL_GROUP_LABELS[group_legal_code(legal_problem_code)]
                 
                 st.info(f"📋 **Legal Category:** {legal_group}")
             
@@ -3145,6 +2407,8 @@ with tab7:  # Case Time Prediction tab
             **Important Note:** This prediction is based on historical data patterns and should be used 
             for planning purposes only. Actual case times may vary significantly based on various factors
             """)
+            
+            show_prediction_cache_stats()
         else:
             st.error("❌ Error making prediction. Please check that all fields are filled correctly and try again.")
             with st.expander("Troubleshooting"):
@@ -3156,6 +2420,61 @@ with tab7:  # Case Time Prediction tab
                 - Ensure age is within valid range (18-100)
                 """)
 
+    # Batch forecast for a whole docket
+    st.markdown("---")
+    st.subheader("Batch Case Time Forecast")
+    st.write("Estimate hours for every case in a caseload - e.g. the open docket - to plan staffing.")
+    
+    batch_df = select_batch_caseload("ct_batch", "Cases to forecast")
+    
+    if batch_df is not None:
+        if 'date_closed' in batch_df.columns:
+            open_only = st.checkbox("Open cases only (no close date)", value=True, key="ct_batch_open_only")
+            if open_only:
+                batch_df = batch_df[batch_df['date_closed'].isna()]
+        
+        st.caption(f"{len(batch_df):,} cases ready to forecast")
+        
+        if st.button("Forecast Case Hours", type="primary", key="ct_batch_predict_btn"):
+            with st.spinner('Waiting for the case time model to finish loading...'):
+                case_time_model = load_case_time_model()
+            if case_time_model is None:
+                st.error("Cannot generate predictions: Model not loaded")
+            elif batch_df.empty:
+                st.warning("No cases to forecast.")
+            else:
+                try:
+                    with st.spinner('Forecasting case hours...'):
+                        start_time = time.perf_counter()
+                        batch_predictions = predict_case_time_batch(batch_df, case_time_model)
+                        elapsed = time.perf_counter() - start_time
+                    
+                    forecast_df = pd.concat([batch_df, batch_predictions], axis=1)
+                    rows_per_sec = len(forecast_df) / elapsed if elapsed > 0 else float('inf')
+                    
+                    col1, col2, col3 = st.columns(3)
+                    with col1:
+                        st.metric("Cases Forecast", f"{len(forecast_df):,}")
+                    with col2:
+                        st.metric("Total Estimated Hours", f"{batch_predictions['predicted_hours'].sum():,.0f}")
+                    with col3:
+                        st.metric("Throughput", f"{rows_per_sec:,.0f} rows/sec")
+                    
+                    # Hours by complexity category
+                    category_summary = batch_predictions.groupby('complexity_category', observed=False)['predicted_hours'].agg(['count', 'sum'])
+                    category_summary.columns = ['Cases', 'Estimated Hours']
+                    st.dataframe(category_summary.style.format({'Cases': '{:,.0f}', 'Estimated Hours': '{:,.1f}'}))
+                    
+                    st.download_button(
+                        "Download Case Time Forecast",
+                        forecast_df.to_csv(index=False).encode('utf-8'),
+                        file_name="case_time_forecast.csv",
+                        mime="text/csv",
+                        key="ct_batch_download"
+                    )
+                except Exception as e:
+                    st.error(f"❌ Error forecasting case hours: {str(e)}")
+
 with tab8:
     # Check if user is admin
     if not is_admin_user():
@@ -3229,6 +2548,22 @@ with tab8:
                 )
             else:
                 st.info("No upload history found.")
+        
+        if st.button("View Backups", key="view_backups_btn"):
+            backup_df = load_backup_history()
+            if backup_df is not None and len(backup_df) > 0:
+                st.caption(f"The {DEFAULT_BACKUP_HISTORY} most recent backups are kept.")
+                st.dataframe(
+                    backup_df,
+                    column_config={
+                        "name": "Backup",
+                        "createdTime": st.column_config.DatetimeColumn("Created"),
+                        "id": "Drive File ID"
+                    },
+                    hide_index=True
+                )
+            else:
+                st.info("No backup copies found.")
     
     with col2:
         st.subheader("🔄 Rebuild Dataset")
@@ -3280,10 +2615,14 @@ with tab8:
 st.sidebar.markdown("---")
 st.sidebar.header("Download Filtered Data")
 
-# Download CSV button
+def filtered_download_df():
+    """Filtered rows for the downloads: the sheet columns only, not the derived display columns"""
+    return filtered_rows.frame().drop(columns=DEMOGRAPHIC_VIZ_COLUMNS, errors='ignore')
+
+# Download CSV button (the file is built when the button is clicked, not on every rerun)
 st.sidebar.download_button(
     label="Download as CSV",
-    data=filtered_df.to_csv(index=False).encode('utf-8'),
+    data=lambda: filtered_download_df().to_csv(index=False).encode('utf-8'),
     file_name="filtered_data.csv",
     mime="text/csv"
 )
@@ -3293,7 +2632,7 @@ if st.sidebar.button("Prepare Excel Download", key="excel_download_btn"):
     with st.spinner('Preparing Excel file...'):
         buffer = io.BytesIO()
         with pd.ExcelWriter(buffer, engine='openpyxl') as writer:
-            filtered_df.to_excel(writer, index=False)
+            filtered_download_df().to_excel(writer, index=False)
         buffer.seek(0)
     
     # Move download button outside the spinner block to sidebar
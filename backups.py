@@ -0,0 +1,119 @@
+"""
+Dataset backups taken before every upload or rebuild.
+By default the main sheet is duplicated with a Drive-side files().copy, so a
+backup costs a couple of metadata calls instead of downloading and re-uploading
+every row, and the most recent DEFAULT_BACKUP_HISTORY copies are kept.
+"""
+
+import os
+from datetime import datetime, timezone
+
+from sheets_io import read_values, write_values
+
+# 'copy' = timestamped Drive-side copies, 'overwrite' = rewrite the single backup sheet
+BACKUP_MODE = os.environ.get('TALS_BACKUP_MODE', 'copy')
+
+# Number of timestamped backup copies kept per file (older ones are deleted)
+DEFAULT_BACKUP_HISTORY = 10
+
+BACKUP_NAME_PREFIX = "TALS backup"
+
+# appProperties key tagging each copy with the file it backs up
+_BACKUP_PROPERTY = 'tals_backup_of'
+
+_BACKUP_FIELDS = 'id,name,createdTime'
+
+
+def _backup_query(file_id):
+    return (
+        f"appProperties has {{ key='{_BACKUP_PROPERTY}' and value='{file_id}' }} "
+        "and trashed = false"
+    )
+
+
+def list_backups(service, file_id):
+    """
+    List the backup copies of a file, newest first.
+
+    Returns:
+    --------
+    list of dict
+        Drive metadata (id, name, createdTime) of each backup copy
+    """
+    backups = []
+    page_token = None
+    while True:
+        response = service.files().list(
+            q=_backup_query(file_id),
+            orderBy='createdTime desc',
+            fields=f'nextPageToken,files({_BACKUP_FIELDS})',
+            pageSize=100,
+            pageToken=page_token,
+            supportsAllDrives=True,
+            includeItemsFromAllDrives=True
+        ).execute()
+        backups.extend(response.get('files', []))
+        page_token = response.get('nextPageToken')
+        if not page_token:
+            return backups
+
+
+def prune_backups(service, file_id, keep=DEFAULT_BACKUP_HISTORY):
+    """Delete all but the newest keep backup copies of a file. Returns the number deleted."""
+    stale = list_backups(service, file_id)[keep:]
+    for backup in stale:
+        service.files().delete(fileId=backup['id'], supportsAllDrives=True).execute()
+    return len(stale)
+
+
+def create_backup_copy(service, file_id, keep=DEFAULT_BACKUP_HISTORY, folder_id=None, timestamp=None):
+    """
+    Back up a Drive file with a server-side copy and trim the backup history.
+
+    Parameters:
+    -----------
+    service : googleapiclient Resource
+        Drive v3 service
+    file_id : str
+        Drive file ID of the sheet to back up
+    keep : int
+        Number of backup copies to keep, including the new one
+    folder_id : str, optional
+        Folder for the copy, defaults to the source file's folder
+    timestamp : datetime, optional
+        Time used in the backup name, defaults to now (UTC)
+
+    Returns:
+    --------
+    dict
+        Drive metadata (id, name, createdTime) of the new copy
+
+    Only a failed copy raises; pruning errors are logged.
+    """
+    timestamp = timestamp or datetime.now(timezone.utc)
+    body = {
+        'name': f"{BACKUP_NAME_PREFIX} {timestamp:%Y-%m-%d %H:%M:%S %Z}".strip(),
+        'appProperties': {_BACKUP_PROPERTY: file_id}
+    }
+    if folder_id:
+        body['parents'] = [folder_id]
+
+    backup = service.files().copy(
+        fileId=file_id, body=body, fields=_BACKUP_FIELDS, supportsAllDrives=True
+    ).execute()
+
+    # The backup exists at this point - a failed cleanup only leaves extra copies
+    # behind (removed on the next successful prune), so it isn't raised
+    try:
+        prune_backups(service, file_id, keep=keep)
+    except Exception as e:
+        print(f"Could not prune old backups of {file_id}: {e}")
+    return backup
+
+
+def overwrite_backup_sheet(gc, file_id, backup_file_id):
+    """Copy every cell of the main sheet over the single backup sheet (full read + write, in ranged blocks)."""
+    main_data = read_values(gc.open_by_key(file_id).get_worksheet(0))
+
+    backup_worksheet = gc.open_by_key(backup_file_id).get_worksheet(0)
+    write_values(backup_worksheet, main_data)
@@ -0,0 +1,211 @@
+"""
+Benchmark for race/gender and legal problem code standardization.
+Compares the per-row regex .apply() path with the distinct-value engines in
+standardization.py on a synthetic frame. The per-row functions the app used
+before are kept here as the reference implementation.
+
+Usage:
+    python benchmark_standardization.py [n_rows]
+"""
+
+import re
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from standardization import (
+    LEGAL_PROBLEM_CODE_LOOKUP, LEGAL_PROBLEM_FINAL_CLEANUP, LEGAL_PROBLEM_STANDARDIZATION_MAP,
+    get_legal_problem_normalizer, get_standard_mappings, standardize_race, standardize_gender
+)
+
+# Mix of mapped spellings, spellings only the regex catches, and blanks/missing values
+RACE_SPELLINGS = [
+    'White', 'White (Not Hispanic)', 'Caucasian', 'Black or African American', 'AA',
+    'african american', 'Hispanic', 'Latina', 'Asian', 'Native Hawaiian', 'Multi-Racial',
+    'Black and White', 'American Indian', 'Organization/Group', 'Other', '', None
+]
+GENDER_SPELLINGS = [
+    'Female', 'F', 'woman', 'Male', 'M', 'man', 'Trans woman', 'transgender',
+    'Non-Binary', 'genderqueer', "Don't Know", 'Prefer not to say', 'G', '7', '', None
+]
+
+LEGAL_PROBLEM_SPELLINGS = (
+    list(LEGAL_PROBLEM_STANDARDIZATION_MAP) + list(LEGAL_PROBLEM_CODE_LOOKUP.values()) +
+    ['5 Predatory lending', '062 homeownership', 'Custody dispute', 'Unknown problem', None]
+)
+
+
+# --- Legacy per-row standardization (reference) ---
+
+def map_legal_problem_with_regex(problem_code, legal_problem_patterns):
+    """
+    Map legal problem codes to standardized format using multi-tiered approach:
+    1. Direct mapping (fastest)
+    2. Regex patterns (flexible)
+    3. Numeric code fallback (catches unknown variations)
+    """
+    if pd.isna(problem_code):
+        return None
+    
+    # Convert to string and strip whitespace
+    problem_str = str(problem_code).strip()
+    
+    # Extract numeric code at start (e.g., "05", "62") for fallback matching
+    code_match = re.match(r'^\s*0*(\d+)', problem_str)
+    numeric_code = code_match.group(1).zfill(2) if code_match else None
+    
+    # Normalize for case-insensitive matching
+    normalized = problem_str.lower()
+    
+    # Try direct mapping first (most efficient)
+    if normalized in LEGAL_PROBLEM_STANDARDIZATION_MAP:
+        return LEGAL_PROBLEM_STANDARDIZATION_MAP[normalized]
+    
+    # Try regex patterns as fallback for unknown variations
+    for pattern, standardized_code in legal_problem_patterns.items():
+        if re.search(pattern, problem_str, re.IGNORECASE):
+            return standardized_code
+    
+    # Final fallback: match by numeric code alone (catches completely unknown variations)
+    if numeric_code in LEGAL_PROBLEM_CODE_LOOKUP:
+        return LEGAL_PROBLEM_CODE_LOOKUP[numeric_code]
+    
+    # If no match found, return original
+    return problem_code
+
+
+def clean_race_with_regex(race_value):
+    """
+    Clean race values using regex for flexible matching
+    """
+    if pd.isna(race_value) or str(race_value).strip() == '':
+        return 'Other/Unknown'
+    
+    race_str = str(race_value).strip().lower()
+    
+    # White patterns
+    if re.search(r'\b(white|caucasian)\b', race_str):
+        return 'White'
+    
+    # Black patterns
+    if re.search(r'\b(black|african.?american|aa)\b', race_str):
+        return 'Black'
+    
+    # Native American patterns
+    if re.search(r'\b(native|american.?indian|alaska.?native)\b', race_str):
+        return 'Native American'
+    
+    # Asian/Pacific Islander patterns
+    if re.search(r'\b(asian|pacific.?islander|hawaiian)\b', race_str):
+        return 'Asian/Pacific Islander'
+    
+    # Hispanic patterns
+    if re.search(r'\b(hispanic|latino|latina|latinx)\b', race_str):
+        return 'Hispanic'
+    
+    # Multiracial patterns
+    if re.search(r'\b(multi.?racial|multiracial|two.?or.?more)\b', race_str):
+        return 'Multiracial'
+    
+    # Check for "and" which often indicates multiracial
+    if ' and ' in race_str:
+        return 'Multiracial'
+    
+    # Organization/Group
+    if re.search(r'\b(organization|group)\b', race_str):
+        return 'Other/Unknown'
+    
+    return 'Other/Unknown'
+
+def clean_gender_with_regex(gender_value):
+    """
+    Clean gender values using regex for flexible matching
+    """
+    if pd.isna(gender_value) or str(gender_value).strip() == '':
+        return 'Other/Unknown'
+    
+    gender_str = str(gender_value).strip().lower()
+    
+    # Female patterns
+    if re.search(r'^(f|female|woman)$', gender_str):
+        return 'Female'
+    
+    # Male patterns
+    if re.search(r'^(m|male|man)$', gender_str):
+        return 'Male'
+    
+    # Transgender patterns
+    if re.search(r'\b(trans|transgender)\b', gender_str):
+        return 'Transgender'
+    
+    # Non-binary patterns
+    if re.search(r'\b(non.?binary|nonbinary|genderqueer|gender.?non.?conforming)\b', gender_str):
+        return 'Non-binary'
+    
+    # Unknown/Other patterns
+    if re.search(r'\b(don.?t.?know|unknown|prefer.?not|decline|other)\b', gender_str):
+        return 'Other/Unknown'
+    
+    # Single letters or numbers that aren't F or M
+    if re.match(r'^[a-eg-z0-9]$', gender_str):
+        return 'Other/Unknown'
+    
+    return 'Other/Unknown'
+
+
+def legacy_standardize(values, mapping, clean_func):
+    """The per-row path used before the distinct-value engine."""
+    values = values.replace(mapping)
+    return values.apply(lambda x: clean_func(x) if x not in mapping.values() else x)
+
+
+def legacy_normalize_legal_problems(values, legal_problem_mapping):
+    """The per-row legal problem path used before LegalProblemNormalizer."""
+    values = values.apply(lambda x: map_legal_problem_with_regex(x, legal_problem_mapping))
+    return values.replace(LEGAL_PROBLEM_FINAL_CLEANUP)
+
+
+def same_results(legacy, vectorized):
+    """True if both paths give the same label for every row (any missing marker counts as equal)."""
+    both_missing = legacy.isna().to_numpy() & vectorized.isna().to_numpy()
+    return bool((both_missing | (legacy.astype(str) == vectorized.astype(str)).to_numpy()).all())
+
+
+def time_call(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main(n_rows=500_000):
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        'race': rng.choice(np.array(RACE_SPELLINGS, dtype=object), n_rows),
+        'gender': rng.choice(np.array(GENDER_SPELLINGS, dtype=object), n_rows),
+        'legal_problem_code': rng.choice(np.array(LEGAL_PROBLEM_SPELLINGS, dtype=object), n_rows)
+    })
+    _, race_mapping, gender_mapping, legal_problem_mapping = get_standard_mappings()
+
+    print(f"Synthetic frame: {n_rows:,} rows")
+    for column, mapping, clean_func, engine in [
+        ('race', race_mapping, clean_race_with_regex, standardize_race),
+        ('gender', gender_mapping, clean_gender_with_regex, standardize_gender)
+    ]:
+        legacy, legacy_time = time_call(legacy_standardize, df[column], mapping, clean_func)
+        vectorized, vectorized_time = time_call(engine, df[column])
+
+        matches = same_results(legacy, vectorized)
+        print(f"{column:>7}: per-row {legacy_time:7.3f}s | distinct-value {vectorized_time:7.3f}s | "
+              f"speedup {legacy_time / vectorized_time:6.1f}x | identical results: {matches}")
+
+    legacy, legacy_time = time_call(legacy_normalize_legal_problems, df['legal_problem_code'], legal_problem_mapping)
+    vectorized, vectorized_time = time_call(get_legal_problem_normalizer().normalize_series, df['legal_problem_code'])
+    matches = same_results(legacy, vectorized)
+    print(f"{'legal':>7}: per-row {legacy_time:7.3f}s | distinct-value {vectorized_time:7.3f}s | "
+          f"speedup {legacy_time / vectorized_time:6.1f}x | identical results: {matches}")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500_000)
@@ -0,0 +1,221 @@
+"""
+Sidebar filter engine for the TALS Data Explorer.
+Precomputes integer day numbers and category codes once per dataset so each
+rerun builds a single boolean mask instead of copying and re-concatenating frames.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+# Integer value NumPy uses for NaT once datetimes are viewed as int64
+_NAT_DAY = np.iinfo(np.int64).min
+
+
+def _to_day_numbers(values):
+    """Convert a date column to int64 days since the epoch (missing dates -> _NAT_DAY)."""
+    dates = pd.to_datetime(values, errors='coerce')
+    return dates.to_numpy(dtype='datetime64[ns]').astype('datetime64[D]').astype(np.int64)
+
+
+def _to_day_number(date_value):
+    """Convert a single date (from st.date_input) to days since the epoch."""
+    return np.datetime64(date_value, 'D').astype(np.int64)
+
+
+def _day_number_to_date(day_number):
+    return pd.Timestamp(np.datetime64(int(day_number), 'D')).date()
+
+
+def dataset_revision(df):
+    """Return the revision marker load_data() attached to the dataset."""
+    return df.attrs.get('revision')
+
+
+class FilterIndex:
+    """
+    Filter columns for one dataset revision.
+
+    Holds the opened/closed dates as int64 day numbers and the source and
+    county columns as factorized codes, so a filter state turns into one
+    boolean mask with plain NumPy comparisons.
+    """
+
+    def __init__(self, df):
+        self.n_rows = len(df)
+        self.opened_days = _to_day_numbers(df['date_opened'])
+        self.closed_days = _to_day_numbers(df['date_closed'])
+        self.source_codes, self.sources = pd.factorize(df['source'], use_na_sentinel=True)
+        self.county_codes, self.counties = pd.factorize(df['county_dispute'], use_na_sentinel=True)
+
+    def date_bounds(self, column):
+        """Return (min, max) dates for 'date_opened' or 'date_closed', ignoring missing dates."""
+        days = self.opened_days if column == 'date_opened' else self.closed_days
+        valid = days[days != _NAT_DAY]
+        if len(valid) == 0:
+            return None, None
+        return _day_number_to_date(valid.min()), _day_number_to_date(valid.max())
+
+    @staticmethod
+    def _code_mask(codes, categories, selected):
+        """Boolean mask of rows whose category is in selected (missing values never match)."""
+        allowed = np.zeros(len(categories) + 1, dtype=bool)
+        indexer = categories.get_indexer(pd.Index(list(selected)))
+        allowed[indexer[indexer >= 0]] = True
+        # Code -1 (missing) indexes the trailing slot, which stays False
+        return allowed[codes]
+
+    @staticmethod
+    def _date_mask(days, date_range):
+        """Rows inside the inclusive date range; rows with unknown dates are always kept."""
+        if date_range is None or len(date_range) != 2:
+            return None
+        start, end = _to_day_number(date_range[0]), _to_day_number(date_range[1])
+        return (days == _NAT_DAY) | ((days >= start) & (days <= end))
+
+    def mask(self, selected_sources, date_range=None, closed_date_range=None, selected_counties=None):
+        """
+        Build the combined filter mask.
+
+        Parameters:
+        -----------
+        selected_sources : list
+            Organizations to keep
+        date_range, closed_date_range : tuple of datetime.date, optional
+            Inclusive (start, end) ranges; incomplete ranges are ignored
+        selected_counties : list, optional
+            Counties of dispute to keep; empty or None keeps every county
+
+        Returns:
+        --------
+        np.ndarray
+            Boolean mask aligned with the dataset rows
+        """
+        mask = self._code_mask(self.source_codes, self.sources, selected_sources)
+
+        if selected_counties:
+            mask &= self._code_mask(self.county_codes, self.counties, selected_counties)
+
+        for days, selected_range in [(self.opened_days, date_range), (self.closed_days, closed_date_range)]:
+            date_mask = self._date_mask(days, selected_range)
+            if date_mask is not None:
+                mask &= date_mask
+
+        return mask
+
+    def positions(self, *args, **kwargs):
+        """Row positions that pass the filters (a lightweight view tabs can reuse)."""
+        return np.flatnonzero(self.mask(*args, **kwargs))
+
+
+class FilteredRows:
+    """
+    Lazy view of the dataset rows that pass the current filters.
+
+    Holds only the row positions: columns are copied out of the shared dataset the
+    first time a caller asks for them (and reused after that), so a rerun pays only
+    for the columns its charts read. The full frame is taken only for callers that
+    need every column, such as downloads and batch scoring.
+    """
+
+    def __init__(self, df, positions):
+        self._df = df
+        self.positions = positions
+        self._all_rows = len(positions) == len(df)
+        self._columns = {}
+        self._frame = None
+        # Deferred downloads build the frame on another thread
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.positions)
+
+    def _column(self, name):
+        column = self._columns.get(name)
+        if column is None:
+            # With no filters applied, reuse the shared column instead of copying it
+            column = self._df[name] if self._all_rows else self._df[name].take(self.positions)
+            self._columns[name] = column
+        return column
+
+    def columns(self, names):
+        """
+        Return the filtered rows with just the named columns, in the given order.
+        Names that aren't dataset columns are skipped.
+        """
+        names = [name for name in dict.fromkeys(names) if name in self._df.columns]
+        with self._lock:
+            if self._frame is not None:
+                return self._frame[names]
+            return pd.DataFrame({name: self._column(name) for name in names}, copy=False)
+
+    def frame(self):
+        """Return the filtered rows with every column (taken once, on first use)."""
+        with self._lock:
+            if self._frame is None:
+                self._frame = self._df.copy(deep=False) if self._all_rows else self._df.take(self.positions)
+            return self._frame
+
+
+def apply_filters(df, filter_index, *args, **kwargs):
+    """Materialize the filtered dataset once from the combined mask."""
+    return df.take(filter_index.positions(*args, **kwargs))
+
+
+def filter_key(revision, selected_sources, date_range=None, closed_date_range=None, selected_counties=None):
+    """
+    Hash a filter state into a stable cache key.
+
+    Selection order doesn't matter (lists are sorted), so the same filters picked
+    in a different order share one cache entry.
+    """
+    state = (
+        str(revision),
+        tuple(sorted(str(source) for source in selected_sources)),
+        tuple(str(d) for d in (date_range or ())),
+        tuple(str(d) for d in (closed_date_range or ())),
+        tuple(sorted(str(county) for county in (selected_counties or ())))
+    )
+    return hashlib.sha256(repr(state).encode('utf-8')).hexdigest()
+
+
+class FilterResultCache:
+    """
+    Bounded LRU cache of filtered row positions keyed by filter_key().
+
+    Shared across sessions, so the cached position arrays are made read-only.
+    """
+
+    def __init__(self, maxsize=64):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_positions(self, key, compute):
+        """Return cached positions for key, calling compute() and storing the result on a miss."""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+
+        positions = compute()
+        positions.flags.writeable = False
+
+        with self._lock:
+            self._entries[key] = positions
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+        return positions
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
@@ -0,0 +1,119 @@
+"""
+Process-wide pool of authorized Google API clients.
+Builds the service account credentials once and reuses one gspread client and
+per-thread Drive services, so each Sheets/Drive call doesn't pay for a fresh
+token exchange, discovery build and TLS handshake.
+"""
+
+import threading
+
+import google.auth.transport.requests
+import google_auth_httplib2
+import googleapiclient.discovery
+import gspread
+import httplib2
+import requests
+from google.oauth2.service_account import Credentials
+
+SCOPES = [
+    'https://www.googleapis.com/auth/drive',
+    'https://www.googleapis.com/auth/spreadsheets'
+]
+
+# Keep-alive connections kept open per host by the shared Sheets session
+DEFAULT_POOL_MAXSIZE = 16
+
+# Seconds before a network call gives up
+DEFAULT_TIMEOUT = 120
+
+
+class GoogleClientPool:
+    """
+    Authorized gspread and Drive clients shared by every session in the process.
+
+    The Sheets client sits on one keep-alive requests session (safe to share across
+    threads); Drive services are built once per thread because httplib2 connections
+    are not thread-safe. Tokens are refreshed ahead of expiry under a lock, so
+    concurrent callers trigger a single token exchange.
+
+    Parameters:
+    -----------
+    creds_dict : dict, optional
+        Service account info (the google_credentials secret); not needed with a backend
+    scopes : list of str
+        OAuth scopes requested for the credentials
+    backend : object, optional
+        Object with sheets() and drive() methods that serves every client instead
+        of Google (the test suite passes an in-memory fake)
+    pool_maxsize : int
+        Keep-alive connections per host for the Sheets session
+    """
+
+    def __init__(self, creds_dict=None, scopes=SCOPES, backend=None, pool_maxsize=DEFAULT_POOL_MAXSIZE):
+        self.backend = backend
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._sheets = None
+        self.token_refreshes = 0
+
+        if backend is None:
+            if creds_dict is None:
+                raise ValueError("Missing credentials")
+            self.credentials = Credentials.from_service_account_info(creds_dict, scopes=scopes)
+
+            # One keep-alive session for Sheets calls, sized for concurrent reads
+            self._session = google.auth.transport.requests.AuthorizedSession(self.credentials)
+            adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=pool_maxsize)
+            self._session.mount('https://', adapter)
+
+            # Token exchanges reuse their own keep-alive session too
+            self._token_request = google.auth.transport.requests.Request(requests.Session())
+        else:
+            self.credentials = None
+
+    def ensure_token(self):
+        """Refresh the access token if it is missing or about to expire."""
+        if self.backend is not None:
+            return
+        with self._lock:
+            # Credentials.valid already treats tokens close to expiry as invalid
+            if not self.credentials.valid:
+                self.credentials.refresh(self._token_request)
+                self.token_refreshes += 1
+
+    def sheets(self):
+        """Return the shared authorized gspread client."""
+        if self.backend is not None:
+            return self.backend.sheets()
+
+        self.ensure_token()
+        with self._lock:
+            if self._sheets is None:
+                self._sheets = gspread.authorize(self.credentials, session=self._session)
+                self._sheets.set_timeout(DEFAULT_TIMEOUT)
+            return self._sheets
+
+    def open_spreadsheet(self, file_id):
+        """Open a spreadsheet by its Drive file ID."""
+        return self.sheets().open_by_key(file_id)
+
+    def drive(self):
+        """Return this thread's Drive v3 service (built once per thread)."""
+        if self.backend is not None:
+            return self.backend.drive()
+
+        self.ensure_token()
+        service = getattr(self._local, 'drive', None)
+        if service is None:
+            http = google_auth_httplib2.AuthorizedHttp(
+                self.credentials, http=httplib2.Http(timeout=DEFAULT_TIMEOUT)
+            )
+            service = googleapiclient.discovery.build('drive', 'v3', http=http, cache_discovery=False)
+            self._local.drive = service
+        return service
+
+    def close(self):
+        """Close the shared keep-alive session."""
+        if self.backend is None:
+            self._session.close()
+
@@ -0,0 +1,264 @@
+"""
+Raw export ingestion for the Data Upload tab.
+Parses organization XLSX exports and standardizes them to the dataset schema.
+Workbooks are streamed row by row (openpyxl read-only mode) and standardized in
+chunks, and everything works on plain file contents so several files can be
+processed in parallel worker processes during a dataset rebuild.
+"""
+
+import io
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from itertools import chain, islice
+from operator import itemgetter
+
+import numpy as np
+import openpyxl
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+from standardization import get_standard_mappings, standardize_new_data
+
+
+# Rows standardized at a time by the streaming reader
+DEFAULT_CHUNK_ROWS = 20000
+
+HEADER_ERROR = "File appears to have header issues or missing column names"
+
+# Rows searched for the real header row (report titles/blank lines above it are skipped)
+HEADER_SNIFF_ROWS = 10
+
+
+def _clean_mals_case_ids(df):
+    """Clean MALS case IDs by removing the "E" from the 3rd position"""
+    for col in ('Matter/Case ID', 'Case # ID'):
+        if col in df.columns:
+            df[col] = df[col].astype(str).apply(
+                lambda x: x[:2] + x[3:] if len(x) > 3 and x[2] == 'E' else x
+            )
+            break
+    return df
+
+
+def _header_error(headers):
+    """Header validation check - returns an error message, or None if the headers look right"""
+    first_row_headers = pd.Index(headers).astype(str).str.strip()
+    known_headers = get_standard_mappings()[0].keys()
+
+    has_title_row = (
+        (len(first_row_headers) <= 3 and any(first_row_headers.str.len() > 30)) or
+        (first_row_headers.isin(known_headers).sum() < 3)
+    )
+
+    no_valid_columns = first_row_headers.isin(known_headers).sum() == 0
+
+    if has_title_row or no_valid_columns:
+        return HEADER_ERROR
+    return None
+
+
+def _row_headers(row):
+    """Column names for a worksheet row used as the header (blank cells -> 'Unnamed: i', like pandas)."""
+    return [name if name is not None else f"Unnamed: {i}" for i, name in enumerate(row)]
+
+
+def find_header_row(rows):
+    """
+    Return the index of the first row that passes the header validation check,
+    or None if none of the rows looks like the column header row.
+    """
+    for i, row in enumerate(rows):
+        if any(value is not None for value in row) and _header_error(_row_headers(row)) is None:
+            return i
+    return None
+
+
+def sniff_header_row(uploaded_file, max_rows=HEADER_SNIFF_ROWS):
+    """
+    Pre-flight header check that reads only the first max_rows rows of the workbook.
+
+    Returns:
+    --------
+    int or None
+        Offset of the header row (0 when the file starts with it), or None if no
+        header row was found - the file can be rejected without a full read
+    """
+    workbook = openpyxl.load_workbook(uploaded_file, read_only=True, data_only=True)
+    try:
+        leading_rows = list(islice(workbook.worksheets[0].iter_rows(values_only=True), max_rows))
+    finally:
+        workbook.close()
+
+    if hasattr(uploaded_file, 'seek'):
+        uploaded_file.seek(0)
+    return find_header_row(leading_rows)
+
+
+def _concat_chunks(chunks):
+    """Concatenate standardized chunks, merging the per-chunk categories of categorical columns."""
+    combined = pd.concat(chunks, ignore_index=True)
+    for col in chunks[0].columns:
+        if isinstance(chunks[0][col].dtype, pd.CategoricalDtype):
+            combined[col] = union_categoricals([chunk[col] for chunk in chunks], sort_categories=True)
+    return combined
+
+
+def read_excel_standardized(uploaded_file, source, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """
+    Stream the first worksheet of an XLSX export and standardize it chunk by chunk.
+
+    The header row is located within the first HEADER_SNIFF_ROWS rows (so title rows
+    above it are skipped, and files without one fail before any data is read).
+    Only columns named in the column mapping are kept (standardize_new_data() drops
+    the rest anyway), rows are read with openpyxl in read-only mode and every
+    chunk_rows rows are standardized, so the whole workbook is never held in memory.
+
+    Returns: (processed_df, success, error_message)
+    """
+    workbook = openpyxl.load_workbook(uploaded_file, read_only=True, data_only=True)
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+
+        leading_rows = list(islice(rows, HEADER_SNIFF_ROWS))
+        header_index = find_header_row(leading_rows)
+        if header_index is None:
+            return None, False, HEADER_ERROR
+
+        headers = _row_headers(leading_rows[header_index])
+        rows = chain(leading_rows[header_index + 1:], rows)
+
+        # Mapped columns only (first occurrence of a repeated header, like pandas)
+        column_mapping = get_standard_mappings()[0]
+        kept = {}
+        for i, name in enumerate(headers):
+            if name in column_mapping and name not in kept:
+                kept[name] = i
+        names = list(kept)
+        pick = itemgetter(*kept.values())
+
+        def standardize_chunk(chunk_values):
+            chunk = pd.DataFrame(chunk_values, columns=names)
+            # Empty cells come back as None - use NaN like pd.read_excel
+            chunk = chunk.mask(chunk.isna()).infer_objects()
+            if source == 'MALS':
+                chunk = _clean_mals_case_ids(chunk)
+            return standardize_new_data(chunk, source)
+
+        chunks = []
+        chunk_values = []
+        blank_rows = 0
+        for row in rows:
+            if all(value is None for value in row):
+                # Blank rows only count if data follows them (trailing blanks are dropped)
+                blank_rows += 1
+                continue
+            if blank_rows:
+                chunk_values.extend([(None,) * len(names)] * blank_rows)
+                blank_rows = 0
+
+            if len(row) < len(headers):
+                row = row + (None,) * (len(headers) - len(row))
+            chunk_values.append(pick(row))
+
+            if len(chunk_values) >= chunk_rows:
+                chunks.append(standardize_chunk(chunk_values))
+                chunk_values = []
+
+        if chunk_values or not chunks:
+            chunks.append(standardize_chunk(chunk_values))
+
+        return _concat_chunks(chunks), True, None
+    finally:
+        workbook.close()
+
+
+def process_single_file(uploaded_file, source, streaming=True):
+    """
+    Process a single uploaded file with standardization and validation
+
+    uploaded_file can be a file-like object (e.g. a Streamlit UploadedFile) or the file's bytes.
+    streaming=False reads the whole workbook with pd.read_excel before standardizing.
+    Returns: (processed_df, success, error_message)
+    """
+    try:
+        if isinstance(uploaded_file, (bytes, bytearray)):
+            uploaded_file = io.BytesIO(uploaded_file)
+
+        if streaming:
+            return read_excel_standardized(uploaded_file, source)
+
+        # Find the header row from the first few rows before the full read
+        header_index = sniff_header_row(uploaded_file)
+        if header_index is None:
+            return None, False, HEADER_ERROR
+
+        # Read the uploaded file
+        df_new = pd.read_excel(uploaded_file, header=header_index)
+
+        if source == 'MALS':
+            df_new = _clean_mals_case_ids(df_new)
+
+        error_msg = _header_error(df_new.columns)
+        if error_msg:
+            return None, False, error_msg
+
+        # Process data using existing standardization
+        df_processed = standardize_new_data(df_new, source)
+
+        return df_processed, True, None
+
+    except Exception as e:
+        return None, False, str(e)
+
+
+def process_files(files, max_workers=None, on_progress=None):
+    """
+    Process several raw export files, in parallel worker processes when there is more than one.
+
+    Parameters:
+    -----------
+    files : list of (str, bytes, str)
+        (file name, file contents, organization source) for each file
+    max_workers : int, optional
+        Worker processes to use, defaults to one per file up to the CPU count
+        (a single worker processes the files inline)
+    on_progress : callable, optional
+        Called as on_progress(files_done, total_files, file_name, result) on the
+        calling thread each time a file finishes
+
+    Returns:
+    --------
+    list of (processed_df, success, error_message)
+        One result per file, in the same order as files (regardless of finish order)
+    """
+    results = [None] * len(files)
+    max_workers = max_workers or min(len(files), os.cpu_count() or 1)
+
+    # Nothing to parallelize - skip the worker start-up cost
+    if len(files) <= 1 or max_workers <= 1:
+        for i, (name, content, source) in enumerate(files):
+            results[i] = process_single_file(content, source)
+            if on_progress:
+                on_progress(i + 1, len(files), name, results[i])
+        return results
+
+    # Spawned workers start clean instead of forking the (multi-threaded) app server
+    with ProcessPoolExecutor(max_workers=max_workers,
+                             mp_context=multiprocessing.get_context('spawn')) as executor:
+        futures = {
+            executor.submit(process_single_file, content, source): i
+            for i, (name, content, source) in enumerate(files)
+        }
+
+        for files_done, future in enumerate(as_completed(futures), start=1):
+            i = futures[future]
+            try:
+                results[i] = future.result()
+            except Exception as e:
+                # Worker process died (e.g. out of memory) - report it like any other file error
+                results[i] = (None, False, str(e))
+            if on_progress:
+                on_progress(files_done, len(files), files[i][0], results[i])
+
+    return results
@@ -0,0 +1,221 @@
+"""
+Local cache for the prediction model files stored on Google Drive.
+Keeps each joblib file on disk keyed by its Drive file ID and md5Checksum/modifiedTime,
+so process restarts reuse the local copy and only download when the model changes.
+Models are loaded memory-mapped so worker processes share the array pages.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+
+import googleapiclient.http
+import joblib
+
+DEFAULT_MODEL_CACHE_DIR = Path(os.environ.get(
+    'TALS_MODEL_CACHE_DIR', Path(__file__).resolve().parent / '.cache' / 'models'
+))
+
+# Optional stand-in directory holding <file_id>.joblib files, used instead of
+# Google Drive (e.g. for offline testing)
+LOCAL_MODEL_DIR = os.environ.get('TALS_MODEL_DIR')
+
+# Drive metadata fields that identify a model version
+_VERSION_FIELDS = 'md5Checksum,modifiedTime,size'
+
+
+def _model_paths(file_id, cache_dir=None):
+    """Return the (model, metadata) paths used for a given Drive file ID."""
+    cache_dir = Path(cache_dir) if cache_dir is not None else DEFAULT_MODEL_CACHE_DIR
+    return cache_dir / f"{file_id}.joblib", cache_dir / f"{file_id}.json"
+
+
+def _file_md5(path, chunk_size=1024 * 1024):
+    digest = hashlib.md5()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def version_tag(drive_metadata):
+    """Version marker for a Drive file: its md5Checksum, or modifiedTime if Drive has no checksum."""
+    return drive_metadata.get('md5Checksum') or drive_metadata.get('modifiedTime')
+
+
+def local_model_path(file_id, model_dir=None):
+    """
+    Return the stand-in model file for file_id, if a local model directory is configured.
+
+    Returns:
+    --------
+    tuple of (Path, str) or None
+        The model path and a version tag based on its modification time
+    """
+    model_dir = model_dir or LOCAL_MODEL_DIR
+    if not model_dir:
+        return None
+
+    path = Path(model_dir) / f"{file_id}.joblib"
+    if not path.exists():
+        return None
+    return path, f"local-{path.stat().st_mtime_ns}"
+
+
+def cached_model_path(file_id, version, cache_dir=None):
+    """
+    Return the cached model file if it was saved for this version and its checksum still matches.
+    """
+    model_path, meta_path = _model_paths(file_id, cache_dir)
+
+    try:
+        with open(meta_path) as f:
+            metadata = json.load(f)
+
+        if metadata.get('version') != version:
+            return None
+
+        # Catch truncated or modified files before handing them to joblib
+        if metadata.get('md5Checksum') and _file_md5(model_path) != metadata['md5Checksum']:
+            return None
+
+        return model_path
+    except (OSError, ValueError):
+        return None
+
+
+def _cached_version(file_id, cache_dir=None):
+    """Return the version tag saved with the cached model, or None if there is no readable metadata."""
+    _, meta_path = _model_paths(file_id, cache_dir)
+    try:
+        with open(meta_path) as f:
+            return json.load(f).get('version')
+    except (OSError, ValueError):
+        return None
+
+
+def fetch_model_file(service, file_id, cache_dir=None):
+    """
+    Make sure the current version of a Drive model file is on disk.
+
+    Parameters:
+    -----------
+    service : googleapiclient Resource
+        Drive v3 service
+    file_id : str
+        Drive file ID of the joblib model
+    cache_dir : str or Path, optional
+        Directory holding the cached models, defaults to TALS_MODEL_CACHE_DIR or ./.cache/models
+
+    Returns:
+    --------
+    tuple of (Path, str)
+        Path to the local model file and its version tag
+
+    If Drive can't be reached for the version check, a cached copy that still
+    matches its saved checksum is used instead (the error is raised otherwise).
+    """
+    try:
+        drive_metadata = service.files().get(fileId=file_id, fields=_VERSION_FIELDS).execute()
+    except Exception as e:
+        version = _cached_version(file_id, cache_dir)
+        model_path = cached_model_path(file_id, version, cache_dir) if version else None
+        if model_path is None:
+            raise
+        print(f"Could not check the Drive version of model {file_id}, using the cached copy: {e}")
+        return model_path, version
+    version = version_tag(drive_metadata)
+
+    model_path = cached_model_path(file_id, version, cache_dir)
+    if model_path is not None:
+        return model_path, version
+
+    model_path, meta_path = _model_paths(file_id, cache_dir)
+    model_path.parent.mkdir(parents=True, exist_ok=True)
+
+    # Download next to the final path and move it into place once verified
+    fd, tmp_path = tempfile.mkstemp(dir=model_path.parent, prefix=f".{model_path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            request = service.files().get_media(fileId=file_id)
+            downloader = googleapiclient.http.MediaIoBaseDownload(f, request)
+            done = False
+            while done is False:
+                status, done = downloader.next_chunk()
+
+        expected_md5 = drive_metadata.get('md5Checksum')
+        if expected_md5 and _file_md5(tmp_path) != expected_md5:
+            raise ValueError(f"Checksum mismatch downloading model file {file_id}")
+
+        os.replace(tmp_path, model_path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    metadata = {
+        'file_id': file_id,
+        'version': version,
+        'md5Checksum': expected_md5,
+        'modifiedTime': drive_metadata.get('modifiedTime')
+    }
+    try:
+        with open(meta_path, 'w') as f:
+            json.dump(metadata, f)
+    except OSError as e:
+        # The model is still usable; it will just be downloaded again next time
+        print(f"Could not write model cache metadata: {e}")
+
+    return model_path, version
+
+
+def _uncompressed_copy(model_path, cache_dir=None):
+    """
+    Return an uncompressed re-dump of model_path that joblib can memory-map.
+
+    Compressed joblib files can't be memory-mapped, so the model is re-dumped once
+    per version (the copy is refreshed whenever the source file is newer).
+    """
+    cache_dir = Path(cache_dir) if cache_dir is not None else DEFAULT_MODEL_CACHE_DIR
+    mmap_path = cache_dir / f"{Path(model_path).stem}.mmap.joblib"
+
+    if mmap_path.exists() and mmap_path.stat().st_mtime_ns >= Path(model_path).stat().st_mtime_ns:
+        return mmap_path
+
+    model = joblib.load(model_path)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=cache_dir, prefix=f".{mmap_path.name}.", suffix=".tmp")
+    os.close(fd)
+    try:
+        joblib.dump(model, tmp_path, compress=0)
+        os.replace(tmp_path, mmap_path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return mmap_path
+
+
+def load_model(model_path, cache_dir=None):
+    """
+    Load a model file with its NumPy arrays memory-mapped read-only.
+
+    The arrays are backed by the OS page cache, so every Streamlit worker process
+    loading the same model shares one copy instead of holding its own.
+    Falls back to a regular load if the uncompressed copy can't be written or read;
+    an unreadable copy is deleted so the next load writes it again.
+    """
+    mmap_path = None
+    try:
+        mmap_path = _uncompressed_copy(model_path, cache_dir)
+        return joblib.load(mmap_path, mmap_mode='r')
+    except Exception as e:
+        print(f"Could not load memory-mapped model copy: {e}")
+        if mmap_path is not None:
+            try:
+                os.remove(mmap_path)
+            except OSError:
+                pass
+    return joblib.load(model_path)
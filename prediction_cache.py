@@ -0,0 +1,99 @@
+"""
+Prediction result cache for the DV Risk and Case Time predictor tabs.
+Staff often resubmit the same intake form while trying "what if" variations,
+so identical profiles are answered from memory instead of re-running the
+preprocessing and the sklearn pipeline.
+"""
+
+import hashlib
+import numbers
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+
+def model_version(model):
+    """
+    Identify a loaded model for cache keys.
+    Uses the version tag set when the model was loaded, falling back to the object
+    identity (models are loaded once per process with st.cache_resource).
+    """
+    version = getattr(model, 'tals_version', None)
+    return str(version) if version is not None else f"id-{id(model)}"
+
+
+def _canonical_value(value):
+    """Normalize a form value so equal inputs hash the same (35 == 35.0 == np.int64(35))."""
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, bool):
+        return ('bool', value)
+    if isinstance(value, numbers.Number):
+        return ('number', repr(float(value)))
+    if value is None:
+        return ('none', '')
+    return ('str', str(value))
+
+
+def prediction_key(predictor, client_data, model):
+    """
+    Hash a predictor name, the client_data dict and the model version into a cache key.
+    Field order doesn't matter.
+    """
+    state = (
+        predictor,
+        model_version(model),
+        tuple(sorted((str(field), _canonical_value(value)) for field, value in client_data.items()))
+    )
+    return hashlib.sha256(repr(state).encode('utf-8')).hexdigest()
+
+
+class PredictionCache:
+    """
+    Bounded LRU cache of prediction results keyed by prediction_key().
+
+    Shared across sessions; callers only put() successful results.
+    """
+
+    def __init__(self, maxsize=512):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        """Return the cached result for key, or None on a miss."""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, key, result):
+        with self._lock:
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def stats(self):
+        """Hit/miss counters for the admin view."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'entries': len(self._entries),
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
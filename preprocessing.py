@@ -6,8 +6,59 @@ Contains functions for both domestic violence risk prediction and case time pred
 import pandas as pd
 import numpy as np
 
+# Rows sent to the model per predict call in batch mode
+DEFAULT_PREDICTION_CHUNK_SIZE = 5000
+
+# --- Batch Input Helpers ---
+
+def prepare_model_input(df, columns, numeric_columns=()):
+    """
+    Select a model's raw input columns from a caseload DataFrame.
+    
+    Missing columns are added as NaN, numeric columns are coerced to numbers and
+    categorical columns are converted to plain objects (as in a hand-entered row).
+    """
+    data = df.reindex(columns=columns)
+    for col in columns:
+        if col in numeric_columns:
+            data[col] = pd.to_numeric(data[col], errors='coerce')
+        elif isinstance(data[col].dtype, pd.CategoricalDtype):
+            data[col] = data[col].astype(object)
+    return data
+
+def predict_in_chunks(predict, data, chunk_size=DEFAULT_PREDICTION_CHUNK_SIZE):
+    """Call predict on consecutive row chunks of data and join the results."""
+    if len(data) == 0:
+        return np.array([])
+    return np.concatenate([
+        predict(data.iloc[start:start + chunk_size])
+        for start in range(0, len(data), chunk_size)
+    ])
+
 # --- Domestic Violence Model Functions ---
 
+# Raw intake fields the DV model pipeline reads (same as the DV Risk Predictor form)
+DV_INPUT_COLUMNS = [
+    'age_intake', 'household_total', 'household_adults', 'household_children',
+    'poverty_pct', 'adj_poverty_pct', 'zip_code', 'gender', 'race', 'disabled',
+    'veteran', 'county_residence', 'county_dispute', 'living_arrangement',
+    'source', 'citizenship', 'language'
+]
+
+DV_NUMERIC_COLUMNS = [
+    'age_intake', 'household_total', 'household_adults', 'household_children',
+    'poverty_pct', 'adj_poverty_pct', 'zip_code'
+]
+
+# Upper bounds (exclusive) of the Low and Medium risk levels
+RISK_LEVEL_BINS = [0.4, 0.7]
+RISK_LEVELS = ["Low", "Medium", "High"]
+RISK_RECOMMENDATIONS = {
+    "Low": "Standard intake process. Low probability of domestic violence based on intake data.",
+    "Medium": "Consider additional screening questions during intake. Some risk factors present.",
+    "High": "Case shows risk factors similar to past DV cases. Recommend additional screening and consider connecting to resources."
+}
+
 def preprocess_client_data(client_data):
     """
     Prepares client data for domestic violence risk prediction.
@@ -45,24 +96,131 @@ def interpret_risk_score(risk_score):
     """
     Updated thresholds for ROC AUC optimized model
     """
-    if risk_score < 0.4:  # Adjusted for ROC AUC model
+    if risk_score < RISK_LEVEL_BINS[0]:  # Adjusted for ROC AUC model
         risk_level = "Low"
-        recommendation = "Standard intake process. Low probability of domestic violence based on intake data."
-    elif risk_score < 0.7:  # Adjusted middle range  
+    elif risk_score < RISK_LEVEL_BINS[1]:  # Adjusted middle range  
         risk_level = "Medium"
-        recommendation = "Consider additional screening questions during intake. Some risk factors present."
     else:
         risk_level = "High"
-        recommendation = "Case shows risk factors similar to past DV cases. Recommend additional screening and consider connecting to resources."
     
     return {
         'risk_score': risk_score,
         'risk_level': risk_level,
-        'recommendation': recommendation
+        'recommendation': RISK_RECOMMENDATIONS[risk_level]
     }
 
+def interpret_risk_scores(risk_scores, index=None):
+    """
+    Vectorized interpret_risk_score for a batch of scores.
+    
+    Returns:
+    --------
+    pd.DataFrame
+        risk_score, risk_level and recommendation columns, one row per score
+    """
+    risk_scores = np.asarray(risk_scores, dtype=float)
+    risk_levels = np.array(RISK_LEVELS, dtype=object)[np.digitize(risk_scores, RISK_LEVEL_BINS)]
+    
+    return pd.DataFrame({
+        'risk_score': risk_scores,
+        'risk_level': pd.Categorical(risk_levels, categories=RISK_LEVELS, ordered=True),
+        'recommendation': pd.Series(risk_levels).map(RISK_RECOMMENDATIONS).to_numpy()
+    }, index=index)
+
+def predict_dv_risk_batch(df, model, chunk_size=DEFAULT_PREDICTION_CHUNK_SIZE):
+    """
+    Scores a whole caseload for domestic violence risk.
+    
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        One row per client/case, using the dataset's column names
+    model : fitted pipeline
+        DV model with predict_proba
+    chunk_size : int
+        Rows passed to predict_proba per call
+    
+    Returns:
+    --------
+    pd.DataFrame
+        risk_score, risk_level and recommendation aligned with df's index
+    """
+    processed_data = preprocess_client_data(prepare_model_input(df, DV_INPUT_COLUMNS, DV_NUMERIC_COLUMNS))
+    
+    risk_scores = predict_in_chunks(lambda chunk: model.predict_proba(chunk)[:, 1], processed_data, chunk_size)
+    
+    return interpret_risk_scores(risk_scores, index=df.index)
+
 # --- Case Time Prediction Functions ---
 
+# Raw intake fields the case time model is trained on (same as the Case Time Predictor form)
+CASE_TIME_INPUT_COLUMNS = [
+    'age_intake', 'household_total', 'household_adults', 'household_children',
+    'poverty_pct', 'adj_poverty_pct', 'gender', 'race', 'disabled', 'veteran',
+    'county_residence', 'county_dispute', 'living_arrangement', 'source', 'legal_problem_code'
+]
+
+CASE_TIME_NUMERIC_COLUMNS = [
+    'age_intake', 'household_total', 'household_adults', 'household_children',
+    'poverty_pct', 'adj_poverty_pct'
+]
+
+# Upper bounds (exclusive, in hours) of the Brief Service and Moderate Complexity categories
+CASE_TIME_BINS = [3, 10]
+COMPLEXITY_CATEGORIES = ["Brief Service", "Moderate Complexity", "High Complexity"]
+RESOURCE_ALLOCATIONS = {
+    "Brief Service": "This case is likely to require minimal resources.",
+    "Moderate Complexity": "This case will require moderate resources.",
+    "High Complexity": "This case is likely to require significant resources."
+}
+
+# Legal problem groups by the code's leading digit (exactly as in training).
+# Training checked '0'/'1' before the education prefixes (12, 13, 14, 16, 19),
+# so education codes fall under consumer_finance - kept so features match the model.
+LEGAL_GROUP_BY_LEADING_DIGIT = {
+    '0': 'consumer_finance',  # 01-09: Bankruptcy, Collections, Contracts, etc.
+    '1': 'consumer_finance',  # 12-19: Education issues (shadowed, see above)
+    '2': 'employment',        # 21-29: Employment and tax issues
+    '3': 'family',            # 30-39: Family law matters
+    '4': 'juvenile',          # 41-49: Juvenile issues
+    '5': 'health',            # 51-59: Health and medical
+    '6': 'housing',           # 61-69: Housing and real estate
+    '7': 'income_benefits',   # 71-79: Government benefits
+    '8': 'civil_rights',      # 81-89: Individual rights and civil matters
+    '9': 'miscellaneous'      # 93-99: Licenses, estates, torts, etc.
+}
+
+# Display names used by the Case Time Predictor tab
+LEGAL_GROUP_LABELS = {
+    'consumer_finance': 'Consumer/Finance',
+    'employment': 'Employment',
+    'family': 'Family Law',
+    'juvenile': 'Juvenile',
+    'health': 'Health',
+    'housing': 'Housing',
+    'income_benefits': 'Income/Benefits',
+    'civil_rights': 'Civil Rights',
+    'miscellaneous': 'Miscellaneous',
+    'other': 'Other',
+    'unknown': 'Other'
+}
+
+def group_legal_code(code):
+    """Legal problem group for a single code ('unknown' if missing, 'other' if not numbered)."""
+    if pd.isna(code):
+        return 'unknown'
+    return LEGAL_GROUP_BY_LEADING_DIGIT.get(str(code).strip()[:1], 'other')
+
+def group_legal_codes(codes):
+    """
+    Vectorized group_legal_code - each distinct code is looked up once and
+    broadcast back through the factorized codes.
+    """
+    code_indices, unique_codes = pd.factorize(codes)
+    # Trailing slot covers missing codes (index -1)
+    groups = np.array([group_legal_code(code) for code in unique_codes] + ['unknown'], dtype=object)
+    return pd.Series(groups[code_indices], index=codes.index, name='legal_problem_group')
+
 def engineer_case_time_features(df):
     """
     Apply the exact same feature engineering as used in model training.
@@ -109,35 +267,6 @@ def engineer_case_time_features(df):
         data['county_dispute'].fillna('unknown')
     ).astype(int)
     
-    # Group legal problem codes by major categories (exactly as in training)
-    def group_legal_codes(code):
-        if pd.isna(code):
-            return 'unknown'
-        code_str = str(code).strip()
-        
-        # Extract numeric prefix to determine category
-        if code_str.startswith('0') or code_str.startswith('1'):
-            return 'consumer_finance'  # 01-09: Bankruptcy, Collections, Contracts, etc.
-        elif code_str.startswith('12') or code_str.startswith('13') or code_str.startswith('14') or code_str.startswith('16') or code_str.startswith('19'):
-            return 'education'  # 12-19: Education issues
-        elif code_str.startswith('2'):
-            return 'employment'  # 21-29: Employment and tax issues
-        elif code_str.startswith('3'):
-            return 'family'  # 30-39: Family law matters
-        elif code_str.startswith('4'):
-            return 'juvenile'  # 41-49: Juvenile issues
-        elif code_str.startswith('5'):
-            return 'health'  # 51-59: Health and medical
-        elif code_str.startswith('6'):
-            return 'housing'  # 61-69: Housing and real estate
-        elif code_str.startswith('7'):
-            return 'income_benefits'  # 71-79: Government benefits
-        elif code_str.startswith('8'):
-            return 'civil_rights'  # 81-89: Individual rights and civil matters
-        elif code_str.startswith('9'):
-            return 'miscellaneous'  # 93-99: Licenses, estates, torts, etc.
-        else:
-            return 'other'
     
     # Additional interaction features for better predictions
     data['age_poverty_interaction'] = data['age_intake'] * data['poverty_pct'] / 100
@@ -148,7 +277,7 @@ def engineer_case_time_features(df):
     data['elderly_case'] = (data['age_intake'] >= 65).astype(int)
     data['large_household'] = (data['household_total'] >= 5).astype(int)
     
-    data['legal_problem_group'] = data['legal_problem_code'].apply(group_legal_codes)
+    data['legal_problem_group'] = group_legal_codes(data['legal_problem_code'])
     
     # Replace any remaining inf/nan values in engineered features
     # Use scalar fallbacks instead of .median() for single-row compatibility
@@ -245,22 +374,68 @@ def interpret_case_time(predicted_time):
     # Round to 1 decimal place for cleaner display
     hours = round(predicted_time, 1)
     
-    if hours < 3:
+    if hours < CASE_TIME_BINS[0]:
         category = "Brief Service"
-        allocation = "This case is likely to require minimal resources."
-    elif hours < 10:
+    elif hours < CASE_TIME_BINS[1]:
         category = "Moderate Complexity"
-        allocation = "This case will require moderate resources."
     else:
         category = "High Complexity"
-        allocation = "This case is likely to require significant resources."
     
     return {
         'predicted_hours': hours,
         'complexity_category': category,
-        'resource_allocation': allocation
+        'resource_allocation': RESOURCE_ALLOCATIONS[category]
     }
 
+def interpret_case_times(predicted_times, index=None):
+    """
+    Vectorized interpret_case_time for a batch of predictions.
+    
+    Hours are rounded to 1 decimal place before binning, as in interpret_case_time.
+    
+    Returns:
+    --------
+    pd.DataFrame
+        predicted_hours, complexity_category and resource_allocation columns
+    """
+    hours = np.round(np.asarray(predicted_times, dtype=float), 1)
+    categories = np.array(COMPLEXITY_CATEGORIES, dtype=object)[np.digitize(hours, CASE_TIME_BINS)]
+    
+    return pd.DataFrame({
+        'predicted_hours': hours,
+        'complexity_category': pd.Categorical(categories, categories=COMPLEXITY_CATEGORIES, ordered=True),
+        'resource_allocation': pd.Series(categories).map(RESOURCE_ALLOCATIONS).to_numpy()
+    }, index=index)
+
+def predict_case_time_batch(df, model, chunk_size=DEFAULT_PREDICTION_CHUNK_SIZE):
+    """
+    Predicts case time for a whole caseload.
+    
+    Features are engineered once for the whole frame and the model is called
+    on chunks of chunk_size rows.
+    
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        One row per case, using the dataset's column names
+    model : fitted pipeline
+        Case time model with predict
+    chunk_size : int
+        Rows passed to model.predict per call
+    
+    Returns:
+    --------
+    pd.DataFrame
+        predicted_hours, complexity_category and resource_allocation aligned with df's index
+    """
+    processed_data = preprocess_case_time_data(
+        prepare_model_input(df, CASE_TIME_INPUT_COLUMNS, CASE_TIME_NUMERIC_COLUMNS)
+    )
+    
+    predicted_times = predict_in_chunks(model.predict, processed_data, chunk_size)
+    
+    return interpret_case_times(predicted_times, index=df.index)
+
 # --- Prediction Functions ---
 
 def predict_domestic_violence_risk(client_data):
@@ -0,0 +1,397 @@
+"""
+Google Sheets read/write helpers for the TALS dataset.
+Keeps request sizes bounded and retries transient API failures so large
+uploads don't fail as a single giant request. Full reads and rewrites are
+split into row ranges that run with bounded concurrency and report progress.
+"""
+
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import requests
+from gspread.exceptions import APIError
+from gspread.utils import fill_gaps, rowcol_to_a1
+
+# HTTP status codes worth retrying (rate limiting and transient server errors)
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+DEFAULT_APPEND_CHUNK_SIZE = 2000
+
+# Rows per ranged read/write request (keeps payloads well under the API limits)
+DEFAULT_READ_BLOCK_ROWS = 5000
+DEFAULT_WRITE_BLOCK_ROWS = 2000
+
+# Ranged requests in flight at once - enough to overlap latency without
+# burning through the per-minute request quota
+DEFAULT_MAX_CONCURRENCY = 4
+
+# Upper bound for a single backoff sleep, in seconds
+MAX_RETRY_DELAY = 64.0
+
+# Retries per ranged block - enough backoff to wait out a full per-minute quota window
+DEFAULT_BLOCK_RETRIES = 8
+
+
+def is_retryable_error(error):
+    """Return True if the error is a transient API or network failure."""
+    if isinstance(error, APIError):
+        return error.code in RETRYABLE_STATUS_CODES
+    return isinstance(error, (requests.exceptions.ConnectionError, requests.exceptions.Timeout))
+
+
+def is_quota_error(error):
+    """Return True if the request was rejected by rate limiting (429), so it was never applied."""
+    return isinstance(error, APIError) and error.code == 429
+
+
+def retry_delay(attempt, base_delay=1.0, max_delay=MAX_RETRY_DELAY):
+    """
+    Backoff before retry number attempt + 1: exponential, capped, with jitter.
+    Half the delay is fixed and half random, so parallel requests that hit the
+    quota together don't all retry at the same moment.
+    """
+    delay = min(max_delay, base_delay * (2 ** attempt))
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+def call_with_retry(func, *args, max_retries=5, base_delay=1.0, retryable=is_retryable_error, **kwargs):
+    """
+    Call func, retrying transient failures with jittered exponential backoff.
+    Non-retryable errors and the final failed attempt are re-raised.
+
+    Pass retryable=is_quota_error for calls that aren't safe to repeat, so they
+    are only retried when the API provably rejected them.
+    """
+    for attempt in range(max_retries + 1):
+        try:
+            return func(*args, **kwargs)
+        except Exception as e:
+            if attempt == max_retries or not retryable(e):
+                raise
+            time.sleep(retry_delay(attempt, base_delay))
+
+
+def dataframe_to_rows(df):
+    """Convert a DataFrame to sheet rows - all strings to avoid formatting issues."""
+    return df.astype(str).values.tolist()
+
+
+def _key_column(rows):
+    """1-based index of the first column that is non-empty in every row, or None."""
+    width = min((len(row) for row in rows), default=0)
+    for col in range(width):
+        if all(row[col] != '' for row in rows):
+            return col + 1
+    return None
+
+
+def append_rows_once(worksheet, rows, max_retries=5, base_delay=1.0):
+    """
+    Append rows to the end of the worksheet without ever writing them twice.
+
+    Appends aren't idempotent: after a timeout, dropped connection or 5xx the
+    rows may have landed even though the response was lost. 429 rejections are
+    retried directly; for the other transient failures a key column (one that
+    every appended row fills) is re-read, and the rows are only sent again if
+    it didn't grow. Without such a column only 429s are retried.
+    """
+    key_column = _key_column(rows)
+    rows_before = None
+    if key_column is not None:
+        rows_before = len(call_with_retry(worksheet.col_values, key_column, max_retries=max_retries))
+
+    for attempt in range(max_retries + 1):
+        try:
+            return worksheet.append_rows(rows, value_input_option='RAW', table_range='A1')
+        except Exception as e:
+            retryable = is_quota_error(e) or (key_column is not None and is_retryable_error(e))
+            if attempt == max_retries or not retryable:
+                raise
+            time.sleep(retry_delay(attempt, base_delay))
+
+            if not is_quota_error(e):
+                rows_after = len(call_with_retry(worksheet.col_values, key_column, max_retries=max_retries))
+                if rows_after > rows_before:
+                    # The append went through - its response was lost
+                    return None
+
+
+def append_dataframe(worksheet, df, chunk_size=DEFAULT_APPEND_CHUNK_SIZE, max_retries=5):
+    """
+    Append only the rows of df to the end of the worksheet.
+
+    Parameters:
+    -----------
+    worksheet : gspread.Worksheet
+        Target worksheet, whose first row holds the column headers
+    df : pd.DataFrame
+        New rows to append
+    chunk_size : int
+        Number of rows sent per append request
+    max_retries : int
+        Retries per chunk for rate limits and transient server errors
+        (see append_rows_once() - a chunk is never appended twice)
+
+    Returns:
+    --------
+    int
+        Number of rows appended
+    """
+    header = call_with_retry(worksheet.row_values, 1, max_retries=max_retries)
+
+    if not header:
+        # Empty sheet - start the table with the DataFrame's own columns
+        header = df.columns.tolist()
+        append_rows_once(worksheet, [header], max_retries=max_retries)
+
+    unknown_columns = [col for col in df.columns if col not in header]
+    if unknown_columns:
+        raise ValueError(
+            f"Columns not present in the sheet: {', '.join(unknown_columns)}. "
+            "Use a full rewrite to change the sheet layout."
+        )
+
+    # Match the sheet's column order; columns the upload lacks are written as 'nan'
+    # exactly like the full rewrite does
+    rows = dataframe_to_rows(df.reindex(columns=header))
+
+    for start in range(0, len(rows), chunk_size):
+        append_rows_once(worksheet, rows[start:start + chunk_size], max_retries=max_retries)
+
+    return len(rows)
+
+
+def row_blocks(first_row, last_row, block_rows):
+    """Split the 1-based inclusive row span [first_row, last_row] into (start, end) blocks."""
+    return [
+        (start, min(start + block_rows - 1, last_row))
+        for start in range(first_row, last_row + 1, block_rows)
+    ]
+
+
+def block_range(start_row, end_row, n_cols):
+    """A1 range covering rows start_row..end_row of the first n_cols columns."""
+    return f"A{start_row}:{rowcol_to_a1(end_row, max(n_cols, 1))}"
+
+
+def run_blocks(func, blocks, max_workers=DEFAULT_MAX_CONCURRENCY, on_progress=None):
+    """
+    Run func(start_row, end_row) for each row block with at most max_workers in flight.
+
+    on_progress(rows_done, total_rows) is called on the calling thread as blocks finish.
+    Returns the results in block order. The first failure is re-raised once the
+    blocks already running have finished.
+    """
+    results = [None] * len(blocks)
+    total_rows = sum(end - start + 1 for start, end in blocks)
+    rows_done = 0
+
+    if max_workers <= 1 or len(blocks) <= 1:
+        for i, (start, end) in enumerate(blocks):
+            results[i] = func(start, end)
+            rows_done += end - start + 1
+            if on_progress:
+                on_progress(rows_done, total_rows)
+        return results
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="sheets-io") as executor:
+        futures = {executor.submit(func, start, end): i for i, (start, end) in enumerate(blocks)}
+        try:
+            for future in as_completed(futures):
+                i = futures[future]
+                results[i] = future.result()
+                start, end = blocks[i]
+                rows_done += end - start + 1
+                if on_progress:
+                    on_progress(rows_done, total_rows)
+        except Exception:
+            for future in futures:
+                future.cancel()
+            raise
+
+    return results
+
+
+def read_blocks(worksheet, parse_block=None, first_row=1, block_rows=DEFAULT_READ_BLOCK_ROWS,
+                max_workers=DEFAULT_MAX_CONCURRENCY, on_progress=None, max_retries=DEFAULT_BLOCK_RETRIES):
+    """
+    Read the worksheet from first_row down in row ranges, fetched concurrently.
+
+    Each block's rows are handed to parse_block(values) on the worker thread as soon
+    as they arrive, so parsing one block overlaps the download of the others.
+
+    Parameters:
+    -----------
+    worksheet : gspread.Worksheet
+        Sheet to read; its row_count/col_count (grid size) bound the ranges
+    parse_block : callable, optional
+        Called with the block's rows (one list per sheet row, blank rows included);
+        defaults to returning the rows unchanged
+    first_row : int
+        1-based sheet row to start from (e.g. 2 to skip the header row)
+    block_rows : int
+        Rows fetched per request
+    max_workers : int
+        Requests in flight at once
+    on_progress : callable, optional
+        Called as on_progress(rows_done, total_rows) as blocks arrive
+    max_retries : int
+        Retries per block for rate limits and transient server errors
+
+    Returns:
+    --------
+    list of (object, int)
+        parse_block's result for each block, in sheet order, and the number of the
+        block's rows up to its last non-empty one (0 for an empty block)
+    """
+    last_row = max(worksheet.row_count, first_row)
+    blocks = row_blocks(first_row, last_row, block_rows)
+    n_cols = worksheet.col_count
+
+    def read_block(start, end):
+        values = call_with_retry(worksheet.get_values, block_range(start, end, n_cols),
+                                 pad_values=False, max_retries=max_retries)
+        # gspread returns [[]] for an empty range, so count rows up to the last non-empty one
+        while values and not any(values[-1]):
+            values.pop()
+        n_data_rows = len(values)
+        # The API drops a range's trailing empty rows - restore them so the
+        # next block's rows stay at the right positions
+        values = values + [[] for _ in range(end - start + 1 - n_data_rows)]
+        return (parse_block(values) if parse_block else values), n_data_rows
+
+    return run_blocks(read_block, blocks, max_workers, on_progress)
+
+
+def data_row_count(blocks, block_rows=DEFAULT_READ_BLOCK_ROWS):
+    """Rows read by read_blocks() up to the sheet's last non-empty row (trailing empty rows excluded)."""
+    for i in range(len(blocks) - 1, -1, -1):
+        if blocks[i][1]:
+            return i * block_rows + blocks[i][1]
+    return 0
+
+
+def read_values(worksheet, block_rows=DEFAULT_READ_BLOCK_ROWS, max_workers=DEFAULT_MAX_CONCURRENCY,
+                on_progress=None, max_retries=DEFAULT_BLOCK_RETRIES):
+    """
+    Read every cell of the worksheet in row ranges, like worksheet.get_all_values().
+    Parameters match read_blocks().
+
+    Returns:
+    --------
+    list of list of str
+        Rows padded to the same width, trailing empty rows dropped
+    """
+    blocks = read_blocks(worksheet, block_rows=block_rows, max_workers=max_workers,
+                         on_progress=on_progress, max_retries=max_retries)
+    values = [row for block, _ in blocks for row in block]
+    return fill_gaps(values[:data_row_count(blocks, block_rows)])
+
+
+def _remove_staging_worksheet(spreadsheet, staging):
+    """Best-effort removal of an abandoned staging worksheet."""
+    try:
+        spreadsheet.del_worksheet(staging)
+    except Exception as e:
+        print(f"Could not remove staging worksheet '{staging.title}': {e}")
+
+
+def _swap_in_staging_worksheet(worksheet, payloads, blocks, n_rows, n_cols, max_workers,
+                               on_progress, max_retries):
+    """
+    Write the blocks to a new staging worksheet, then swap it in for worksheet.
+
+    One atomic batch update deletes the old worksheet and gives the staging one
+    its title and position. Any failure before the swap leaves the original
+    worksheet untouched (the staging sheet is removed).
+    """
+    spreadsheet = worksheet.spreadsheet
+    staging = call_with_retry(
+        spreadsheet.add_worksheet, title=f"{worksheet.title} (staging {time.time_ns()})",
+        rows=n_rows, cols=n_cols, max_retries=max_retries, retryable=is_quota_error
+    )
+
+    def write_block(start, end):
+        range_name, rows = payloads[(start, end)]
+        call_with_retry(staging.update, rows, range_name=range_name, max_retries=max_retries)
+
+    try:
+        run_blocks(write_block, blocks, max_workers, on_progress)
+    except Exception:
+        _remove_staging_worksheet(spreadsheet, staging)
+        raise
+
+    try:
+        call_with_retry(spreadsheet.batch_update, {'requests': [
+            {'deleteSheet': {'sheetId': worksheet.id}},
+            {'updateSheetProperties': {
+                'properties': {'sheetId': staging.id, 'index': worksheet.index, 'title': worksheet.title},
+                'fields': 'index,title'
+            }}
+        ]}, max_retries=max_retries, retryable=is_quota_error)
+    except Exception as swap_error:
+        # The response may have been lost after the swap was applied - check before cleaning up
+        try:
+            swapped = worksheet.id not in {sheet.id for sheet in spreadsheet.worksheets()}
+        except Exception:
+            # Can't tell whether the staging sheet is now the live one, so leave it in place
+            raise swap_error
+        if not swapped:
+            _remove_staging_worksheet(spreadsheet, staging)
+            raise
+
+
+def write_values(worksheet, values, block_rows=DEFAULT_WRITE_BLOCK_ROWS, max_workers=DEFAULT_MAX_CONCURRENCY,
+                 on_progress=None, max_retries=DEFAULT_BLOCK_RETRIES, atomic=False):
+    """
+    Replace the whole worksheet with values, written in row ranges.
+
+    By default the worksheet is rewritten in place: it is cleared and resized to
+    fit (ranged writes can't go past the grid), then the blocks are written with
+    bounded concurrency. The sheet keeps its ID, formatting, protections and
+    filter views, but a failed write leaves it partly written.
+
+    With atomic=True the rows go to a staging worksheet that is swapped in only
+    once complete, so a failure leaves the original untouched. The swap replaces
+    the worksheet: its sheet ID (gid) changes and its formatting, protections,
+    filter views and validation rules are not carried over.
+
+    Other parameters match read_values(); returns the number of rows written.
+    """
+    n_rows = max(len(values), 1)
+    n_cols = max((len(row) for row in values), default=1)
+
+    # Build every block before touching the spreadsheet
+    blocks = row_blocks(1, len(values), block_rows)
+    payloads = {
+        (start, end): (block_range(start, end, n_cols), [list(row) for row in values[start - 1:end]])
+        for start, end in blocks
+    }
+
+    if atomic:
+        _swap_in_staging_worksheet(worksheet, payloads, blocks, n_rows, n_cols, max_workers,
+                                   on_progress, max_retries)
+        return len(values)
+
+    call_with_retry(worksheet.clear, max_retries=max_retries)
+    call_with_retry(worksheet.resize, rows=n_rows, cols=n_cols, max_retries=max_retries)
+
+    def write_block(start, end):
+        range_name, rows = payloads[(start, end)]
+        # Rewriting the same range is idempotent, so every transient failure is retried
+        call_with_retry(worksheet.update, rows, range_name=range_name, max_retries=max_retries)
+
+    run_blocks(write_block, blocks, max_workers, on_progress)
+    return len(values)
+
+
+def rewrite_dataframe(worksheet, df, on_progress=None, **kwargs):
+    """
+    Replace the whole worksheet with df (headers first, then data rows).
+    Written in ranged blocks by write_values(); extra keyword arguments are passed on.
+    """
+    data_to_upload = [df.columns.tolist()]
+    data_to_upload.extend(dataframe_to_rows(df))
+
+    return write_values(worksheet, data_to_upload, on_progress=on_progress, **kwargs)
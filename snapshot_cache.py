@@ -0,0 +1,116 @@
+"""
+Local snapshot cache for the TALS dataset.
+Keeps the typed, standardized DataFrame on disk as an Arrow (Feather) file keyed by
+the Google Sheet's last modified time, so warm starts can skip the full Sheets download.
+"""
+
+import json
+import os
+import tempfile
+from pathlib import Path
+
+import pyarrow.feather as feather
+
+# Bump whenever the columns or dtypes produced by load_data() change so that
+# snapshots written by an older version of the app are ignored
+SNAPSHOT_SCHEMA_VERSION = 2
+
+DEFAULT_CACHE_DIR = Path(os.environ.get('TALS_CACHE_DIR', Path(__file__).resolve().parent / '.cache'))
+
+
+def _snapshot_paths(file_id, cache_dir=None):
+    """Return the (data, metadata) paths used for a given sheet file ID."""
+    cache_dir = Path(cache_dir) if cache_dir is not None else DEFAULT_CACHE_DIR
+    return cache_dir / f"{file_id}.feather", cache_dir / f"{file_id}.json"
+
+
+def _atomic_write(path, write_func):
+    """Write to a temporary file next to path and move it into place in one step."""
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    os.close(fd)
+    try:
+        write_func(tmp_path)
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def load_snapshot(file_id, revision, cache_dir=None):
+    """
+    Load the cached dataset if it was saved for the given sheet revision.
+
+    Parameters:
+    -----------
+    file_id : str
+        Google Sheets file ID the snapshot was taken from
+    revision : str
+        Remote revision marker (the sheet's modifiedTime)
+    cache_dir : str or Path, optional
+        Directory holding the snapshots, defaults to TALS_CACHE_DIR or ./.cache
+
+    Returns:
+    --------
+    pd.DataFrame or None
+        The cached DataFrame, or None if there is no usable snapshot
+    """
+    if not revision:
+        return None
+
+    data_path, meta_path = _snapshot_paths(file_id, cache_dir)
+
+    try:
+        with open(meta_path) as f:
+            metadata = json.load(f)
+
+        if (metadata.get('revision') != revision or
+                metadata.get('schema_version') != SNAPSHOT_SCHEMA_VERSION):
+            return None
+
+        # Memory-mapping only saves I/O (the file is read straight from the page cache);
+        # to_pandas() still copies every column into pandas-owned memory
+        table = feather.read_table(data_path, memory_map=True)
+        return table.to_pandas()
+    except (OSError, ValueError):
+        # Missing, partial or corrupt snapshot - fall back to the remote sheet
+        return None
+
+
+def save_snapshot(df, file_id, revision, cache_dir=None):
+    """
+    Save the typed dataset for the given sheet revision.
+
+    Returns:
+    --------
+    bool
+        True if the snapshot was written, False otherwise
+    """
+    if not revision:
+        return False
+
+    data_path, meta_path = _snapshot_paths(file_id, cache_dir)
+
+    try:
+        data_path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Uncompressed so the load reads the mapped file without a decompression pass
+        _atomic_write(data_path, lambda tmp: feather.write_feather(df, tmp, compression='uncompressed'))
+
+        metadata = {
+            'file_id': file_id,
+            'revision': revision,
+            'schema_version': SNAPSHOT_SCHEMA_VERSION,
+            'rows': len(df)
+        }
+
+        def write_metadata(tmp):
+            with open(tmp, 'w') as f:
+                json.dump(metadata, f)
+
+        # Metadata goes last so a half-written data file is never marked as valid
+        _atomic_write(meta_path, write_metadata)
+        return True
+    except Exception as e:
+        print(f"Could not write dataset snapshot: {e}")
+        return False
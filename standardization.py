@@ -0,0 +1,908 @@
+"""
+Standardization module for TALS case data.
+Contains the column/race/gender/legal problem mappings and the cleaning functions
+used when loading the dataset and when processing new uploads.
+"""
+
+import re
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+# Standardization mappings
+@lru_cache(maxsize=None)
+def get_standard_mappings():
+    # Column mapping
+    column_mapping = {
+        'Client ID': 'client_id',
+        'Matter/Case ID': 'case_id',
+        'Case # ID': 'case_id',
+        
+        'Date Opened': 'date_opened',
+        'Opened': 'date_opened',
+        'Date Closed': 'date_closed',
+        'Closed': 'date_closed',
+        'Number of Days Open': 'days_open',
+        '# Days Open': 'days_open',
+        
+        'Percentage of Poverty': 'poverty_pct',
+        'Poverty %': 'poverty_pct',
+        'Adjusted Percentage of Poverty': 'adj_poverty_pct',
+        'Adj. Poverty %': 'adj_poverty_pct',
+        'Income Eligible': 'income_eligible',
+        'Financial Eligibility Override Reason': 'income_override_reason',
+        'Financial Override Reason': 'income_override_reason',
+        'Income Waiver Request Status': 'income_waiver_status',
+        'Asset Eligible': 'asset_eligible',
+        'Asset Override Reason': 'asset_override_reason',
+        'Asset Waiver Request Status': 'asset_waiver_status',
+        
+        'Gender': 'gender',
+        'Race': 'race',
+        'HUD 9902 Ethnicity': 'ethnicity',
+        'Ethnicity': 'ethnicity',
+        'Age at Intake': 'age_intake',
+        'Intake Age': 'age_intake',
+        'Disabled': 'disabled',
+        'Living Arrangement': 'living_arrangement',
+        'Veteran': 'veteran',
+        'Language': 'language',
+        'Identifies as LGBT?': 'lgbt',
+        'LGBTQ': 'lgbt',
+        'Citizenship Status': 'citizenship',
+        'Citizenship': 'citizenship',
+        
+        'Total Household Size': 'household_total',
+        'Total Household': 'household_total',
+        'Number of People 18 and Over': 'household_adults',
+        'People > 18': 'household_adults',
+        'Number of People under 18': 'household_children',
+        'People < 18': 'household_children',
+        
+        'County of Residence': 'county_residence',
+        'Zip Code': 'zip_code',
+        'County of Dispute': 'county_dispute',
+        
+        'Legal Problem Code': 'legal_problem_code',
+        'Close Reason': 'close_reason',
+        'Funding Source': 'funding_source',
+        'PAI Case?': 'pai_case',
+        'PAI Case': 'pai_case',
+        
+        'How did Applicant hear about LAET?': 'referral_source',
+        'How did Applicant hear about LAS?': 'referral_source',
+        'How did Applicant hear about WTLS?': 'referral_source',
+        'Outcome': 'outcome',
+        'Outcome Value Category': 'outcome_category',
+        'Outcome value category': 'outcome_category',
+        'Outcome Amount': 'outcome_amount',
+        'Total Time For Case': 'case_time',
+        'Domestic Violence Present': 'domestic_violence',
+        'Is the caller a victim of domestic violence?': 'domestic_violence'
+    }
+    
+    # Race mapping
+    race_mapping = {
+        # White categories
+        'White': 'White',
+        'White (Not Hispanic)': 'White',
+        'Caucasian/White': 'White',
+        'Caucasian': 'White',
+        'White - Not Hispanic': 'White',
+        'white': 'White',
+        
+        # Black categories
+        'Black': 'Black',
+        'Black (Not Hispanic)': 'Black',
+        'African American/Black': 'Black',
+        'Black or African American': 'Black',
+        'Black - Not Hispanic': 'Black',
+        'African-American': 'Black',
+        'African American': 'Black',
+        'AA': 'Black',
+        'black': 'Black',
+        
+        # Native American categories
+        'Native American': 'Native American',
+        'Native American or Alaska Native': 'Native American',
+        'American Indian or Alaska Native': 'Native American',
+        'American Indian or Alaska Native and White': 'Native American',
+        'American Indian or Alaska Native anc': 'Native American',  # Your truncated version
+        
+        # Asian and Pacific Islander categories
+        'Asian': 'Asian/Pacific Islander',
+        'Asian or Pacific Islander': 'Asian/Pacific Islander',
+        'Asian/Pacific Islander': 'Asian/Pacific Islander',
+        'Native Hawaiian or Other Pacific Islander': 'Asian/Pacific Islander',
+        
+        # Hispanic
+        'Hispanic': 'Hispanic',
+        'hispanic': 'Hispanic',
+        
+        # Multiracial categories
+        'Multiracial': 'Multiracial',
+        'Mulitracial': 'Multiracial',
+        'Multi-Racial': 'Multiracial',
+        'Black or African American and White': 'Multiracial',
+        'Asian and White': 'Multiracial',
+        
+        # Other categories
+        'Other': 'Other/Unknown',
+        'Other/Unknown': 'Other/Unknown',
+        'Other Ethnic Group': 'Other/Unknown',
+        'No Response': 'Other/Unknown',
+        'Organization/Group': 'Other/Unknown',
+        '': 'Other/Unknown',
+        'nan': 'Other/Unknown',
+        None: 'Other/Unknown'
+    }
+    
+    # Gender mapping
+    gender_mapping = {
+        # Female
+        'Female': 'Female',
+        'female': 'Female',
+        'F': 'Female',
+        'Woman': 'Female',
+        
+        # Male
+        'Male': 'Male',
+        'male': 'Male',
+        'M': 'Male',
+        'Man': 'Male',
+        
+        # Transgender
+        'Transgender Female to Male': 'Transgender',
+        'Transgender Male to Female': 'Transgender',
+        'Trans man': 'Transgender',
+        'Trans woman': 'Transgender',
+        'Transgender': 'Transgender',
+        'Trans': 'Transgender',
+        
+        # Non-binary
+        'Non-binary': 'Non-binary',
+        'Non-Binary': 'Non-binary',
+        'Nonbinary': 'Non-binary',
+        'Gender Non-Conforming': 'Non-binary',
+        'Genderqueer': 'Non-binary',
+        
+        # Other/Unknown
+        "Don't Know": 'Other/Unknown',
+        'Other': 'Other/Unknown',
+        'Prefer not to say': 'Other/Unknown',
+        'Decline to state': 'Other/Unknown',
+        'G': 'Other/Unknown',
+        '7': 'Other/Unknown',
+        'nan': 'Other/Unknown',
+        '': 'Other/Unknown',
+        None: 'Other/Unknown'
+    }
+    
+    # legal problem code mapping
+    legal_problem_mapping = {
+    # Consumer/Finance (01-09)
+    r'(?i)^\s*0?1\s*[-: ]?\s*.*?(?:bankrupt|debtor)': '01 Bankruptcy/Debtor Relief',
+    r'(?i)^\s*0?2\s*[-: ]?\s*.*?(?:collect|repo|def|garn)': '02 Collection (including Repo/Def/Garnish)',
+    r'(?i)^\s*0?3\s*[-: ]?\s*.*?(?:contract|warrant)': '03 Contracts/Warranties',
+    r'(?i)^\s*0?4\s*[-: ]?\s*.*?(?:collect.*?practi|creditor|harass)': '04 Collection Practices/Creditor Harassment',
+    r'(?i)^\s*0?5\s*[-: ]?\s*.*?(?:predat.*?lend|lend.*?practice)(?!.*mortgage)': '05 Predatory Lending Practices (not mortgages)',
+    r'(?i)^\s*0?6\s*[-: ]?\s*.*?(?:loan|install.*?purch)': '06 Loans/Installment Purch.',
+    r'(?i)^\s*0?7\s*[-: ]?\s*.*?(?:public.*?util|utilit)': '07 Public Utilities',
+    r'(?i)^\s*0?8\s*[-: ]?\s*.*?(?:unfair|decept).*?(?:sales|practice)(?!.*real.*prop)': '08 Unfair and Deceptive Sales and Practices (not real property)',
+    r'(?i)^\s*0?9\s*[-: ]?\s*.*?(?:consumer|finance)': '09 Other Consumer/Finance',
+
+    # Education (12-19)
+    r'(?i)^\s*1?2\s*[-: ]?\s*.*?(?:discipl|expul|suspen)': '12 Discipline (including expulsion and suspension)',
+    r'(?i)^\s*1?3\s*[-: ]?\s*.*?(?:special.*?ed|learn.*?disab)': '13 Special Education/Learning Disabilities',
+    r'(?i)^\s*1?4\s*[-: ]?\s*.*?(?:access|biling|resid|test)': '14 Access (Including Bilingual, Residency, Testing)',
+    r'(?i)^\s*1?5\s*[-: ]?\s*.*?(?:vocat.*?ed)': '15 Vocational Education',
+    r'(?i)^\s*1?6\s*[-: ]?\s*.*?(?:student|financ.*?aid)': '16 Student Financial Aid',
+    r'(?i)^\s*1?9\s*[-: ]?\s*.*?(?:educ)': '19 Other Education',
+
+    # Employment (21-29)
+    r'(?i)^\s*2?1\s*[-: ]?\s*.*?(?:employ.*?discrim)': '21 Employment Discrimination',
+    r'(?i)^\s*2?2\s*[-: ]?\s*.*?(?:wage|flsa)': '22 Wage Claim and other FLSA Issues',
+    r'(?i)^\s*2?3\s*[-: ]?\s*.*?(?:eitc|earn.*?income.*?tax)': '23 EITC (Earned Income Tax Credit)',
+    r'(?i)^\s*2?4\s*[-: ]?\s*.*?(?:tax)(?!.*eitc)': '24 Taxes (not EITC)',
+    r'(?i)^\s*2?5\s*[-: ]?\s*.*?(?:employ.*?right)': '25 Employee Rights',
+    r'(?i)^\s*2?9\s*[-: ]?\s*.*?(?:employ|ceta)': '29 Other Employment',
+
+    # Family (30-39)
+    r'(?i)^\s*3?0\s*[-: ]?\s*.*?(?:adopt)': '30 Adoption',
+    r'(?i)^\s*3?1\s*[-: ]?\s*.*?(?:custody|visit)': '31 Custody/Visitation',
+    r'(?i)^\s*3?2\s*[-: ]?\s*.*?(?:divorce|sep|annul)': '32 Divorce/Sep./Annul.',
+    r'(?i)^\s*3?3\s*[-: ]?\s*.*?(?:adult.*?guard|conserv)': '33 Adult Guardianship/Conserv.',
+    r'(?i)^\s*3?4\s*[-: ]?\s*.*?(?:name.*?change)': '34 Name Change',
+    r'(?i)^\s*3?5\s*[-: ]?\s*.*?(?:parent.*?right.*?term)': '35 Parental Rights Termin.',
+    r'(?i)^\s*3?6\s*[-: ]?\s*.*?(?:patern)': '36 Paternity',
+    r'(?i)^\s*3?7\s*[-: ]?\s*.*?(?:dom.*?abuse)': '37 Domestic Abuse',
+    r'(?i)^\s*3?8\s*[-: ]?\s*.*?(?:support)': '38 Support',
+    r'(?i)^\s*3?9\s*[-: ]?\s*.*?(?:family)': '39 Other Family',
+
+    # Juvenile (41-49)
+    r'(?i)^\s*4?1\s*[-: ]?\s*.*?(?:delinq)': '41 Delinquent',
+    r'(?i)^\s*4?2\s*[-: ]?\s*.*?(?:neglect|abuse|depend)': '42 Neglected/Abused/Depend.',
+    r'(?i)^\s*4?3\s*[-: ]?\s*.*?(?:emancip)': '43 Emancipation',
+    r'(?i)^\s*4?4\s*[-: ]?\s*.*?(?:minor.*?guard|conserv)': '44 Minor Guardian/Conservatorship',
+    r'(?i)^\s*4?9\s*[-: ]?\s*.*?(?:juvenile)': '49 Other Juvenile',
+
+    # Health (51-59)
+    r'(?i)^\s*5?1\s*[-: ]?\s*.*?(?:medicaid|tenncare)': '51 Medicaid',
+    r'(?i)^\s*5?2\s*[-: ]?\s*.*?(?:medicare)': '52 Medicare',
+    r'(?i)^\s*5?3\s*[-: ]?\s*.*?(?:govern.*?child.*?health|insur.*?program)': "53 Government Children's Health Insurance Programs",
+    r'(?i)^\s*5?4\s*[-: ]?\s*.*?(?:home.*?comm.*?base|care)': '54 Home and Community Based Care',
+    r'(?i)^\s*5?5\s*[-: ]?\s*.*?(?:private.*?health.*?insur)': '55 Private Health Insurance',
+    r'(?i)^\s*5?6\s*[-: ]?\s*.*?(?:long.*?term.*?health|care.*?facil)': '56 Long Term Health Care Facilities',
+    r'(?i)^\s*5?7\s*[-: ]?\s*.*?(?:state.*?local.*?health)': '57 State and Local Health',
+    r'(?i)^\s*5?9\s*[-: ]?\s*.*?(?:health)': '59 Other Health',
+
+    # Housing (61-69)
+    r'(?i)^\s*6?1\s*[-: ]?\s*.*?(?:fed.*?subsid.*?hous|subsid.*?hous)': '61 Fed. Subsidized Housing',
+    r'(?i)^\s*6?2\s*[-: ]?\s*.*?(?:homeown|real.*?prop)(?!.*foreclos)': '62 Homeownership/Real Prop. (not foreclosure)',
+    r'(?i)^\s*6?3\s*[-: ]?\s*.*?(?:private.*?land|tenant)': '63 Private Landlord/Tenant',
+    r'(?i)^\s*6?4\s*[-: ]?\s*.*?(?:public.*?hous)': '64 Public Housing',
+    r'(?i)^\s*6?5\s*[-: ]?\s*.*?(?:mobile.*?home)': '65 Mobile Homes',
+    r'(?i)^\s*6?6\s*[-: ]?\s*.*?(?:hous.*?discrim)': '66 Housing Discrimination',
+    r'(?i)^\s*6?7\s*[-: ]?\s*.*?(?:mortgage.*?forecl)(?!.*predat)': '67 Mortgage Foreclosures (not predatory Lending/practices)',
+    r'(?i)^\s*6?8\s*[-: ]?\s*.*?(?:mortgage.*?predat|predat.*?lend)': '68 Mortgage Predatory Lending/Practices',
+    r'(?i)^\s*6?9\s*[-: ]?\s*.*?(?:hous)': '69 Other Housing',
+
+    # Income Maintenance (71-79)
+    r'(?i)^\s*7?1\s*[-: ]?\s*.*?(?:tanf|famil.*?first)': '71 TANF',
+    r'(?i)^\s*7?2\s*[-: ]?\s*.*?(?:social.*?secur)(?!.*ssdi)': '72 Social Security (not SSDI)',
+    r'(?i)^\s*7?3\s*[-: ]?\s*.*?(?:food.*?stamp)': '73 Food Stamps',
+    r'(?i)^\s*7?4\s*[-: ]?\s*.*?(?:ssdi)': '74 SSDI',
+    r'(?i)^\s*7?5\s*[-: ]?\s*.*?(?:ssi)': '75 SSI',
+    r'(?i)^\s*7?6\s*[-: ]?\s*.*?(?:unemploy.*?comp)': '76 Unemployment Compensation',
+    r'(?i)^\s*7?7\s*[-: ]?\s*.*?(?:veteran.*?bene)': '77 Veterans Benefits',
+    r'(?i)^\s*7?8\s*[-: ]?\s*.*?(?:state.*?local.*?income)': '78 State and Local Income Maintenance',
+    r'(?i)^\s*7?9\s*[-: ]?\s*.*?(?:income|mainten)': '79 Other Income Maintenance',
+
+    # Rights and Other (81-89)
+    r'(?i)^\s*8?1\s*[-: ]?\s*.*?(?:immigr|natural)': '81 Immigration/Naturalization',
+    r'(?i)^\s*8?2\s*[-: ]?\s*.*?(?:mental.*?health)': '82 Mental Health',
+    r'(?i)^\s*8?4\s*[-: ]?\s*.*?(?:disab.*?right)': '84 Disability Rights',
+    r'(?i)^\s*8?5\s*[-: ]?\s*.*?(?:civil.*?right)': '85 Civil Rights',
+    r'(?i)^\s*8?6\s*[-: ]?\s*.*?(?:human.*?traffic)': '86 Human Trafficking',
+    r'(?i)^\s*8?7\s*[-: ]?\s*.*?(?:expung)': '87 Expungement',
+    r'(?i)^\s*8?9\s*[-: ]?\s*.*?(?:other.*?individ.*?right|individual.*?right)': '89 Other Individual Rights',
+
+    # Miscellaneous (93-99)
+    r'(?i)^\s*9?3\s*[-: ]?\s*.*?(?:licens)': '93 Licenses (Auto and Other)',
+    r'(?i)^\s*9?4\s*[-: ]?\s*.*?(?:tort)': '94 Torts',
+    r'(?i)^\s*9?5\s*[-: ]?\s*.*?(?:will|estat)': '95 Wills/Estates',
+    r'(?i)^\s*9?6\s*[-: ]?\s*.*?(?:advan.*?direct|power.*?attorney)': '96 Advance Directives/Powers of Attorney',
+    r'(?i)^\s*9?7\s*[-: ]?\s*.*?(?:munic.*?legal)': '97 Municipal Legal Needs',
+    r'(?i)^\s*9?9\s*[-: ]?\s*.*?(?:misc|other)': '99 Other Miscellaneous'
+}
+    return column_mapping, race_mapping, gender_mapping, legal_problem_mapping
+
+# Direct standardization map for legal problem codes (lowercased raw value -> standard code)
+LEGAL_PROBLEM_STANDARDIZATION_MAP = {
+    # Consumer/Finance (01-09)
+    '01 bankruptcy/debtor relief': '01 Bankruptcy/Debtor Relief',
+    '02 collection (including repo/def/garnish)': '02 Collection (including Repo/Def/Garnish)',
+    '02 collect/repo/def/garnsh': '02 Collection (including Repo/Def/Garnish)',
+    '02 - collections (repo, def., garn)': '02 Collection (including Repo/Def/Garnish)',
+    '03 contracts / warranties': '03 Contracts/Warranties',
+    '03 contracts/warranties': '03 Contracts/Warranties',
+    '03 contract/warranties': '03 Contracts/Warranties',
+    '04 collection practices/creditor harassment': '04 Collection Practices/Creditor Harassment',
+    '04 collection practices / creditor harassment': '04 Collection Practices/Creditor Harassment',
+    '05 predatory lending practices (not mortgages)': '05 Predatory Lending Practices (not mortgages)',
+    '06 loans/installment purch.': '06 Loans/Installment Purch.',
+    '06 loans/installment purchases (not collections)': '06 Loans/Installment Purch.',
+    '07 public utilities': '07 Public Utilities',
+    '08 unfair and deceptive sales and practices (not real property)': '08 Unfair and Deceptive Sales and Practices (not real property)',
+    '08 unfair and deceptive sales practices (not real property)': '08 Unfair and Deceptive Sales and Practices (not real property)',
+    '09 other consumer/finance': '09 Other Consumer/Finance',
+    '09 other consumer / finance.': '09 Other Consumer/Finance',
+
+    # Education (12-19)
+    '12 discipline (including expulsion and suspension)': '12 Discipline (including expulsion and suspension)',
+    '13 special education/learning disabilities': '13 Special Education/Learning Disabilities',
+    '14 access (including bilingual, residency, testing)': '14 Access (Including Bilingual, Residency, Testing)',
+    '15 vocational education': '15 Vocational Education',
+    '16 student financial aid': '16 Student Financial Aid',
+    '19 other education': '19 Other Education',
+
+    # Employment (21-29)
+    '21 employment discrimination': '21 Employment Discrimination',
+    '22 wage claim and other flsa issues': '22 Wage Claim and other FLSA Issues',
+    '22 wage claims and other flsa issues': '22 Wage Claim and other FLSA Issues',
+    '23 eitc (earned income tax credit)': '23 EITC (Earned Income Tax Credit)',
+    '24 taxes (not eitc)': '24 Taxes (not EITC)',
+    '25 employee rights': '25 Employee Rights',
+    '29 other employment & ceta': '29 Other Employment',
+    '29 other employment': '29 Other Employment',
+
+    # Family (30-39)
+    '30 adoption': '30 Adoption',
+    '31 custody/visitation': '31 Custody/Visitation',
+    '31 custody / visitation': '31 Custody/Visitation',
+    '32 divorce/sep./annul.': '32 Divorce/Sep./Annul.',
+    '32 divorce / sep. / annul.': '32 Divorce/Sep./Annul.',
+    '33 adult guardianship / conserv.': '33 Adult Guardianship/Conserv.',
+    '33 adult guardianship/conserv.': '33 Adult Guardianship/Conserv.',
+    '33 adult guardianship / conservatorship': '33 Adult Guardianship/Conserv.',
+    '34 name change': '34 Name Change',
+    '35 parental rights termin.': '35 Parental Rights Termin.',
+    '35 parental rights termination': '35 Parental Rights Termin.',
+    '36 paternity': '36 Paternity',
+    '37 domestic abuse': '37 Domestic Abuse',
+    '37 - domestic abuse': '37 Domestic Abuse',
+    '38 support': '38 Support',
+    '39 other family': '39 Other Family',
+
+    # Juvenile (41-49)
+    '41 delinquent': '41 Delinquent',
+    '42 neglected/abused/depend.': '42 Neglected/Abused/Depend.',
+    '42 neglected/abused/dependent': '42 Neglected/Abused/Depend.',
+    '43 emancipation': '43 Emancipation',
+    '44 minor guardian/conservatorship': '44 Minor Guardian/Conservatorship',
+    '44 minor guardianship / conservatorship': '44 Minor Guardian/Conservatorship',
+    '49 other juvenile': '49 Other Juvenile',
+
+    # Health (51-59)
+    '51 medicaid': '51 Medicaid',
+    '51 - medicaid (tenncare)': '51 Medicaid',
+    '52 medicare': '52 Medicare',
+    "53 government children's health insurance programs": "53 Government Children's Health Insurance Programs",
+    "53 goverment children's health insurance programs": "53 Government Children's Health Insurance Programs",
+    '54 home and community based care': '54 Home and Community Based Care',
+    '55 private health insurance': '55 Private Health Insurance',
+    '56 long term health care facilities': '56 Long Term Health Care Facilities',
+    '57 state and local health': '57 State and Local Health',
+    '59 other health': '59 Other Health',
+
+    # Housing (61-69)
+    '61 fed. subsidized housing': '61 Fed. Subsidized Housing',
+    '61 federally subsidized housing': '61 Fed. Subsidized Housing',
+    '61 - federally subsidized housing': '61 Fed. Subsidized Housing',
+    '62 homeownership/real prop. (not foreclosure)': '62 Homeownership/Real Prop. (not foreclosure)',
+    '62 homeownership/real property (not foreclosure)': '62 Homeownership/Real Prop. (not foreclosure)',
+    '63 private landlord / tenant': '63 Private Landlord/Tenant',
+    '63 private landlord/tenant': '63 Private Landlord/Tenant',
+    '63 - private landlord/tenant': '63 Private Landlord/Tenant',
+    '64 public housing': '64 Public Housing',
+    '65 mobile homes': '65 Mobile Homes',
+    '66 housing discrimination': '66 Housing Discrimination',
+    '67 mortgage foreclosures (not predatory lending/practices)': '67 Mortgage Foreclosures (not predatory Lending/practices)',
+    '68 mortgage predatory lending/practices': '68 Mortgage Predatory Lending/Practices',
+    '69 other housing': '69 Other Housing',
+
+    # Income Maintenance (71-79)
+    '71 tanf': '71 TANF',
+    '71 - tanf (families first)': '71 TANF',
+    '72 social security (not ssdi)': '72 Social Security (not SSDI)',
+    '73 food stamps': '73 Food Stamps',
+    '73 food stamps / commodities': '73 Food Stamps',
+    '74 ssdi': '74 SSDI',
+    '75 ssi': '75 SSI',
+    '76 unemployment compensation': '76 Unemployment Compensation',
+    '77 veterans benefits': '77 Veterans Benefits',
+    '78 state and local income maintenance': '78 State and Local Income Maintenance',
+    '79 other income maintenance': '79 Other Income Maintenance',
+    '79 other income maintenence': '79 Other Income Maintenance',
+
+    # Rights and Other (81-89)
+    '81 immigration/naturalization': '81 Immigration/Naturalization',
+    '81 immigration / naturalization': '81 Immigration/Naturalization',
+    '82 mental health': '82 Mental Health',
+    '84 disability rights': '84 Disability Rights',
+    '85 civil rights': '85 Civil Rights',
+    '86 human trafficking': '86 Human Trafficking',
+    '87 expungement': '87 Expungement',
+    '87 - expungement': '87 Expungement',
+    '87 criminal record expungement': '87 Expungement',
+    '89 other individual rights': '89 Other Individual Rights',
+
+    # Miscellaneous (93-99)
+    '93 licenses (auto and other)': '93 Licenses (Auto and Other)',
+    '93 licenses (drivers, occupational, and others)': '93 Licenses (Auto and Other)',
+    '94 torts': '94 Torts',
+    '95 wills / estates': '95 Wills/Estates',
+    '95 wills/estates': '95 Wills/Estates',
+    '95 wills and estates': '95 Wills/Estates',
+    '96 advance directives/powers of attorney': '96 Advance Directives/Powers of Attorney',
+    '96 advanced directives/powers of attorney': '96 Advance Directives/Powers of Attorney',
+    '97 municipal legal needs': '97 Municipal Legal Needs',
+    '99 other miscellaneous': '99 Other Miscellaneous'
+}
+
+# Standard legal problem code by two-digit numeric prefix
+LEGAL_PROBLEM_CODE_LOOKUP = {
+    '01': '01 Bankruptcy/Debtor Relief',
+    '02': '02 Collection (including Repo/Def/Garnish)',
+    '03': '03 Contracts/Warranties',
+    '04': '04 Collection Practices/Creditor Harassment',
+    '05': '05 Predatory Lending Practices (not mortgages)',
+    '06': '06 Loans/Installment Purch.',
+    '07': '07 Public Utilities',
+    '08': '08 Unfair and Deceptive Sales and Practices (not real property)',
+    '09': '09 Other Consumer/Finance',
+    '12': '12 Discipline (including expulsion and suspension)',
+    '13': '13 Special Education/Learning Disabilities',
+    '14': '14 Access (Including Bilingual, Residency, Testing)',
+    '15': '15 Vocational Education',
+    '16': '16 Student Financial Aid',
+    '19': '19 Other Education',
+    '21': '21 Employment Discrimination',
+    '22': '22 Wage Claim and other FLSA Issues',
+    '23': '23 EITC (Earned Income Tax Credit)',
+    '24': '24 Taxes (not EITC)',
+    '25': '25 Employee Rights',
+    '29': '29 Other Employment',
+    '30': '30 Adoption',
+    '31': '31 Custody/Visitation',
+    '32': '32 Divorce/Sep./Annul.',
+    '33': '33 Adult Guardianship/Conserv.',
+    '34': '34 Name Change',
+    '35': '35 Parental Rights Termin.',
+    '36': '36 Paternity',
+    '37': '37 Domestic Abuse',
+    '38': '38 Support',
+    '39': '39 Other Family',
+    '41': '41 Delinquent',
+    '42': '42 Neglected/Abused/Depend.',
+    '43': '43 Emancipation',
+    '44': '44 Minor Guardian/Conservatorship',
+    '49': '49 Other Juvenile',
+    '51': '51 Medicaid',
+    '52': '52 Medicare',
+    '53': "53 Government Children's Health Insurance Programs",
+    '54': '54 Home and Community Based Care',
+    '55': '55 Private Health Insurance',
+    '56': '56 Long Term Health Care Facilities',
+    '57': '57 State and Local Health',
+    '59': '59 Other Health',
+    '61': '61 Fed. Subsidized Housing',
+    '62': '62 Homeownership/Real Prop. (not foreclosure)',
+    '63': '63 Private Landlord/Tenant',
+    '64': '64 Public Housing',
+    '65': '65 Mobile Homes',
+    '66': '66 Housing Discrimination',
+    '67': '67 Mortgage Foreclosures (not predatory Lending/practices)',
+    '68': '68 Mortgage Predatory Lending/Practices',
+    '69': '69 Other Housing',
+    '71': '71 TANF',
+    '72': '72 Social Security (not SSDI)',
+    '73': '73 Food Stamps',
+    '74': '74 SSDI',
+    '75': '75 SSI',
+    '76': '76 Unemployment Compensation',
+    '77': '77 Veterans Benefits',
+    '78': '78 State and Local Income Maintenance',
+    '79': '79 Other Income Maintenance',
+    '81': '81 Immigration/Naturalization',
+    '82': '82 Mental Health',
+    '84': '84 Disability Rights',
+    '85': '85 Civil Rights',
+    '86': '86 Human Trafficking',
+    '87': '87 Expungement',
+    '89': '89 Other Individual Rights',
+    '93': '93 Licenses (Auto and Other)',
+    '94': '94 Torts',
+    '95': '95 Wills/Estates',
+    '96': '96 Advance Directives/Powers of Attorney',
+    '97': '97 Municipal Legal Needs',
+    '99': '99 Other Miscellaneous'
+}
+
+# Final cleanup for any edge cases that slip through the mapping
+LEGAL_PROBLEM_FINAL_CLEANUP = {
+    '62 Homeownership/Real Property (not Foreclosure)': '62 Homeownership/Real Prop. (not foreclosure)',
+    '62 Homeownership/Real Property (Not Foreclosure)': '62 Homeownership/Real Prop. (not foreclosure)',
+    '08 Unfair and Deceptive Sales Practices (Not Real Property)': '08 Unfair and Deceptive Sales and Practices (not real property)',
+    '67 Mortgage Foreclosures (Not Predatory Lending/Practices)': '67 Mortgage Foreclosures (not predatory Lending/practices)',
+    '67 Mortgage Foreclosures (not Predatory Lending/Practices)': '67 Mortgage Foreclosures (not predatory Lending/practices)',
+    '05 Predatory Lending Practices (Not Mortgages)': '05 Predatory Lending Practices (not mortgages)',
+    '05 Predatory Lending Practices (not Mortgages)': '05 Predatory Lending Practices (not mortgages)',
+}
+
+# --- Vectorized Race/Gender Standardization ---
+
+# Combined patterns: one compiled regex per column whose alternatives are tried in the
+# same priority order as the original per-row clean_race_with_regex / clean_gender_with_regex
+# (kept in benchmark_standardization.py as the reference). Each branch
+# is a lookahead from the start of the string, so the first branch that matches wins
+# (a plain alternation would pick the leftmost match in the text instead).
+_RACE_PATTERN = re.compile(
+    r'^(?:'
+    r'(?=[\s\S]*?\b(?:white|caucasian)\b)(?P<white>)'
+    r'|(?=[\s\S]*?\b(?:black|african.?american|aa)\b)(?P<black>)'
+    r'|(?=[\s\S]*?\b(?:native|american.?indian|alaska.?native)\b)(?P<native>)'
+    r'|(?=[\s\S]*?\b(?:asian|pacific.?islander|hawaiian)\b)(?P<asian>)'
+    r'|(?=[\s\S]*?\b(?:hispanic|latino|latina|latinx)\b)(?P<hispanic>)'
+    r'|(?=[\s\S]*?\b(?:multi.?racial|multiracial|two.?or.?more)\b)(?P<multiracial>)'
+    r'|(?=[\s\S]*? and )(?P<multiracial_and>)'
+    r')'
+)
+
+_RACE_GROUP_LABELS = {
+    'white': 'White',
+    'black': 'Black',
+    'native': 'Native American',
+    'asian': 'Asian/Pacific Islander',
+    'hispanic': 'Hispanic',
+    'multiracial': 'Multiracial',
+    'multiracial_and': 'Multiracial'
+}
+
+_GENDER_PATTERN = re.compile(
+    r'^(?:'
+    r'(?=(?:f|female|woman)$)(?P<female>)'
+    r'|(?=(?:m|male|man)$)(?P<male>)'
+    r'|(?=[\s\S]*?\b(?:trans|transgender)\b)(?P<transgender>)'
+    r'|(?=[\s\S]*?\b(?:non.?binary|nonbinary|genderqueer|gender.?non.?conforming)\b)(?P<nonbinary>)'
+    r')'
+)
+
+_GENDER_GROUP_LABELS = {
+    'female': 'Female',
+    'male': 'Male',
+    'transgender': 'Transgender',
+    'nonbinary': 'Non-binary'
+}
+
+UNKNOWN_CATEGORY = 'Other/Unknown'
+
+
+def _classify_with_pattern(value, pattern, group_labels):
+    """Classify one distinct value with a combined pattern (same rules as the per-row functions)."""
+    if pd.isna(value) or str(value).strip() == '':
+        return UNKNOWN_CATEGORY
+
+    match = pattern.match(str(value).strip().lower())
+    if match is None:
+        return UNKNOWN_CATEGORY
+    return group_labels[match.lastgroup]
+
+
+def classify_race(race_value):
+    """Classify a single race value using the precompiled combined pattern."""
+    return _classify_with_pattern(race_value, _RACE_PATTERN, _RACE_GROUP_LABELS)
+
+
+def classify_gender(gender_value):
+    """Classify a single gender value using the precompiled combined pattern."""
+    return _classify_with_pattern(gender_value, _GENDER_PATTERN, _GENDER_GROUP_LABELS)
+
+
+def _standardize_distinct_values(values, mapping, classify):
+    """
+    Standardize a column by working on its distinct values only.
+
+    Each distinct value goes through the direct mapping first, then the regex
+    classifier if it still isn't a standard category. The results are mapped back
+    to every row through the factorized codes, so cost scales with the number of
+    distinct spellings rather than the number of rows.
+
+    Returns:
+    --------
+    pd.Series
+        Categorical series aligned with the input index
+    """
+    values = pd.Series(values)
+    codes, uniques = pd.factorize(values, use_na_sentinel=True)
+
+    standard_values = set(mapping.values())
+    labels = []
+    for value in uniques:
+        mapped = mapping.get(value, value)
+        labels.append(mapped if mapped in standard_values else classify(mapped))
+
+    # Missing values get their own slot at the end of the label array
+    labels.append(classify(None))
+    codes = np.where(codes == -1, len(labels) - 1, codes)
+
+    categories = pd.Index(sorted(set(labels)))
+    label_codes = categories.get_indexer(labels)
+
+    return pd.Series(
+        pd.Categorical.from_codes(label_codes[codes], categories=categories),
+        index=values.index,
+        name=values.name
+    )
+
+
+def standardize_race(values):
+    """
+    Standardize race values (direct mapping, then regex) over distinct values only.
+
+    Parameters:
+    -----------
+    values : pd.Series
+        Raw race values (strings, categorical or missing)
+
+    Returns:
+    --------
+    pd.Series
+        Categorical series of standard race categories
+    """
+    _, race_mapping, _, _ = get_standard_mappings()
+    return _standardize_distinct_values(values, race_mapping, classify_race)
+
+
+def standardize_gender(values):
+    """
+    Standardize gender values (direct mapping, then regex) over distinct values only.
+
+    Parameters:
+    -----------
+    values : pd.Series
+        Raw gender values (strings, categorical or missing)
+
+    Returns:
+    --------
+    pd.Series
+        Categorical series of standard gender categories
+    """
+    _, _, gender_mapping, _ = get_standard_mappings()
+    return _standardize_distinct_values(values, gender_mapping, classify_gender)
+
+
+# Cleaned demographic columns load_data() adds for the Demographic Analysis tab.
+# They are derived from the sheet columns and never written back to it.
+DEMOGRAPHIC_VIZ_COLUMNS = ['age_intake_clean', 'race_clean', 'gender_clean']
+
+
+def add_demographic_viz_columns(df):
+    """
+    Add the DEMOGRAPHIC_VIZ_COLUMNS to df in place.
+    Age 0 is treated as missing; race and gender become standard categories.
+    """
+    df['age_intake_clean'] = df['age_intake'].mask(df['age_intake'] == 0)
+    df['race_clean'] = standardize_race(df['race'])
+    df['gender_clean'] = standardize_gender(df['gender'])
+    return df
+
+# --- Legal Problem Code Normalization ---
+
+_NUMERIC_CODE_PATTERN = re.compile(r'^\s*0*(\d+)')
+
+
+class LegalProblemNormalizer:
+    """
+    Normalizes raw legal problem codes to the standard code list.
+
+    Applies the same tiers as the original per-row map_legal_problem_with_regex
+    (direct mapping, regex patterns, numeric code fallback; kept in
+    benchmark_standardization.py as the reference) plus the final cleanup, but with
+    the patterns compiled once and every raw value memoized, so a column only pays
+    for its distinct spellings.
+    """
+
+    def __init__(self, legal_problem_patterns, max_memo_size=10000):
+        self.patterns = [
+            (re.compile(pattern, re.IGNORECASE), standardized_code)
+            for pattern, standardized_code in legal_problem_patterns.items()
+        ]
+        self.max_memo_size = max_memo_size
+        self._memo = {}
+
+    def _map_uncached(self, problem_code):
+        problem_str = str(problem_code).strip()
+
+        normalized = problem_str.lower()
+        if normalized in LEGAL_PROBLEM_STANDARDIZATION_MAP:
+            return LEGAL_PROBLEM_STANDARDIZATION_MAP[normalized]
+
+        for pattern, standardized_code in self.patterns:
+            if pattern.search(problem_str):
+                return standardized_code
+
+        code_match = _NUMERIC_CODE_PATTERN.match(problem_str)
+        if code_match and code_match.group(1).zfill(2) in LEGAL_PROBLEM_CODE_LOOKUP:
+            return LEGAL_PROBLEM_CODE_LOOKUP[code_match.group(1).zfill(2)]
+
+        # No match found, keep the original value
+        return problem_code
+
+    def normalize(self, problem_code):
+        """Normalize a single raw legal problem code (missing values map to None)."""
+        if pd.isna(problem_code):
+            return None
+
+        try:
+            return self._memo[problem_code]
+        except KeyError:
+            pass
+
+        result = self._map_uncached(problem_code)
+        result = LEGAL_PROBLEM_FINAL_CLEANUP.get(result, result)
+
+        # Keep the memo bounded in case a file is full of free-text values
+        if len(self._memo) >= self.max_memo_size:
+            self._memo.clear()
+        self._memo[problem_code] = result
+        return result
+
+    def normalize_series(self, values):
+        """
+        Normalize a column of raw legal problem codes.
+
+        Parameters:
+        -----------
+        values : pd.Series
+            Raw legal problem codes
+
+        Returns:
+        --------
+        pd.Series
+            Categorical series of standardized codes aligned with the input index
+        """
+        values = pd.Series(values)
+        codes, uniques = pd.factorize(values, use_na_sentinel=True)
+
+        labels = [self.normalize(value) for value in uniques]
+        categories = pd.Index(sorted({label for label in labels if label is not None}, key=str))
+
+        # Map the per-unique results back to every row (-1 stays missing)
+        label_codes = np.append(categories.get_indexer(labels), -1)
+        return pd.Series(
+            pd.Categorical.from_codes(label_codes[codes], categories=categories),
+            index=values.index,
+            name=values.name
+        )
+
+
+@lru_cache(maxsize=None)
+def get_legal_problem_normalizer():
+    """Return the process-wide normalizer built from get_standard_mappings()."""
+    _, _, _, legal_problem_mapping = get_standard_mappings()
+    return LegalProblemNormalizer(legal_problem_mapping)
+
+
+# --- New Upload Standardization ---
+
+def standardize_new_data(df, upload_source):
+    """
+    Standardize a raw organization export to the dataset schema.
+    
+    Renames columns via the column mapping, standardizes race/gender/legal problem
+    codes and eligibility flags, adds missing columns (source = upload_source),
+    converts numeric and date columns and returns the columns in dataset order.
+    """
+    column_mapping, _, _, _ = get_standard_mappings()
+    
+    # First standardize the column names
+    df = df.rename(columns=column_mapping)
+    
+    # Define the expected column order 
+    column_order = [
+        # Identifying Information
+        'client_id',
+        'case_id',
+        'source',  
+        
+        # Dates and Duration
+        'date_opened',
+        'date_closed',
+        'days_open',
+        'case_time',
+        
+        # Financial Eligibility
+        'poverty_pct',
+        'adj_poverty_pct',
+        'income_eligible',
+        'income_override_reason',
+        'income_waiver_status',
+        'asset_eligible',
+        'asset_override_reason',
+        'asset_waiver_status',
+        
+        # Demographics
+        'age_intake',
+        'gender',
+        'race',
+        'ethnicity',
+        'disabled',
+        'veteran',
+        'language',
+        'lgbt',
+        'citizenship',
+        
+        # Household Information
+        'household_total',
+        'household_adults',
+        'household_children',
+        'living_arrangement',
+        
+        # Location
+        'county_residence',
+        'zip_code',
+        'county_dispute',
+        
+        # Case Details
+        'legal_problem_code',
+        'funding_source',
+        'pai_case',
+        'referral_source',
+        'domestic_violence',
+        
+        # Outcome Information
+        'close_reason',
+        'outcome_category',
+        'outcome_amount',
+        'outcome'
+    ]
+
+    # Standardize race categories if present (direct mapping, then regex for anything not mapped)
+    if 'race' in df.columns:
+        df['race'] = standardize_race(df['race'])
+
+    # Standardize gender categories (direct mapping, then regex for anything not mapped)
+    if 'gender' in df.columns:
+        df['gender'] = standardize_gender(df['gender'])
+        
+    # Standardize legal problem codes
+    if 'legal_problem_code' in df.columns:
+        # Step 1: Clean whitespace
+        df['legal_problem_code'] = df['legal_problem_code'].astype(str).str.strip()
+        
+        # Step 2: Map each distinct code once (mapping, regex, numeric fallback and final cleanup)
+        df['legal_problem_code'] = get_legal_problem_normalizer().normalize_series(df['legal_problem_code'])
+
+    # Clean and normalize 'domestic_violence'
+    if 'domestic_violence' in df.columns:
+        # Strip leading/trailing whitespace and ensure string type
+        df['domestic_violence'] = df['domestic_violence'].astype(str).str.strip()
+
+        # Replace known valid entries; everything else becomes NaN
+        df['domestic_violence'] = df['domestic_violence'].apply(
+            lambda x: x if x in ['Yes', 'No'] else np.nan
+        )
+
+    # Normalize income_eligible 
+    if 'income_eligible' in df.columns:
+        df['income_eligible'] = df['income_eligible'].astype(str).str.strip().str.capitalize()
+        # Only convert Yes/No, leave everything else as-is (blanks will stay as empty strings)
+        df['income_eligible'] = df['income_eligible'].apply(
+            lambda x: x if x in ['Yes', 'No'] else ''
+        )
+    
+    # Normalize asset_eligible 
+    if 'asset_eligible' in df.columns:
+        df['asset_eligible'] = df['asset_eligible'].astype(str).str.strip().str.capitalize()
+        df['asset_eligible'] = df['asset_eligible'].apply(
+            lambda x: x if x in ['Yes', 'No'] else ''
+        )
+
+    # Add missing columns with nan
+    for col in column_order:
+        if col not in df.columns:
+            if col == 'source':
+                df[col] = upload_source  # Use the provided organization source
+            else:
+                df[col] = np.nan
+    
+    # Convert household columns to numeric
+    household_cols = ['household_total', 'household_adults', 'household_children']
+    for col in household_cols:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors='coerce')
+    
+    # Convert numeric columns with special handling for outcome_amount
+    numeric_cols = ['poverty_pct', 'adj_poverty_pct', 'age_intake', 'outcome_amount', 'case_time']
+    for col in numeric_cols:
+        if col in df.columns:
+            if col == 'outcome_amount':
+                # Special handling for currency format - remove $ and commas
+                df[col] = df[col].astype(str).str.replace('$', '', regex=False).str.replace(',', '', regex=False)
+                df[col] = pd.to_numeric(df[col], errors='coerce')
+            else:
+                df[col] = pd.to_numeric(df[col], errors='coerce')
+    
+    # Handle date columns
+    date_cols = ['date_opened', 'date_closed']
+    for col in date_cols:
+        if col in df.columns:
+            # Convert to datetime and normalize to remove time component
+            df[col] = pd.to_datetime(df[col], errors='coerce').dt.normalize()
+        
+    # Ensure all columns are in the same order
+    df = df[column_order]
+    
+    return df
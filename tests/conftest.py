@@ -0,0 +1,21 @@
+import os
+import sys
+
+import pytest
+
+# The app's modules are flat files at the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fake_google import FakeGoogleBackend  # noqa: E402
+
+
+@pytest.fixture
+def backend():
+    return FakeGoogleBackend()
+
+
+@pytest.fixture
+def no_sleep(monkeypatch):
+    """Retry immediately instead of backing off."""
+    import sheets_io
+    monkeypatch.setattr(sheets_io, 'retry_delay', lambda attempt, base_delay=1.0: 0)
@@ -0,0 +1,437 @@
+"""
+In-memory stand-in for the Google Sheets and Drive APIs used by the tests.
+Mirrors the gspread/Drive v3 behaviour the app relies on (grid limits, trimmed
+ranges, modifiedTime, media downloads) and can simulate quota and server errors.
+"""
+
+import copy
+import hashlib
+import itertools
+import json
+import random
+import re
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+
+import googleapiclient.http
+import gspread
+import httplib2
+import requests
+from gspread.utils import a1_range_to_grid_range, fill_gaps, rowcol_to_a1
+
+# Grid size of a new fake worksheet (rows, columns), like a new Google Sheet
+DEFAULT_FAKE_GRID = (1000, 26)
+
+
+def _now_rfc3339():
+    return datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.%fZ')
+
+
+def _fake_api_error(code, status, message):
+    """Build the gspread APIError the real client raises for an error response."""
+    response = requests.models.Response()
+    response.status_code = code
+    response._content = json.dumps({'error': {'code': code, 'message': message, 'status': status}}).encode('utf-8')
+    return gspread.exceptions.APIError(response)
+
+
+class FakeWorksheet:
+    """
+    In-memory stand-in for the gspread.Worksheet calls the app makes.
+
+    Tracks a grid size like a real sheet: ranged writes past the grid fail the
+    way the API does, appends grow it, and resize() sets it.
+    """
+
+    def __init__(self, spreadsheet, sheet_id, title, values=None, rows=None, cols=None):
+        self.spreadsheet = spreadsheet
+        self.id = sheet_id
+        self.title = title
+        self._values = [[str(value) for value in row] for row in (values or [])]
+        self.row_count = rows or max(DEFAULT_FAKE_GRID[0], len(self._values))
+        self.col_count = cols or max([DEFAULT_FAKE_GRID[1]] + [len(row) for row in self._values])
+
+    @property
+    def index(self):
+        return self.spreadsheet._worksheets.index(self)
+
+    @property
+    def _backend(self):
+        return self.spreadsheet.backend
+
+    def _touch(self):
+        self._backend.touch(self.spreadsheet.id)
+
+    def _snapshot(self):
+        return [list(row) for row in self._values]
+
+    def _set_cell(self, row, col, value):
+        while len(self._values) <= row:
+            self._values.append([])
+        cells = self._values[row]
+        while len(cells) <= col:
+            cells.append('')
+        cells[col] = str(value)
+
+    def get_values(self, range_name=None, pad_values=True, **kwargs):
+        """Cells in range_name (whole sheet by default), with the API's trailing-blank trimming."""
+        with self._backend.lock:
+            self._backend.charge_request()
+            if range_name is None:
+                rows, cols = (0, self.row_count), (0, self.col_count)
+            else:
+                grid = a1_range_to_grid_range(range_name)
+                rows = (grid.get('startRowIndex', 0), grid.get('endRowIndex', self.row_count))
+                cols = (grid.get('startColumnIndex', 0), grid.get('endColumnIndex', self.col_count))
+
+            values = [list(row[cols[0]:cols[1]]) for row in self._values[rows[0]:rows[1]]]
+
+        values = [row[:max([i + 1 for i, value in enumerate(row) if value != ''], default=0)] for row in values]
+        while values and not values[-1]:
+            values.pop()
+        # Like gspread, an empty range comes back as one empty row
+        values = values or [[]]
+        return fill_gaps(values) if pad_values else values
+
+    def get_all_values(self, **kwargs):
+        return self.get_values(**kwargs)
+
+    def row_values(self, row, **kwargs):
+        values = self.get_values(f"A{row}:{rowcol_to_a1(row, self.col_count)}", pad_values=False)
+        return values[0] if values else []
+
+    def col_values(self, col, **kwargs):
+        """Values of a column down to its last non-empty cell."""
+        with self._backend.lock:
+            self._backend.charge_request()
+            values = [row[col - 1] if len(row) >= col else '' for row in self._values]
+        while values and values[-1] == '':
+            values.pop()
+        return values
+
+    def append_rows(self, values, **kwargs):
+        with self._backend.lock:
+            self._backend.charge_request()
+            # Appends go after the last row holding data
+            last = len(self._values)
+            while last and not any(self._values[last - 1]):
+                last -= 1
+            del self._values[last:]
+            self._values.extend([str(value) for value in row] for row in values)
+            self.row_count = max(self.row_count, len(self._values))
+            self.col_count = max([self.col_count] + [len(row) for row in values])
+            self._touch()
+        return {'updates': {'updatedRows': len(values)}}
+
+    def append_row(self, values, **kwargs):
+        return self.append_rows([values], **kwargs)
+
+    def clear(self):
+        with self._backend.lock:
+            self._backend.charge_request()
+            self._values = []
+            self._touch()
+
+    def resize(self, rows=None, cols=None):
+        with self._backend.lock:
+            self._backend.charge_request()
+            self.row_count = rows if rows is not None else self.row_count
+            self.col_count = cols if cols is not None else self.col_count
+            self._values = [row[:self.col_count] for row in self._values[:self.row_count]]
+            self._touch()
+
+    def update(self, values=None, range_name=None, **kwargs):
+        """Write values with their top-left cell at the start of range_name (A1 by default)."""
+        grid = a1_range_to_grid_range(range_name or 'A1')
+        top, left = grid.get('startRowIndex', 0), grid.get('startColumnIndex', 0)
+        rows = [list(row) for row in values]
+
+        with self._backend.lock:
+            self._backend.charge_request()
+            bottom = top + len(rows)
+            right = left + max((len(row) for row in rows), default=0)
+            if bottom > self.row_count or right > self.col_count:
+                raise _fake_api_error(
+                    400, 'INVALID_ARGUMENT',
+                    f"Range ({range_name}) exceeds grid limits. Max rows: {self.row_count}, "
+                    f"max columns: {self.col_count}"
+                )
+            for i, row in enumerate(rows):
+                for j, value in enumerate(row):
+                    self._set_cell(top + i, left + j, value)
+            self._touch()
+        return {'updatedRows': len(rows)}
+
+
+class FakeSpreadsheet:
+    """In-memory stand-in for gspread.Spreadsheet."""
+
+    def __init__(self, backend, file_id, values=None):
+        self.backend = backend
+        self.id = file_id
+        self._sheet_ids = itertools.count()
+        self._worksheets = [FakeWorksheet(self, next(self._sheet_ids), 'Sheet1', values)]
+
+    @property
+    def sheet1(self):
+        return self._worksheets[0]
+
+    def worksheets(self):
+        with self.backend.lock:
+            self.backend.charge_request()
+            return list(self._worksheets)
+
+    def get_worksheet(self, index):
+        return self._worksheets[index]
+
+    def _find(self, sheet_id):
+        for worksheet in self._worksheets:
+            if worksheet.id == sheet_id:
+                return worksheet
+        raise _fake_api_error(400, 'INVALID_ARGUMENT', f"No grid with id: {sheet_id}")
+
+    def _check_title(self, title, sheet_id=None):
+        if any(ws.title == title and ws.id != sheet_id for ws in self._worksheets):
+            raise _fake_api_error(400, 'INVALID_ARGUMENT', f'A sheet with the name "{title}" already exists.')
+
+    def add_worksheet(self, title, rows, cols, index=None):
+        with self.backend.lock:
+            self.backend.charge_request()
+            self._check_title(title)
+            worksheet = FakeWorksheet(self, next(self._sheet_ids), title, rows=rows, cols=cols)
+            self._worksheets.insert(len(self._worksheets) if index is None else index, worksheet)
+            self.backend.touch(self.id)
+            return worksheet
+
+    def del_worksheet(self, worksheet):
+        self.batch_update({'requests': [{'deleteSheet': {'sheetId': worksheet.id}}]})
+
+    def batch_update(self, body):
+        """
+        Apply deleteSheet and updateSheetProperties (index/title) requests atomically:
+        if any request fails, none of them take effect.
+        """
+        with self.backend.lock:
+            self.backend.charge_request()
+            worksheets = list(self._worksheets)
+            titles = {ws.id: ws.title for ws in worksheets}
+            try:
+                for request in body['requests']:
+                    if 'deleteSheet' in request:
+                        worksheet = self._find(request['deleteSheet']['sheetId'])
+                        if len(self._worksheets) == 1:
+                            raise _fake_api_error(400, 'INVALID_ARGUMENT', "You can't remove all the sheets in a document.")
+                        self._worksheets.remove(worksheet)
+                    elif 'updateSheetProperties' in request:
+                        properties = request['updateSheetProperties']['properties']
+                        worksheet = self._find(properties['sheetId'])
+                        if 'title' in properties:
+                            self._check_title(properties['title'], worksheet.id)
+                            worksheet.title = properties['title']
+                        if 'index' in properties:
+                            self._worksheets.remove(worksheet)
+                            self._worksheets.insert(properties['index'], worksheet)
+                    else:
+                        raise _fake_api_error(400, 'INVALID_ARGUMENT', f"Unsupported request: {list(request)}")
+            except Exception:
+                self._worksheets = worksheets
+                for ws in worksheets:
+                    ws.title = titles[ws.id]
+                raise
+            self.backend.touch(self.id)
+            return {'replies': [{} for _ in body['requests']]}
+
+    def get_lastUpdateTime(self):
+        return self.backend.files[self.id]['modifiedTime']
+
+
+class _FakeSheetsClient:
+    def __init__(self, backend):
+        self.backend = backend
+
+    def open_by_key(self, key):
+        if key not in self.backend.spreadsheets:
+            raise gspread.exceptions.SpreadsheetNotFound(key)
+        return self.backend.spreadsheets[key]
+
+
+class _FakeMediaHttp:
+    """httplib2.Http stand-in that serves one file's bytes to MediaIoBaseDownload."""
+
+    def __init__(self, content):
+        self.content = content
+
+    def request(self, uri, method='GET', headers=None, **kwargs):
+        response = httplib2.Response({'status': '200', 'content-length': str(len(self.content))})
+        return response, self.content
+
+
+class _FakeRequest:
+    def __init__(self, result):
+        self._result = result
+
+    def execute(self, **kwargs):
+        return self._result
+
+
+class _FakeFiles:
+    def __init__(self, backend):
+        self.backend = backend
+
+    def _file(self, file_id):
+        if file_id not in self.backend.files:
+            raise FileNotFoundError(f"Fake Drive file not found: {file_id}")
+        return self.backend.files[file_id]
+
+    def get(self, fileId, fields=None, **kwargs):
+        metadata = {key: value for key, value in self._file(fileId).items()
+                    if key not in ('content', '_sequence')}
+        return _FakeRequest(metadata)
+
+    def get_media(self, fileId, **kwargs):
+        content = self._file(fileId).get('content', b'')
+        return googleapiclient.http.HttpRequest(
+            _FakeMediaHttp(content), None, f"fake://drive/{fileId}?alt=media"
+        )
+
+    def copy(self, fileId, body=None, fields=None, **kwargs):
+        self._file(fileId)
+        return _FakeRequest(self.backend.copy_file(fileId, body or {}))
+
+    def list(self, q=None, orderBy=None, **kwargs):
+        """Only the appProperties/trashed filters and createdTime ordering are simulated."""
+        files = list(self.backend.files.values())
+        for key, value in re.findall(r"appProperties has \{ key='([^']*)' and value='([^']*)' \}", q or ''):
+            files = [f for f in files if f.get('appProperties', {}).get(key) == value]
+        if orderBy and orderBy.startswith('createdTime'):
+            files.sort(key=lambda f: f['_sequence'], reverse=orderBy.endswith('desc'))
+        return _FakeRequest({'files': [
+            {'id': f['id'], 'name': f.get('name'), 'createdTime': f['createdTime']} for f in files
+        ]})
+
+    def delete(self, fileId, **kwargs):
+        self._file(fileId)
+        return _FakeRequest(self.backend.delete_file(fileId))
+
+
+class _FakeDriveService:
+    def __init__(self, backend):
+        self.backend = backend
+
+    def files(self):
+        return _FakeFiles(self.backend)
+
+
+class FakeGoogleBackend:
+    """
+    Local in-memory stand-in for Google Sheets and Drive.
+
+    Spreadsheets are lists of string rows and other Drive files are raw bytes;
+    every write bumps the file's modifiedTime like the real API does.
+
+    Parameters:
+    -----------
+    requests_per_window : int, optional
+        Simulated Sheets quota: worksheet calls beyond this many per quota_window
+        seconds fail with 429 RESOURCE_EXHAUSTED
+    quota_window : float
+        Length of the quota window in seconds (60 for the real per-minute quota)
+    error_rate : float
+        Probability that any worksheet call fails with a random 429/500/503
+    seed : int, optional
+        Seed for the simulated failures
+    """
+
+    def __init__(self, requests_per_window=None, quota_window=60.0, error_rate=0.0, seed=None):
+        self.lock = threading.RLock()
+        self.files = {}
+        self.spreadsheets = {}
+        self._sequence = itertools.count()
+        self._new_ids = itertools.count(1)
+
+        self.requests_per_window = requests_per_window
+        self.quota_window = quota_window
+        self.error_rate = error_rate
+        self._random = random.Random(seed)
+        self._request_times = deque()
+        self.request_count = 0
+        self.failed_requests = 0
+
+    def charge_request(self):
+        """Count one Sheets call against the simulated quota, raising the API's errors when over it."""
+        with self.lock:
+            self.request_count += 1
+            now = time.monotonic()
+            while self._request_times and now - self._request_times[0] >= self.quota_window:
+                self._request_times.popleft()
+
+            if self.requests_per_window is not None and len(self._request_times) >= self.requests_per_window:
+                self.failed_requests += 1
+                raise _fake_api_error(
+                    429, 'RESOURCE_EXHAUSTED',
+                    "Quota exceeded for quota metric 'Requests' and limit 'Requests per minute per user'"
+                )
+            if self.error_rate and self._random.random() < self.error_rate:
+                self.failed_requests += 1
+                code, status = self._random.choice([
+                    (429, 'RESOURCE_EXHAUSTED'), (500, 'INTERNAL'), (503, 'UNAVAILABLE')
+                ])
+                raise _fake_api_error(code, status, "Simulated transient failure")
+
+            self._request_times.append(now)
+
+    def _add_metadata(self, file_id, **metadata):
+        now = _now_rfc3339()
+        self.files[file_id] = {
+            'id': file_id,
+            'name': file_id,
+            'createdTime': now,
+            'modifiedTime': now,
+            '_sequence': next(self._sequence),
+            **metadata
+        }
+
+    def add_spreadsheet(self, file_id, values=None):
+        with self.lock:
+            self.spreadsheets[file_id] = FakeSpreadsheet(self, file_id, values)
+            self._add_metadata(file_id, mimeType='application/vnd.google-apps.spreadsheet')
+        return self.spreadsheets[file_id]
+
+    def add_file(self, file_id, content):
+        with self.lock:
+            self._add_metadata(
+                file_id,
+                md5Checksum=hashlib.md5(content).hexdigest(),
+                size=str(len(content)),
+                content=content
+            )
+
+    def copy_file(self, file_id, body):
+        """Duplicate a file (and its cells, for spreadsheets) under a new ID."""
+        with self.lock:
+            source = self.files[file_id]
+            new_id = f"{file_id}-copy-{next(self._new_ids)}"
+            if file_id in self.spreadsheets:
+                self.add_spreadsheet(new_id, self.spreadsheets[file_id].sheet1._snapshot())
+            else:
+                self.add_file(new_id, source.get('content', b''))
+            self.files[new_id].update(copy.deepcopy(body))
+            return {key: self.files[new_id][key] for key in ('id', 'name', 'createdTime')}
+
+    def delete_file(self, file_id):
+        with self.lock:
+            self.files.pop(file_id)
+            self.spreadsheets.pop(file_id, None)
+        return ''
+
+    def touch(self, file_id):
+        with self.lock:
+            self.files[file_id]['modifiedTime'] = _now_rfc3339()
+
+    def sheets(self):
+        return _FakeSheetsClient(self)
+
+    def drive(self):
+        return _FakeDriveService(self)
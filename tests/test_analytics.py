@@ -0,0 +1,121 @@
+import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from analytics import CaseCountCube, count_rows, repeat_client_summary, service_levels
+from filters import FilterIndex, apply_filters
+
+
+@pytest.fixture(scope='module')
+def cases(n=20000, seed=0):
+    rng = np.random.default_rng(seed)
+    opened = pd.Timestamp('2015-01-01') + pd.to_timedelta(rng.integers(0, 3650, n), unit='D')
+    closed = opened + pd.to_timedelta(rng.integers(0, 400, n), unit='D')
+    problems = [f"{code:02d} Problem {code}" for code in range(80)] + ['73 Food Stamps']
+    df = pd.DataFrame({
+        'source': pd.Categorical(rng.choice(['LAET', 'LAS', 'WTLS'], n)),
+        'date_opened': pd.Series(opened).where(rng.random(n) > 0.02),
+        'date_closed': pd.Series(closed).where(rng.random(n) > 0.1),
+        'county_dispute': pd.Categorical(rng.choice(['Davidson', 'Knox', 'Shelby', 'Bedford', 'Wayne', None], n)),
+        'legal_problem_code': pd.Categorical(rng.choice(problems, n)),
+        'close_reason': pd.Categorical(rng.choice(['Counsel and Advice', 'X1-Brief Service', 'Limited Action'], n)),
+        'gender': pd.Categorical(rng.choice(['Female', 'Male', 'Unknown', None], n)),
+        'race': pd.Categorical(rng.choice(['White', 'Black', 'Asian', 'Other', None], n)),
+        'age_intake': rng.choice([np.nan, 19.0, 30.0, 42.0, 60.0, 80.0], n)
+    })
+    return df
+
+
+@pytest.fixture(scope='module')
+def cube(cases):
+    return CaseCountCube(cases)
+
+
+FULL_RANGE = (datetime.date(2000, 1, 1), datetime.date(2030, 12, 31))
+FILTER_STATES = [
+    dict(selected_sources=['LAET', 'LAS', 'WTLS'], date_range=FULL_RANGE, closed_date_range=FULL_RANGE),
+    dict(selected_sources=['LAS', 'WTLS'], date_range=(datetime.date(2018, 3, 1), datetime.date(2020, 6, 30)),
+         closed_date_range=FULL_RANGE),
+    dict(selected_sources=['WTLS'], date_range=FULL_RANGE,
+         closed_date_range=(datetime.date(2016, 1, 1), datetime.date(2019, 12, 31)),
+         selected_counties=['Knox', 'Wayne']),
+]
+
+
+@pytest.mark.parametrize('state', FILTER_STATES)
+@pytest.mark.parametrize('group_by', [
+    'legal_problem_code', 'county_dispute', 'month_opened', 'area_type',
+    ['gender', 'legal_problem_code'], ['age_group', 'legal_problem_code']
+])
+@pytest.mark.parametrize('exclude_foodstamps', [False, True])
+def test_cube_matches_row_counts(cases, cube, state, group_by, exclude_foodstamps):
+    df = cases
+    assert cube.can_answer(state['date_range'], state['closed_date_range'])
+
+    expected = count_rows(apply_filters(df, FilterIndex(df), **state), group_by, exclude_foodstamps)
+    result = cube.query(group_by, exclude_foodstamps=exclude_foodstamps, **state)
+    pd.testing.assert_series_equal(result.sort_index(), expected.sort_index(), check_dtype=False,
+                                   check_categorical=False, check_index_type=False)
+
+
+def test_cube_marginals_are_much_smaller_than_the_data(cases):
+    df = cases
+    cube = CaseCountCube(df)
+
+    for group_by in ['legal_problem_code', ['gender', 'legal_problem_code'], 'county_dispute']:
+        cube.query(group_by, ['LAET', 'LAS', 'WTLS'], FULL_RANGE, FULL_RANGE)
+    cube.query('legal_problem_code', ['LAS'], FULL_RANGE, FULL_RANGE, ['Knox'], exclude_foodstamps=True)
+
+    cell_counts = {key: len(cells) for key, cells in cube._marginals.items()}
+    assert set(cell_counts) == {
+        ('source', 'legal_problem_code'), ('source', 'gender', 'legal_problem_code'),
+        ('source', 'county_dispute'), ('source', 'county_dispute', 'foodstamps', 'legal_problem_code')
+    }
+    assert max(cell_counts.values()) < len(df) / 10
+
+
+def _baseline_summary(repeat_df):
+    """The original per-client iterrows/value_counts() detail table."""
+    counts = repeat_df.groupby(['client_id', 'year_opened']).size().reset_index(name='case_count')
+    rows = []
+    for _, row in counts[counts['case_count'] >= 2].iterrows():
+        cases = repeat_df[(repeat_df['client_id'] == row['client_id']) &
+                          (repeat_df['year_opened'] == row['year_opened'])]
+        close_reasons = cases['close_reason'].value_counts().to_dict()
+        levels = cases['service_level'].astype(str).value_counts().to_dict()
+        rows.append({
+            'Client ID': row['client_id'],
+            'Year': int(row['year_opened']),
+            'Total Cases': int(row['case_count']),
+            'Close Reasons': ', '.join(f"{k} ({v})" for k, v in close_reasons.items()),
+            'Service Levels': ', '.join(f"{k} ({v})" for k, v in levels.items())
+        })
+    return pd.DataFrame(rows).sort_values(['Year', 'Total Cases'], ascending=[False, False])
+
+
+def test_repeat_client_summary_matches_baseline():
+    rng = np.random.default_rng(0)
+    n = 300
+    repeat_df = pd.DataFrame({
+        'client_id': rng.integers(0, 60, n).astype(str),
+        'year_opened': rng.choice([2022, 2023], n),
+        'close_reason': pd.Categorical(
+            rng.choice(['Counsel and Advice', 'Limited Action', 'Extensive Service', None], n),
+            categories=['Counsel and Advice', 'Extensive Service', 'Limited Action', 'Never Used']
+        ),
+        'case_time': rng.choice([np.nan, 1.0, 5.0, 20.0], n)
+    })
+    repeat_df['service_level'] = service_levels(repeat_df)
+
+    summary = repeat_client_summary(repeat_df)
+    expected = _baseline_summary(repeat_df)
+
+    # Unused close reasons are still listed with a zero count
+    assert summary['Close Reasons'].str.contains('Never Used (0)', regex=False).all()
+    pd.testing.assert_frame_equal(
+        summary.sort_values(['Year', 'Client ID']).reset_index(drop=True),
+        expected.sort_values(['Year', 'Client ID']).reset_index(drop=True),
+        check_dtype=False
+    )
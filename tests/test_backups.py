@@ -0,0 +1,46 @@
+import pytest
+
+from backups import create_backup_copy, list_backups, overwrite_backup_sheet
+
+
+def test_backup_history_is_bounded(backend):
+    backend.add_spreadsheet('main', [['a'], ['1']])
+    drive = backend.drive()
+
+    for _ in range(5):
+        newest = create_backup_copy(drive, 'main', keep=3)
+
+    backups = list_backups(drive, 'main')
+    assert [backup['id'] for backup in backups][0] == newest['id']
+    assert len(backups) == 3
+    assert backend.spreadsheets[newest['id']].sheet1.get_all_values() == [['a'], ['1']]
+
+
+def test_prune_failure_keeps_the_new_copy(backend, monkeypatch):
+    backend.add_spreadsheet('main', [['a']])
+    drive = backend.drive()
+    files = type(drive.files())
+
+    def failing_delete(self, fileId, **kwargs):
+        raise RuntimeError('delete failed')
+
+    monkeypatch.setattr(files, 'delete', failing_delete)
+    create_backup_copy(drive, 'main', keep=1)
+    backup = create_backup_copy(drive, 'main', keep=1)
+
+    assert backup['id'] in backend.files
+    assert len(list_backups(drive, 'main')) == 2
+
+
+def test_copy_failure_raises(backend):
+    with pytest.raises(FileNotFoundError):
+        create_backup_copy(backend.drive(), 'missing')
+
+
+def test_overwrite_backup_sheet(backend):
+    backend.add_spreadsheet('main', [['a', 'b'], ['1', '2']])
+    backend.add_spreadsheet('backup', [['old']] * 5)
+
+    overwrite_backup_sheet(backend.sheets(), 'main', 'backup')
+
+    assert backend.spreadsheets['backup'].sheet1.get_all_values() == [['a', 'b'], ['1', '2']]
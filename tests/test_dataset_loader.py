@@ -0,0 +1,60 @@
+import numpy as np
+import pandas as pd
+
+from dataset_loader import CATEGORICAL_COLUMNS, DATE_COLUMNS, NUMERIC_COLUMNS, read_dataset
+
+
+def _dataset_rows(n_rows, seed=0):
+    rng = np.random.default_rng(seed)
+    columns = ['client_id'] + DATE_COLUMNS + NUMERIC_COLUMNS + CATEGORICAL_COLUMNS
+    df = pd.DataFrame({col: rng.integers(0, 50, n_rows).astype(str) for col in columns})
+    for col in DATE_COLUMNS:
+        dates = pd.Timestamp('2021-01-01') + pd.to_timedelta(rng.integers(0, 900, n_rows), 'D')
+        df[col] = dates.astype(str)
+        df.loc[rng.random(n_rows) < 0.1, col] = ''
+    df['outcome_amount'] = '$' + df['outcome_amount'] + ',500'
+    df.loc[rng.random(n_rows) < 0.3, 'age_intake'] = 'nan'
+    return [columns] + df.values.tolist()
+
+
+def _serial_parse(values):
+    """The original load_data() parse of one get_all_values() call."""
+    df = pd.DataFrame(values[1:], columns=values[0])
+    for col in DATE_COLUMNS:
+        df[col] = pd.to_datetime(df[col], errors='coerce', cache=False).dt.normalize()
+    for col in NUMERIC_COLUMNS:
+        if col == 'outcome_amount':
+            df[col] = df[col].astype(str).str.replace('$', '').str.replace(',', '')
+        df[col] = pd.to_numeric(df[col], errors='coerce')
+    for col in CATEGORICAL_COLUMNS:
+        df[col] = pd.Categorical(df[col])
+    return df
+
+
+def test_read_dataset_matches_serial_parse(backend):
+    values = _dataset_rows(6000)
+    values[2500] = []  # blank row inside the data
+    worksheet = backend.add_spreadsheet('dataset', values).sheet1
+
+    df = read_dataset(worksheet, block_rows=1000)
+
+    pd.testing.assert_frame_equal(df, _serial_parse(worksheet.get_all_values()))
+    assert len(df) == 6000
+
+
+def test_spare_grid_rows_are_not_loaded(backend):
+    worksheet = backend.add_spreadsheet('dataset', _dataset_rows(12000)).sheet1
+    worksheet.resize(rows=15001)
+
+    assert len(read_dataset(worksheet, block_rows=1000)) == 12000
+
+
+def test_cells_past_the_header_are_ignored(backend):
+    values = _dataset_rows(300)
+    values[42] = values[42] + ['', 'stray note']
+    worksheet = backend.add_spreadsheet('dataset', values).sheet1
+
+    df = read_dataset(worksheet, block_rows=100)
+
+    assert list(df.columns) == values[0]
+    assert len(df) == 300
@@ -0,0 +1,39 @@
+import numpy as np
+import pandas as pd
+
+from filters import FilteredRows
+
+
+def _dataset():
+    return pd.DataFrame({
+        'case_id': range(6),
+        'client_id': ['a', 'b', 'a', 'c', 'b', 'd'],
+        'source': pd.Categorical(['LAS', 'WTLS', 'LAS', 'LAET', 'WTLS', 'LAS']),
+        'days_open': [1.0, 2.0, np.nan, 4.0, 5.0, 6.0]
+    }, index=[10, 11, 12, 13, 14, 15])
+
+
+def test_columns_match_the_full_take():
+    df = _dataset()
+    positions = np.array([1, 3, 4])
+    rows = FilteredRows(df, positions)
+
+    subset = rows.columns(['source', 'case_id', 'not_a_column'])
+    pd.testing.assert_frame_equal(subset, df.take(positions)[['source', 'case_id']])
+    assert len(rows) == 3
+    # Only the requested columns were copied
+    assert set(rows._columns) == {'source', 'case_id'}
+    assert rows._frame is None
+
+    pd.testing.assert_frame_equal(rows.frame(), df.take(positions))
+    pd.testing.assert_frame_equal(rows.columns(['days_open']), df.take(positions)[['days_open']])
+
+
+def test_unfiltered_rows_share_the_dataset_columns():
+    df = _dataset()
+    rows = FilteredRows(df, np.arange(len(df)))
+
+    subset = rows.columns(['case_id', 'client_id'])
+    pd.testing.assert_frame_equal(subset, df[['case_id', 'client_id']])
+    assert np.shares_memory(subset['case_id'].to_numpy(), df['case_id'].to_numpy())
+    assert rows.frame() is rows.frame()
@@ -0,0 +1,68 @@
+import datetime
+import threading
+
+import pytest
+import rsa
+
+from google_clients import GoogleClientPool
+
+
+def _service_account_info():
+    _, private_key = rsa.newkeys(512)
+    return {
+        'type': 'service_account',
+        'project_id': 'tals-test',
+        'private_key_id': 'test-key',
+        'private_key': private_key.save_pkcs1().decode(),
+        'client_email': 'tals@tals-test.iam.gserviceaccount.com',
+        'token_uri': 'https://oauth2.googleapis.com/token'
+    }
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    pool = GoogleClientPool(_service_account_info())
+
+    def fake_refresh(request):
+        pool.credentials.token = 'token'
+        pool.credentials.expiry = datetime.datetime.utcnow() + datetime.timedelta(hours=1)
+
+    monkeypatch.setattr(type(pool.credentials), 'refresh', lambda self, request: fake_refresh(request))
+    yield pool
+    pool.close()
+
+
+def test_missing_credentials_raise():
+    with pytest.raises(ValueError):
+        GoogleClientPool(None)
+
+
+def test_sheets_client_is_shared_and_token_fetched_once(pool):
+    assert pool.sheets() is pool.sheets()
+    assert pool.token_refreshes == 1
+
+
+def test_expired_token_is_refreshed(pool):
+    pool.sheets()
+    pool.credentials.expiry = datetime.datetime.utcnow()
+    pool.sheets()
+    assert pool.token_refreshes == 2
+
+
+def test_drive_service_is_built_once_per_thread(pool):
+    service = pool.drive()
+    assert pool.drive() is service
+
+    other = []
+    thread = threading.Thread(target=lambda: other.append(pool.drive()))
+    thread.start()
+    thread.join()
+    assert other[0] is not service
+
+
+def test_backend_serves_sheets_and_drive(backend):
+    backend.add_spreadsheet('sheet', [['a', 'b'], ['1', '2']])
+    pool = GoogleClientPool(backend=backend)
+
+    assert pool.open_spreadsheet('sheet').get_worksheet(0).get_all_values() == [['a', 'b'], ['1', '2']]
+    assert pool.credentials is None
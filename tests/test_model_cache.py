@@ -0,0 +1,69 @@
+import io
+
+import joblib
+import numpy as np
+import pytest
+
+from model_cache import fetch_model_file, load_model
+
+
+def _add_model(backend, file_id='model'):
+    buffer = io.BytesIO()
+    joblib.dump({'weights': [1, 2, 3]}, buffer)
+    backend.add_file(file_id, buffer.getvalue())
+
+
+def test_model_download_through_drive(backend, tmp_path):
+    _add_model(backend)
+    service = backend.drive()
+
+    path, version = fetch_model_file(service, 'model', tmp_path)
+    assert joblib.load(path) == {'weights': [1, 2, 3]}
+    assert version == backend.files['model']['md5Checksum']
+
+    # A second fetch reuses the cached file
+    assert fetch_model_file(service, 'model', tmp_path) == (path, version)
+
+
+def test_model_falls_back_to_cache_when_drive_fails(backend, tmp_path, monkeypatch):
+    _add_model(backend)
+    service = backend.drive()
+
+    def unavailable(self, fileId, **kwargs):
+        raise ConnectionError("Drive unavailable")
+
+    # Nothing cached yet: the error is raised
+    monkeypatch.setattr(type(service.files()), 'get', unavailable)
+    with pytest.raises(ConnectionError):
+        fetch_model_file(service, 'model', tmp_path)
+
+    monkeypatch.undo()
+    path, version = fetch_model_file(service, 'model', tmp_path)
+
+    # The verified cached copy is used while Drive is down
+    monkeypatch.setattr(type(service.files()), 'get', unavailable)
+    assert fetch_model_file(service, 'model', tmp_path) == (path, version)
+
+    # ...but not a corrupted one
+    path.write_bytes(b'truncated')
+    with pytest.raises(ConnectionError):
+        fetch_model_file(service, 'model', tmp_path)
+
+
+def test_corrupt_mmap_copy_falls_back_and_is_rebuilt(tmp_path):
+    model_path = tmp_path / 'model.joblib'
+    joblib.dump({'weights': np.arange(5)}, model_path, compress=3)
+    cache_dir = tmp_path / 'cache'
+
+    assert load_model(model_path, cache_dir)['weights'].tolist() == [0, 1, 2, 3, 4]
+    mmap_path = cache_dir / 'model.mmap.joblib'
+    assert mmap_path.exists()
+
+    # A truncated copy (still newer than the source) is not a pickle error for the caller
+    mmap_path.write_bytes(b'truncated')
+    assert load_model(model_path, cache_dir)['weights'].tolist() == [0, 1, 2, 3, 4]
+    assert not mmap_path.exists()
+
+    # The next load writes a fresh copy
+    assert load_model(model_path, cache_dir)['weights'].tolist() == [0, 1, 2, 3, 4]
+    assert mmap_path.exists()
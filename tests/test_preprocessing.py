@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from preprocessing import LEGAL_GROUP_LABELS, group_legal_code, group_legal_codes
+from standardization import get_standard_mappings
+
+
+def baseline_group_legal_code(code):
+    """The if/elif grouping the prediction models were trained with."""
+    if pd.isna(code):
+        return 'unknown'
+    code_str = str(code).strip()
+
+    if code_str.startswith('0') or code_str.startswith('1'):
+        return 'consumer_finance'
+    elif code_str.startswith('12') or code_str.startswith('13') or code_str.startswith('14') or code_str.startswith('16') or code_str.startswith('19'):
+        return 'education'
+    elif code_str.startswith('2'):
+        return 'employment'
+    elif code_str.startswith('3'):
+        return 'family'
+    elif code_str.startswith('4'):
+        return 'juvenile'
+    elif code_str.startswith('5'):
+        return 'health'
+    elif code_str.startswith('6'):
+        return 'housing'
+    elif code_str.startswith('7'):
+        return 'income_benefits'
+    elif code_str.startswith('8'):
+        return 'civil_rights'
+    elif code_str.startswith('9'):
+        return 'miscellaneous'
+    else:
+        return 'other'
+
+
+STANDARD_CODES = sorted(set(get_standard_mappings()[3].values()))
+
+
+@pytest.mark.parametrize('code', STANDARD_CODES)
+def test_standard_code_matches_training_grouping(code):
+    assert group_legal_code(code) == baseline_group_legal_code(code)
+    assert group_legal_code(code) in LEGAL_GROUP_LABELS
+
+
+@pytest.mark.parametrize('code', ['12 Discipline', '13 Special Education', '14 Access', '16 Student Finance', '19 Other Education'])
+def test_education_codes_stay_under_consumer_finance(code):
+    assert group_legal_code(code) == 'consumer_finance'
+
+
+@pytest.mark.parametrize('code', [None, np.nan, '', ' 63 Private Landlord', 'Other/Unknown'])
+def test_missing_and_unnumbered_codes(code):
+    assert group_legal_code(code) == baseline_group_legal_code(code)
+
+
+def test_vectorized_grouping_matches_per_code():
+    codes = pd.Series(STANDARD_CODES * 3 + [None, 'Unmapped'], index=range(10, 10 + 3 * len(STANDARD_CODES) + 2))
+
+    groups = group_legal_codes(codes)
+
+    assert groups.index.equals(codes.index)
+    assert groups.tolist() == [baseline_group_legal_code(code) for code in codes]
+
+
+def test_every_group_has_a_label():
+    groups = {baseline_group_legal_code(code) for code in STANDARD_CODES} | {'other', 'unknown'}
+    assert groups <= set(LEGAL_GROUP_LABELS)
+    assert 'education' not in LEGAL_GROUP_LABELS
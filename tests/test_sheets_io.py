@@ -0,0 +1,204 @@
+import pandas as pd
+import pytest
+import requests
+from gspread.exceptions import APIError
+
+import sheets_io
+from fake_google import FakeGoogleBackend, FakeWorksheet, _fake_api_error
+
+
+def _sheet_rows(n_rows, n_cols=5):
+    rows = [[f"col{j}" for j in range(n_cols)]]
+    for i in range(n_rows):
+        # Ragged rows and a blank row every 700 rows, like a hand-edited sheet
+        rows.append([] if i % 700 == 699 else [str(i * j) for j in range(1 + i % n_cols)])
+    return rows
+
+
+def test_row_blocks_cover_the_span():
+    assert sheets_io.row_blocks(2, 11, 4) == [(2, 5), (6, 9), (10, 11)]
+
+
+def test_is_retryable_error():
+    assert sheets_io.is_retryable_error(_fake_api_error(429, 'RESOURCE_EXHAUSTED', 'quota'))
+    assert sheets_io.is_retryable_error(_fake_api_error(503, 'UNAVAILABLE', 'down'))
+    assert sheets_io.is_retryable_error(requests.exceptions.ConnectionError())
+    assert not sheets_io.is_retryable_error(_fake_api_error(400, 'INVALID_ARGUMENT', 'bad range'))
+
+
+def test_read_values_matches_get_all_values(backend):
+    worksheet = backend.add_spreadsheet('sheet', _sheet_rows(3000)).sheet1
+    worksheet.resize(rows=4200)
+
+    progress = []
+    values = sheets_io.read_values(worksheet, block_rows=500,
+                                   on_progress=lambda done, total: progress.append((done, total)))
+
+    assert values == worksheet.get_all_values()
+    assert progress[-1] == (4200, 4200)
+
+
+def test_read_values_retries_transient_errors(no_sleep):
+    backend = FakeGoogleBackend(error_rate=0.3, seed=7)
+    worksheet = backend.add_spreadsheet('sheet', _sheet_rows(2000)).sheet1
+
+    values = sheets_io.read_values(worksheet, block_rows=200)
+
+    assert backend.failed_requests > 0
+    backend.error_rate = 0
+    assert values == worksheet.get_all_values()
+
+
+def test_non_retryable_error_is_raised(backend, monkeypatch):
+    worksheet = backend.add_spreadsheet('sheet', _sheet_rows(10)).sheet1
+
+    def bad_request(*args, **kwargs):
+        raise _fake_api_error(400, 'INVALID_ARGUMENT', 'bad range')
+
+    monkeypatch.setattr(worksheet, 'get_values', bad_request)
+    with pytest.raises(APIError):
+        sheets_io.read_values(worksheet)
+
+
+def test_rewrite_dataframe_round_trip(backend, no_sleep):
+    worksheet = backend.add_spreadsheet('sheet', _sheet_rows(50)).sheet1
+    df = pd.DataFrame({'a': range(4500), 'b': ['x'] * 4500, 'c': [None] * 4500})
+
+    written = sheets_io.rewrite_dataframe(worksheet, df, block_rows=1000)
+
+    values = backend.spreadsheets['sheet'].sheet1.get_all_values()
+    assert written == 4501
+    assert values[0] == ['a', 'b', 'c']
+    assert values[1:] == sheets_io.dataframe_to_rows(df)
+
+
+def test_append_dataframe_follows_sheet_column_order(backend):
+    worksheet = backend.add_spreadsheet('sheet', [['b', 'a', 'c'], ['1', '2', '3']]).sheet1
+    df = pd.DataFrame({'a': ['x', 'y'], 'b': ['p', 'q']})
+
+    assert sheets_io.append_dataframe(worksheet, df, chunk_size=1) == 2
+    assert worksheet.get_all_values() == [
+        ['b', 'a', 'c'], ['1', '2', '3'], ['p', 'x', 'nan'], ['q', 'y', 'nan']
+    ]
+
+
+def test_append_dataframe_rejects_unknown_columns(backend):
+    worksheet = backend.add_spreadsheet('sheet', [['a']]).sheet1
+    with pytest.raises(ValueError):
+        sheets_io.append_dataframe(worksheet, pd.DataFrame({'a': [1], 'z': [2]}))
+
+
+def test_empty_range_reads_like_gspread(backend):
+    worksheet = backend.add_spreadsheet('sheet', [['a']]).sheet1
+    assert worksheet.get_values('A10:B20') == [[]]
+    assert worksheet.get_values('A10:B20', pad_values=False) == [[]]
+
+
+def test_empty_trailing_blocks_hold_no_data(backend):
+    worksheet = backend.add_spreadsheet('sheet', _sheet_rows(1200)).sheet1
+    worksheet.resize(rows=5000)
+
+    blocks = sheets_io.read_blocks(worksheet, block_rows=1000)
+
+    assert [n_rows for _, n_rows in blocks] == [1000, 201, 0, 0, 0]
+    assert sheets_io.data_row_count(blocks, 1000) == 1201
+
+
+@pytest.mark.parametrize('atomic', [False, True])
+def test_rewrite_replaces_the_sheet_contents(backend, atomic):
+    spreadsheet = backend.add_spreadsheet('sheet', _sheet_rows(50))
+    spreadsheet.add_worksheet('Other', rows=10, cols=2)
+    sheet_id = spreadsheet.sheet1.id
+    df = pd.DataFrame({'a': range(300)})
+
+    sheets_io.rewrite_dataframe(spreadsheet.sheet1, df, block_rows=100, atomic=atomic)
+
+    assert [ws.title for ws in spreadsheet.worksheets()] == ['Sheet1', 'Other']
+    assert spreadsheet.get_worksheet(0).get_all_values() == [['a']] + sheets_io.dataframe_to_rows(df)
+    # In place the worksheet (and its gid) is kept; the atomic swap replaces it
+    assert (spreadsheet.get_worksheet(0).id == sheet_id) is not atomic
+
+
+def test_failed_atomic_rewrite_leaves_the_sheet_untouched(backend, monkeypatch):
+    spreadsheet = backend.add_spreadsheet('sheet', _sheet_rows(50))
+    original = spreadsheet.sheet1.get_all_values()
+    real_update = FakeWorksheet.update
+    calls = []
+
+    def failing_update(self, *args, **kwargs):
+        calls.append(1)
+        if len(calls) == 2:
+            raise _fake_api_error(400, 'INVALID_ARGUMENT', 'bad request')
+        return real_update(self, *args, **kwargs)
+
+    monkeypatch.setattr(FakeWorksheet, 'update', failing_update)
+    with pytest.raises(APIError):
+        sheets_io.rewrite_dataframe(spreadsheet.sheet1, pd.DataFrame({'a': range(300)}),
+                                    block_rows=100, max_workers=1, atomic=True)
+
+    assert [ws.title for ws in spreadsheet.worksheets()] == ['Sheet1']
+    assert spreadsheet.sheet1.get_all_values() == original
+
+
+def test_swap_applied_with_lost_response_keeps_new_sheet(backend, monkeypatch):
+    spreadsheet = backend.add_spreadsheet('sheet', _sheet_rows(50))
+    real_batch_update = spreadsheet.batch_update
+
+    def lost_response(body):
+        real_batch_update(body)
+        raise requests.exceptions.ConnectionError('connection reset')
+
+    monkeypatch.setattr(spreadsheet, 'batch_update', lost_response)
+    sheets_io.rewrite_dataframe(spreadsheet.sheet1, pd.DataFrame({'a': ['x']}), atomic=True)
+
+    assert [ws.title for ws in spreadsheet.worksheets()] == ['Sheet1']
+    assert spreadsheet.sheet1.get_all_values() == [['a'], ['x']]
+
+
+def _lose_append_responses(monkeypatch, worksheet, failures):
+    """Apply the next `failures` appends but raise as if their responses were lost."""
+    real_append = worksheet.append_rows
+    remaining = [failures]
+
+    def append_rows(*args, **kwargs):
+        result = real_append(*args, **kwargs)
+        if remaining[0]:
+            remaining[0] -= 1
+            raise requests.exceptions.Timeout('read timed out')
+        return result
+
+    monkeypatch.setattr(worksheet, 'append_rows', append_rows)
+
+
+def test_lost_append_response_is_not_appended_twice(backend, monkeypatch, no_sleep):
+    worksheet = backend.add_spreadsheet('sheet', [['a', 'b'], ['1', '2']]).sheet1
+    _lose_append_responses(monkeypatch, worksheet, failures=1)
+
+    sheets_io.append_dataframe(worksheet, pd.DataFrame({'a': ['x', 'y'], 'b': ['p', 'q']}), chunk_size=1)
+
+    assert worksheet.get_all_values() == [['a', 'b'], ['1', '2'], ['x', 'p'], ['y', 'q']]
+
+
+def test_rejected_append_is_retried(backend, monkeypatch, no_sleep):
+    worksheet = backend.add_spreadsheet('sheet', [['a'], ['1']]).sheet1
+    real_append = worksheet.append_rows
+    calls = []
+
+    def quota_then_append(*args, **kwargs):
+        calls.append(1)
+        if len(calls) == 1:
+            raise _fake_api_error(429, 'RESOURCE_EXHAUSTED', 'quota')
+        return real_append(*args, **kwargs)
+
+    monkeypatch.setattr(worksheet, 'append_rows', quota_then_append)
+    sheets_io.append_dataframe(worksheet, pd.DataFrame({'a': ['x']}))
+
+    assert worksheet.get_all_values() == [['a'], ['1'], ['x']]
+
+
+def test_append_without_key_column_only_retries_quota_errors(backend, monkeypatch, no_sleep):
+    worksheet = backend.add_spreadsheet('sheet', [['a'], ['1']]).sheet1
+    _lose_append_responses(monkeypatch, worksheet, failures=1)
+
+    with pytest.raises(requests.exceptions.Timeout):
+        sheets_io.append_dataframe(worksheet, pd.DataFrame({'a': ['']}))